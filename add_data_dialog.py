@@ -1,9 +1,14 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-                             QPushButton, QLineEdit, QLabel, QComboBox,
+                             QPushButton, QLineEdit, QLabel, QComboBox, QCheckBox,
                              QMessageBox, QDateEdit, QStackedWidget, QWidget)
-from PyQt6.QtSql import QSqlQuery, QSqlDatabase
-from PyQt6.QtCore import Qt, QDate, QLocale, pyqtProperty
+from PyQt6.QtCore import Qt, QDate, pyqtProperty
 from PyQt6.QtGui import QDoubleValidator
+from currency import format_rupiah, parse_rupiah
+from database_manager import DatabaseManager
+from directory import Directory
+from lookup import LookupComboBox, PeminjamLookup
+import installment_schedule
+import validators
 
 
 class CurrencyLineEdit(QLineEdit):
@@ -15,31 +20,18 @@ class CurrencyLineEdit(QLineEdit):
         self.setValidator(validator)
 
         self._numeric_value = 0.0
-        self.indonesian_locale = QLocale(QLocale.Language.Indonesian, QLocale.Country.Indonesia)
         self.editingFinished.connect(self._on_editing_finished)
         self.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
     def _format_value_for_display(self, value):
         try:
-            num = float(value)
-            
-            
-            return f"Rp {self.indonesian_locale.toString(num, 'f', 0)}"
+            return format_rupiah(value)
         except (ValueError, TypeError):
             return ""
 
     def _get_numeric_from_display_text(self, text):
         
-        cleaned_text = text.replace("Rp ", "").strip()
-        try:
-            
-            num, ok = self.indonesian_locale.toDouble(cleaned_text)
-            if ok:
-                return num
-            else:
-                return 0.0
-        except (ValueError, TypeError):
-            return 0.0
+        return parse_rupiah(text)
 
     def get_numeric_value(self):
         
@@ -85,7 +77,6 @@ class AddDataDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("Tambah Data Baru")
         self.setGeometry(200, 200, 600, 400)
-        self.db = QSqlDatabase.database() 
         self.table_type = table_type 
 
         self.main_layout = QVBoxLayout()
@@ -159,7 +150,7 @@ class AddDataDialog(QDialog):
         layout = QFormLayout(widget)
 
         self.pinjaman_fields = {}
-        self.pinjaman_fields['id_peminjam'] = QComboBox()
+        self.pinjaman_fields['id_peminjam'] = LookupComboBox(PeminjamLookup(), "Pilih Peminjam")
         self.pinjaman_fields['jumlah_pinjaman'] = CurrencyLineEdit()
         self.pinjaman_fields['tanggal_pinjam'] = QDateEdit(calendarPopup=True)
         self.pinjaman_fields['tanggal_pinjam'].setDisplayFormat("yyyy-MM-dd")
@@ -168,15 +159,17 @@ class AddDataDialog(QDialog):
         self.pinjaman_fields['tanggal_selesai'].setDisplayFormat("yyyy-MM-dd")
         self.pinjaman_fields['tanggal_selesai'].setDate(QDate.currentDate().addMonths(6)) 
         self.pinjaman_fields['status'] = QComboBox()
-        self.pinjaman_fields['status'].addItems(["Aktif", "Lunas"])
+        self.pinjaman_fields['status'].addItems(validators.STATUS_PINJAMAN)
+        self.pinjaman_fields['buat_jadwal'] = QCheckBox("Buat jadwal cicilan bulanan otomatis")
+        self.pinjaman_fields['buat_jadwal'].setChecked(True)
 
         layout.addRow("Peminjam:", self.pinjaman_fields['id_peminjam'])
         layout.addRow("Jumlah Pinjaman:", self.pinjaman_fields['jumlah_pinjaman'])
         layout.addRow("Tanggal Pinjam:", self.pinjaman_fields['tanggal_pinjam'])
         layout.addRow("Tanggal Selesai:", self.pinjaman_fields['tanggal_selesai'])
         layout.addRow("Status:", self.pinjaman_fields['status'])
+        layout.addRow("", self.pinjaman_fields['buat_jadwal'])
 
-        self._load_peminjam_to_combo(self.pinjaman_fields['id_peminjam'])
         return widget
 
     def _create_cicilan_form(self):
@@ -184,7 +177,7 @@ class AddDataDialog(QDialog):
         layout = QFormLayout(widget)
 
         self.cicilan_fields = {}
-        self.cicilan_fields['nama_peminjam'] = QComboBox() 
+        self.cicilan_fields['nama_peminjam'] = LookupComboBox(PeminjamLookup(), "Pilih Peminjam")
         self.cicilan_fields['id_pinjaman'] = QComboBox() 
         self.cicilan_fields['cicilan_ke'] = QLineEdit()
         self.cicilan_fields['jumlah_cicilan'] = CurrencyLineEdit()
@@ -192,7 +185,7 @@ class AddDataDialog(QDialog):
         self.cicilan_fields['tanggal_bayar'].setDisplayFormat("yyyy-MM-dd")
         self.cicilan_fields['tanggal_bayar'].setDate(QDate.currentDate())
         self.cicilan_fields['status_bayar'] = QComboBox()
-        self.cicilan_fields['status_bayar'].addItems(["Belum Bayar", "Lunas"])
+        self.cicilan_fields['status_bayar'].addItems(validators.STATUS_BAYAR)
 
         layout.addRow("Nama Peminjam:", self.cicilan_fields['nama_peminjam'])
         layout.addRow("ID Pinjaman:", self.cicilan_fields['id_pinjaman'])
@@ -201,22 +194,11 @@ class AddDataDialog(QDialog):
         layout.addRow("Tanggal Bayar:", self.cicilan_fields['tanggal_bayar'])
         layout.addRow("Status Bayar:", self.cicilan_fields['status_bayar'])
 
-        self._load_peminjam_to_combo(self.cicilan_fields['nama_peminjam'])
         self.cicilan_fields['nama_peminjam'].currentIndexChanged.connect(self._load_pinjaman_to_combo)
-        
-        if self.cicilan_fields['nama_peminjam'].currentData() is not None:
-             self._load_pinjaman_to_combo(self.cicilan_fields['nama_peminjam'].currentIndex())
+        self._load_pinjaman_to_combo(self.cicilan_fields['nama_peminjam'].currentIndex())
 
         return widget
 
-    def _load_peminjam_to_combo(self, combo_box):
-        combo_box.clear()
-        query = QSqlQuery(self.db)
-        query.exec("SELECT id_peminjam, nama FROM peminjam ORDER BY nama")
-        combo_box.addItem("Pilih Peminjam", None) 
-        while query.next():
-            combo_box.addItem(query.value(1), query.value(0)) 
-
     def _load_pinjaman_to_combo(self, index):
         peminjam_id = self.cicilan_fields['nama_peminjam'].currentData()
         self.cicilan_fields['id_pinjaman'].clear()
@@ -224,16 +206,10 @@ class AddDataDialog(QDialog):
             self.cicilan_fields['id_pinjaman'].addItem("Pilih Pinjaman", None)
             return
 
-        query = QSqlQuery(self.db)
-        query.prepare("SELECT id_pinjaman, jumlah_pinjaman, tanggal_pinjam FROM pinjaman WHERE id_peminjam = ?")
-        query.addBindValue(peminjam_id)
-        query.exec()
+        rows = Directory.instance().pinjaman_milik(peminjam_id)
 
         self.cicilan_fields['id_pinjaman'].addItem("Pilih Pinjaman", None) 
-        while query.next():
-            loan_id = query.value(0)
-            amount = query.value(1)
-            date = query.value(2)
+        for loan_id, amount, date in rows:
             display_text = f"ID: {loan_id} - Rp {amount:,.0f} ({date})"
             self.cicilan_fields['id_pinjaman'].addItem(display_text, loan_id)
 
@@ -278,91 +254,97 @@ class AddDataDialog(QDialog):
         elif current_form_index == 2: 
             self._save_cicilan()
 
+    def _run_save(self, insert, saved, error_prefix):
+        """Jalankan `insert(repository)` di thread penulis; `saved(hasil)` membuat pesan sukses di thread GUI"""
+        self.save_button.setEnabled(False)
+        DatabaseManager.pool().run(insert,
+                                   finished=lambda result: self._on_save_finished(saved, result),
+                                   failed=lambda error: self._on_save_failed(error_prefix, error),
+                                   write=True)
+
+    def _on_save_finished(self, saved, result):
+        self.save_button.setEnabled(True)
+        QMessageBox.information(self, "Sukses", saved(result))
+        self.accept()
+
+    def _on_save_failed(self, error_prefix, error):
+        self.save_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"{error_prefix}: {error}")
+
     def _save_peminjam(self):
         nama = self.peminjam_fields['nama'].text().strip()
         alamat = self.peminjam_fields['alamat'].text().strip()
         no_telp = self.peminjam_fields['no_telp'].text().strip()
         email = self.peminjam_fields['email'].text().strip()
 
-        if not all([nama, alamat, no_telp, email]):
-            QMessageBox.warning(self, "Input Error", "Semua field harus diisi untuk Peminjam.")
+        error = validators.validate_peminjam(nama, alamat, no_telp, email)
+        if error:
+            QMessageBox.warning(self, "Input Error", error)
             return
 
-        query = QSqlQuery(self.db)
-        query.prepare("INSERT INTO peminjam (nama, alamat, no_telp, email) VALUES (?, ?, ?, ?)")
-        query.addBindValue(nama)
-        query.addBindValue(alamat)
-        query.addBindValue(no_telp)
-        query.addBindValue(email)
+        def insert(repository):
+            return repository.peminjam.add(nama, alamat, no_telp, email)
 
-        if query.exec():
-            QMessageBox.information(self, "Sukses", "Data Peminjam berhasil ditambahkan.")
-            self.accept() 
-        else:
-            QMessageBox.critical(self, "Error", f"Gagal menambahkan Peminjam: {query.lastError().text()}")
+        def saved(id_peminjam):
+            Directory.instance().peminjam_added(id_peminjam, nama)
+            return "Data Peminjam berhasil ditambahkan."
+
+        self._run_save(insert, saved, "Gagal menambahkan Peminjam")
 
     def _save_pinjaman(self):
         id_peminjam = self.pinjaman_fields['id_peminjam'].currentData()
         jumlah_pinjaman = self.pinjaman_fields['jumlah_pinjaman'].get_numeric_value()
+        status = self.pinjaman_fields['status'].currentText()
 
-        if id_peminjam is None:
-            QMessageBox.warning(self, "Input Error", "Peminjam harus dipilih.")
-            return
-        if jumlah_pinjaman <= 0: 
-            QMessageBox.warning(self, "Input Error", "Jumlah Pinjaman harus berupa angka positif.")
+        error = validators.validate_pinjaman(id_peminjam, jumlah_pinjaman, status)
+        if error:
+            QMessageBox.warning(self, "Input Error", error)
             return
 
         tanggal_pinjam = self.pinjaman_fields['tanggal_pinjam'].date().toString("yyyy-MM-dd")
         tanggal_selesai = self.pinjaman_fields['tanggal_selesai'].date().toString("yyyy-MM-dd")
-        status = self.pinjaman_fields['status'].currentText()
+        buat_jadwal = self.pinjaman_fields['buat_jadwal'].isChecked()
+        if buat_jadwal and installment_schedule.tenor_bulan(tanggal_pinjam, tanggal_selesai) == 0:
+            QMessageBox.warning(self, "Input Error", "Tanggal Selesai minimal satu bulan setelah Tanggal Pinjam.")
+            return
 
-        query = QSqlQuery(self.db)
-        query.prepare("INSERT INTO pinjaman (id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status) VALUES (?, ?, ?, ?, ?)")
-        query.addBindValue(id_peminjam)
-        query.addBindValue(jumlah_pinjaman)
-        query.addBindValue(tanggal_pinjam)
-        query.addBindValue(tanggal_selesai)
-        query.addBindValue(status)
-
-        if query.exec():
-            QMessageBox.information(self, "Sukses", "Data Pinjaman berhasil ditambahkan.")
-            self.accept()
-        else:
-            QMessageBox.critical(self, "Error", f"Gagal menambahkan Pinjaman: {query.lastError().text()}")
+        def insert(repository):
+            # Pinjaman dan seluruh jadwal cicilannya disimpan dalam satu transaksi
+            if buat_jadwal:
+                return repository.pinjaman.add_with_schedule(
+                    id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status)
+            return repository.pinjaman.add(id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status), 0
+
+        def saved(result):
+            id_pinjaman, jumlah_jadwal = result
+            Directory.instance().pinjaman_added(id_pinjaman, id_peminjam, jumlah_pinjaman, tanggal_pinjam)
+            message = "Data Pinjaman berhasil ditambahkan."
+            if jumlah_jadwal:
+                Directory.instance().invalidate("cicilan")
+                message += f" {jumlah_jadwal} jadwal cicilan dibuat."
+            return message
+
+        self._run_save(insert, saved, "Gagal menambahkan Pinjaman")
 
     def _save_cicilan(self):
         id_pinjaman = self.cicilan_fields['id_pinjaman'].currentData()
         cicilan_ke_str = self.cicilan_fields['cicilan_ke'].text().strip()
         jumlah_cicilan = self.cicilan_fields['jumlah_cicilan'].get_numeric_value()
+        status_bayar = self.cicilan_fields['status_bayar'].currentText()
 
-        if id_pinjaman is None:
-            QMessageBox.warning(self, "Input Error", "Pinjaman harus dipilih.")
-            return
-        if not cicilan_ke_str:
-            QMessageBox.warning(self, "Input Error", "Cicilan Ke- harus diisi.")
-            return
-        try:
-            cicilan_ke = int(cicilan_ke_str)
-        except ValueError:
-            QMessageBox.warning(self, "Input Error", "Cicilan Ke- harus berupa angka bulat.")
-            return
-        if jumlah_cicilan <= 0: 
-            QMessageBox.warning(self, "Input Error", "Jumlah Cicilan harus berupa angka positif.")
+        error = validators.validate_cicilan(id_pinjaman, cicilan_ke_str, jumlah_cicilan, status_bayar)
+        if error:
+            QMessageBox.warning(self, "Input Error", error)
             return
+        cicilan_ke = int(cicilan_ke_str)
 
         tanggal_bayar = self.cicilan_fields['tanggal_bayar'].date().toString("yyyy-MM-dd")
-        status_bayar = self.cicilan_fields['status_bayar'].currentText()
 
-        query = QSqlQuery(self.db)
-        query.prepare("INSERT INTO cicilan (id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_bayar, status_bayar) VALUES (?, ?, ?, ?, ?)")
-        query.addBindValue(id_pinjaman)
-        query.addBindValue(cicilan_ke)
-        query.addBindValue(jumlah_cicilan)
-        query.addBindValue(tanggal_bayar)
-        query.addBindValue(status_bayar)
-
-        if query.exec():
-            QMessageBox.information(self, "Sukses", "Data Cicilan berhasil ditambahkan.")
-            self.accept()
-        else:
-            QMessageBox.critical(self, "Error", f"Gagal menambahkan Cicilan: {query.lastError().text()}")
\ No newline at end of file
+        def insert(repository):
+            repository.cicilan.add(id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_bayar, status_bayar)
+
+        def saved(_result):
+            Directory.instance().invalidate("cicilan")
+            return "Data Cicilan berhasil ditambahkan."
+
+        self._run_save(insert, saved, "Gagal menambahkan Cicilan")
@@ -0,0 +1,35 @@
+"""Benchmark aplikasi simpan pinjam; jalankan dari root repo, mis. `python -m benchmarks.query_benchmark`"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+DATA_DIR = os.path.join(ROOT_DIR, "benchmarks", "data")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+# Skala ditentukan oleh jumlah cicilan: 6 cicilan per pinjaman, 2 pinjaman per peminjam
+SCALES = {
+    "10k": (834, 1667, 10000),
+    "100k": (8334, 16667, 100000),
+    "1m": (83334, 166667, 1000000),
+}
+
+
+def scale_database(label, seed=0):
+    """Path database sintetis untuk skala `label`; dibuat sekali lalu dipakai ulang"""
+    import create_database
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"bench_{label}_seed{seed}.db")
+    if not os.path.exists(path):
+        jumlah_peminjam, jumlah_pinjaman, jumlah_cicilan = SCALES[label]
+        if os.path.exists(path + ".tmp"):
+            os.remove(path + ".tmp")
+        create_database.generate_database(path + ".tmp", jumlah_peminjam, jumlah_pinjaman, jumlah_cicilan, seed)
+        os.replace(path + ".tmp", path)
+    else:
+        create_database.upgrade_database(path)
+    return path
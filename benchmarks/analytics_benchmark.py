@@ -0,0 +1,123 @@
+"""Ukur waktu muat dan hitung analitik umur tunggakan (analytics.py) pada data sintetis.
+
+Waktu baca dari SQLite dan waktu hitung NumPy dicatat terpisah. Dengan
+--replikasi N, array hasil muat digandakan N kali (id pinjaman/peminjam digeser)
+untuk mengukur perhitungan pada beberapa juta cicilan tanpa membuat database baru.
+
+Contoh:
+    python -m benchmarks.analytics_benchmark --scales 1m --replikasi 5
+
+Hasil ditulis sebagai JSON (default benchmarks/results/analytics_benchmark.json).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks import RESULTS_DIR, SCALES, scale_database
+import analytics
+
+# Tanggal laporan tetap agar hasil bisa dibandingkan antar run (data sintetis mulai 2022)
+TANGGAL_LAPORAN = datetime.date(2024, 6, 30)
+
+
+def replicate(portfolio, times):
+    """Gandakan portofolio `times` kali dengan id pinjaman dan peminjam yang tidak bertabrakan"""
+    if times <= 1:
+        return portfolio
+    geser_pinjaman = int(portfolio.id_pinjaman.max(initial=0))
+    geser_peminjam = int(portfolio.id_peminjam.max(initial=0))
+    columns = {}
+    for field in analytics.Portfolio._fields:
+        values = getattr(portfolio, field)
+        if field in ("cicilan_pinjaman", "id_pinjaman"):
+            columns[field] = np.concatenate([values + i * geser_pinjaman for i in range(times)])
+        elif field == "id_peminjam":
+            columns[field] = np.concatenate([values + i * geser_peminjam for i in range(times)])
+        else:
+            columns[field] = np.tile(values, times)
+    return analytics.Portfolio(**columns)
+
+
+def _timing(durations):
+    return {
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "mean_ms": round(statistics.mean(durations), 3),
+        "max_ms": round(max(durations), 3),
+    }
+
+
+def run_scale(label, seed, repeat, times):
+    path = scale_database(label, seed)
+    conn = sqlite3.connect(path)
+    load = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        portfolio = analytics.load_portfolio(conn)
+        load.append((time.perf_counter() - start) * 1000)
+    conn.close()
+
+    portfolio = replicate(portfolio, times)
+    # Satu eksekusi pemanasan (alokasi awal NumPy)
+    analytics.aging_report(portfolio, TANGGAL_LAPORAN)
+    compute = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        report = analytics.aging_report(portfolio, TANGGAL_LAPORAN)
+        compute.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "scale": label,
+        "database": path,
+        "replikasi": times,
+        "cicilan": len(portfolio.cicilan_pinjaman),
+        "pinjaman": len(portfolio.id_pinjaman),
+        "load": _timing(load),
+        "compute": _timing(compute),
+        "par": {f"par{hari}": round(ratio, 4) for hari, ratio in report.par.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark analitik umur tunggakan pada data sintetis")
+    parser.add_argument("--scales", nargs="+", default=list(SCALES), choices=list(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--replikasi", type=int, default=1, help="gandakan array hasil muat N kali")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "analytics_benchmark.json"))
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "analytics",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "tanggal": TANGGAL_LAPORAN.isoformat(),
+        "results": [],
+    }
+    for label in args.scales:
+        result = run_scale(label, args.seed, args.repeat, args.replikasi)
+        report["results"].append(result)
+        print(f"{label} x{args.replikasi}: {result['cicilan']} cicilan, muat {result['load']['median_ms']} ms, "
+              f"hitung {result['compute']['median_ms']} ms")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil benchmark ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
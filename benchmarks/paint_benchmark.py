@@ -0,0 +1,192 @@
+"""Ukur biaya format rupiah saat Table View di-paint (platform Qt offscreen).
+
+Membandingkan CurrencyDelegate lama (QLocale baru dan float(str()) di setiap
+panggilan) dengan formatter bersama di currency.py, untuk panggilan displayText
+langsung dan untuk repaint viewport QTableView sambil di-scroll.
+
+Contoh:
+    python -m benchmarks.paint_benchmark --scale 100k --rows 20000 --frames 200
+
+Hasil ditulis sebagai JSON (default benchmarks/results/paint_benchmark.json).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR, QLocale, Qt
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QApplication, QStyledItemDelegate, QTableView
+
+from benchmarks import RESULTS_DIR, SCALES, scale_database
+import currency
+import queries
+from table_view import CurrencyDelegate
+
+
+class LegacyCurrencyDelegate(QStyledItemDelegate):
+    """CurrencyDelegate sebelum memakai currency.py, sebagai pembanding"""
+
+    def displayText(self, value, qt_locale):
+        try:
+            num = float(str(value))
+            indonesian_locale = QLocale(QLocale.Language.Indonesian, QLocale.Country.Indonesia)
+            return f"Rp {indonesian_locale.toString(num, 'f', 0)}"
+        except Exception as e:
+            print(f"DEBUG: Error in CurrencyDelegate for value '{value}': {e}")
+            return str(value)
+
+
+DELEGATES = {"legacy": LegacyCurrencyDelegate, "cached": CurrencyDelegate}
+
+
+def timed(delegate_class):
+    """Subclass delegate yang menjumlahkan waktu di dalam displayText (detik)"""
+
+    class TimedDelegate(delegate_class):
+        elapsed = 0.0
+
+        def displayText(self, value, qt_locale):
+            start = time.perf_counter()
+            try:
+                return super().displayText(value, qt_locale)
+            finally:
+                self.elapsed += time.perf_counter() - start
+
+    return TimedDelegate
+
+
+def load_rows(path, limit):
+    """Baris Table View (urutan default) dari database skala"""
+    _name, sql, params = queries.table_view_page("", "Semua", "first", limit=limit)
+    conn = sqlite3.connect(path)
+    rows = conn.execute(sql, params).fetchall()
+    headers = [column[0] for column in conn.execute(sql, params).description]
+    conn.close()
+    return headers, rows
+
+
+def build_model(headers, rows):
+    model = QStandardItemModel(len(rows), len(headers))
+    model.setHorizontalHeaderLabels(headers)
+    for row_number, row in enumerate(rows):
+        for column, value in enumerate(row):
+            item = QStandardItem()
+            item.setData(value, Qt.ItemDataRole.DisplayRole)
+            model.setItem(row_number, column, item)
+    return model
+
+
+def time_display_text(delegate, values, repeat):
+    locale = QLocale()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            delegate.displayText(value, locale)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def time_paint(table, delegate, frames):
+    """Scroll per satu layar dan repaint viewport secara sinkron.
+
+    Mengembalikan durasi per frame dan waktu di dalam displayText per frame (ms).
+    """
+    scrollbar = table.verticalScrollBar()
+    step = max(1, table.viewport().height() // table.verticalHeader().defaultSectionSize())
+    durations, formatting = [], []
+    scrollbar.setValue(0)
+    for frame in range(frames):
+        scrollbar.setValue((frame * step) % max(1, scrollbar.maximum()))
+        delegate.elapsed = 0.0
+        start = time.perf_counter()
+        table.viewport().repaint()
+        durations.append((time.perf_counter() - start) * 1000)
+        formatting.append(delegate.elapsed * 1000)
+    return durations, formatting
+
+
+def _timing(durations):
+    return {
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "mean_ms": round(statistics.mean(durations), 3),
+        "max_ms": round(max(durations), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark paint CurrencyDelegate di platform offscreen")
+    parser.add_argument("--scale", default="10k", choices=list(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rows", type=int, default=10000, help="jumlah baris Table View yang dimuat")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "paint_benchmark.json"))
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    headers, rows = load_rows(scale_database(args.scale, args.seed), args.rows)
+    values = [row[column] for row in rows for column in queries.TABLE_VIEW_CURRENCY_COLUMNS]
+    model = build_model(headers, rows)
+
+    report = {
+        "benchmark": "paint",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "qpa": app.platformName(),
+        "scale": args.scale,
+        "rows": len(rows),
+        "frames": args.frames,
+        "results": [],
+    }
+    for label, delegate_class in DELEGATES.items():
+        currency._format_integer.cache_clear()
+        delegate = timed(delegate_class)()
+        display_text = time_display_text(delegate, values, args.repeat)
+
+        table = QTableView()
+        table.resize(1280, 800)
+        table.setModel(model)
+        for column in queries.TABLE_VIEW_CURRENCY_COLUMNS:
+            table.setItemDelegateForColumn(column, delegate)
+        table.show()
+        app.processEvents()
+        # Frame pemanasan: cache glyph dan backing store sudah terisi sebelum diukur
+        time_paint(table, delegate, min(args.frames, 20))
+        paint, formatting = time_paint(table, delegate, args.frames)
+        table.close()
+
+        result = {
+            "delegate": label,
+            "display_text_calls": len(values),
+            "display_text": _timing(display_text),
+            "paint_frame": _timing(paint),
+            "display_text_per_frame": _timing(formatting),
+        }
+        if label == "cached":
+            result["cache"] = currency.cache_info()._asdict()
+        report["results"].append(result)
+        print(f"{label}: displayText {len(values)}x {result['display_text']['median_ms']} ms, "
+              f"paint {result['paint_frame']['median_ms']} ms/frame "
+              f"(displayText {result['display_text_per_frame']['median_ms']} ms)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil benchmark ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
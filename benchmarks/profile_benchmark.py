@@ -0,0 +1,134 @@
+"""Bandingkan throughput insert dan query antar profil koneksi (connection_profile.PROFILES).
+
+Setiap profil dijalankan pada salinan baru database skala agar journal_mode dan
+isi WAL profil sebelumnya tidak ikut terbawa. Beban yang diukur:
+- transaksi Tambah Pinjaman: satu pinjaman + jadwal cicilan per commit
+  (Repository.pinjaman.add_with_schedule, dipakai AddDataDialog)
+- insert batch: banyak cicilan dalam satu transaksi (Repository.cicilan.add_many, dipakai csv_import)
+- query: semua query dari query_benchmark.benchmark_cases
+
+Contoh:
+    python -m benchmarks.profile_benchmark --scale 100k --transactions 500
+
+Hasil ditulis sebagai JSON (default benchmarks/results/profile_benchmark.json).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from benchmarks import RESULTS_DIR, SCALES, scale_database
+from benchmarks.query_benchmark import benchmark_cases
+import connection_profile
+from repository import Repository
+
+TENOR = 6
+
+
+def time_transactions(repository, count):
+    """`count` transaksi Tambah Pinjaman (pinjaman + jadwal cicilan TENOR bulan), commit per transaksi"""
+    id_peminjam = repository.conn.execute("SELECT MIN(id_peminjam) FROM peminjam").fetchone()[0]
+    start = time.perf_counter()
+    for _ in range(count):
+        repository.pinjaman.add_with_schedule(id_peminjam, 6000000, "2024-01-01", f"2024-{TENOR + 1:02d}-01", "Aktif")
+    return time.perf_counter() - start
+
+
+def time_batch_insert(repository, rows):
+    """`rows` cicilan dalam satu transaksi"""
+    id_pinjaman = repository.conn.execute("SELECT MIN(id_pinjaman) FROM pinjaman").fetchone()[0]
+    start = time.perf_counter()
+    repository.cicilan.add_many((id_pinjaman, 1000 + row, 1000, None, "Belum Bayar") for row in range(rows))
+    return time.perf_counter() - start
+
+
+def time_queries(conn, repeat):
+    """Total waktu semua query aplikasi, `repeat` kali per query setelah satu pemanasan"""
+    cases = benchmark_cases(conn)
+    for _group, _name, sql, params, _fetch in cases:
+        conn.execute(sql, params).fetchall()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _group, _name, sql, params, _fetch in cases:
+            conn.execute(sql, params).fetchall()
+    return len(cases) * repeat, time.perf_counter() - start
+
+
+def run_profile(name, source, workdir, args):
+    path = os.path.join(workdir, f"{name}.db")
+    shutil.copyfile(source, path)
+    profile = connection_profile.load_profile(name=name)
+    repository = Repository.open(path, profile)
+    conn = repository.conn
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    query_count, query_s = time_queries(conn, args.repeat)
+    transaction_s = time_transactions(repository, args.transactions)
+    batch_s = time_batch_insert(repository, args.batch_rows)
+    # Query diulang setelah insert: pembaca WAL juga membaca halaman yang belum di-checkpoint
+    query_count_after, query_after_s = time_queries(conn, args.repeat)
+    conn.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    return {
+        "profile": name,
+        "pragmas": profile.pragmas,
+        "journal_mode": journal_mode,
+        "transactions_per_s": round(args.transactions / transaction_s, 1),
+        "batch_rows_per_s": round(args.batch_rows / batch_s, 1),
+        "queries_per_s": round(query_count / query_s, 1),
+        "queries_per_s_after_insert": round(query_count_after / query_after_s, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark profil koneksi SQLite")
+    parser.add_argument("--scale", default="100k", choices=list(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profiles", nargs="+", default=list(connection_profile.PROFILES),
+                        choices=list(connection_profile.PROFILES))
+    parser.add_argument("--transactions", type=int, default=500, help="jumlah transaksi Tambah Pinjaman")
+    parser.add_argument("--batch-rows", type=int, default=100000, help="jumlah cicilan insert batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", help="folder salinan database (default: folder sementara)")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "profile_benchmark.json"))
+    args = parser.parse_args(argv)
+
+    source = scale_database(args.scale, args.seed)
+    report = {
+        "benchmark": "profile",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "transactions": args.transactions,
+        "batch_rows": args.batch_rows,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    # Folder sementara bisa berupa tmpfs; pakai --workdir untuk mengukur di disk database sebenarnya
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        for name in args.profiles:
+            result = run_profile(name, source, workdir, args)
+            report["results"].append(result)
+            print(f"{name} ({result['journal_mode']}): {result['transactions_per_s']} transaksi/s, "
+                  f"{result['batch_rows_per_s']} baris batch/s, {result['queries_per_s']} query/s "
+                  f"({result['queries_per_s_after_insert']} setelah insert)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil benchmark ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
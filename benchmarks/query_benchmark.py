@@ -0,0 +1,203 @@
+"""Ukur waktu setiap query yang dijalankan Table View, Record View dan dialog Tambah Data.
+
+Contoh:
+    python -m benchmarks.query_benchmark --scales 10k 100k 1m --repeat 5
+
+Hasil ditulis sebagai JSON (default benchmarks/results/query_benchmark.json).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import time
+
+from benchmarks import RESULTS_DIR, SCALES, scale_database
+import queries
+
+# Ukuran halaman sama dengan EditableSqlQueryModel.PAGE_SIZE dan LoanTreeModel.PAGE_SIZE
+TABLE_PAGE_SIZE = 100
+TREE_PAGE_SIZE = 200
+STATUS_FILTERS = ["Semua", "Aktif", "Lunas", "Belum Bayar"]
+
+# SELECT satu record yang dibentuk QSqlTableModel (filter primary key) di RecordViewWidget._load_record
+RECORD_VIEW_SELECTS = {
+    "peminjam": 'SELECT "id_peminjam", "nama", "alamat", "no_telp", "email" FROM peminjam WHERE (id_peminjam = ?)',
+    "pinjaman": (
+        'SELECT "id_pinjaman", "id_peminjam", "jumlah_pinjaman", "tanggal_pinjam", "tanggal_selesai", "status" '
+        'FROM pinjaman WHERE (id_pinjaman = ?)'),
+    "cicilan": (
+        'SELECT "id_cicilan", "id_pinjaman", "cicilan_ke", "jumlah_cicilan", "tanggal_bayar", "status_bayar", '
+        '"tanggal_jatuh_tempo" FROM cicilan WHERE (id_cicilan = ?)'),
+}
+# Langkah RecordCursor: COUNT (sekali, disimpan) lalu keyset per tombol navigasi
+RECORD_VIEW_STEPS = ["count", "first", "next", "prev", "last", "position"]
+
+# Picker di form Record View: halaman pertama saat dibuka (lihat lookup.py)
+RECORD_VIEW_LOOKUPS = {
+    "pinjaman": ["peminjam_lookup"],
+    "cicilan": ["pinjaman_lookup"],
+}
+LOOKUP_PAGE_SIZE = 50
+
+
+def lookup_params(name, prefix=""):
+    """Parameter halaman pertama picker `name` untuk prefix nama `prefix`"""
+    if name == "pinjaman_lookup":
+        return [0, LOOKUP_PAGE_SIZE]
+    after = ["", 0] if name == "peminjam_lookup" else ["", 0, 0]
+    return queries.lookup_prefix_bounds(prefix) + after + [LOOKUP_PAGE_SIZE]
+
+
+def _sample_nama(conn):
+    """Potongan nama peminjam yang benar-benar ada, untuk filter FTS"""
+    row = conn.execute("SELECT nama FROM peminjam ORDER BY id_peminjam LIMIT 1").fetchone()
+    return row[0].split()[0][:4] if row else "Budi"
+
+
+def _sample_peminjam(conn):
+    row = conn.execute("SELECT id_peminjam FROM pinjaman ORDER BY id_pinjaman LIMIT 1").fetchone()
+    return row[0] if row else 1
+
+
+def benchmark_cases(conn):
+    """Daftar (grup, nama, sql, parameter, batas baris yang diambil; None = semua)"""
+    cases = []
+    nama = _sample_nama(conn)
+
+    # TableViewWidget.update_query: COUNT + halaman pertama + halaman berikutnya per filter
+    for nama_filter in ("", nama):
+        for status_filter in STATUS_FILTERS:
+            label = f"nama={nama_filter or '-'} status={status_filter}"
+            name, sql, params = queries.table_view_page(nama_filter, status_filter, "count")
+            cases.append(("table_view", f"{label} count", sql, params, None))
+            name, sql, params = queries.table_view_page(nama_filter, status_filter, "first",
+                                                        limit=TABLE_PAGE_SIZE)
+            cases.append(("table_view", f"{label} first", sql, params, None))
+            first_page = conn.execute(sql, params).fetchall()
+            if first_page:
+                key = [first_page[-1][column] for column in queries.table_view_sort_keys(0)]
+                name, sql, params = queries.table_view_page(nama_filter, status_filter, "next",
+                                                            key=key, limit=TABLE_PAGE_SIZE)
+                cases.append(("table_view", f"{label} next", sql, params, None))
+            name, sql, params = queries.loan_tree_page(nama_filter, status_filter, 0, TREE_PAGE_SIZE)
+            cases.append(("loan_tree", label, sql, params, None))
+
+    # Header kolom diklik: halaman pertama untuk setiap urutan dan filter status
+    for sort_column in range(len(queries.TABLE_VIEW_SORT_COLUMNS)):
+        if sort_column in queries.TABLE_VIEW_HIDDEN_COLUMNS:
+            continue
+        for status_filter in STATUS_FILTERS:
+            for descending in (False, True):
+                name, sql, params = queries.table_view_page("", status_filter, "first", sort_column, descending,
+                                                            limit=TABLE_PAGE_SIZE)
+                cases.append(("table_view_sort", f"kolom={sort_column} status={status_filter} desc={descending}",
+                              sql, params, None))
+
+    # RecordViewWidget: navigasi keyset, select() satu record + picker di form
+    for table_name, sql in RECORD_VIEW_SELECTS.items():
+        key = queries.RECORD_VIEW_KEYS[table_name]
+        middle = conn.execute(f"SELECT {key} FROM {table_name} ORDER BY {key} "
+                              f"LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM {table_name})").fetchone()
+        middle = middle[0] if middle else 1
+        for step in RECORD_VIEW_STEPS:
+            statement = f"record_{table_name}_{step}"
+            sql_step = queries.STATEMENTS[statement]
+            cases.append(("record_view", f"{table_name} {step}", sql_step, [middle] * sql_step.count("?"), None))
+        cases.append(("record_view", f"{table_name} select", sql, [middle], None))
+        for statement in RECORD_VIEW_LOOKUPS.get(table_name, []):
+            cases.append(("record_view", f"{table_name} {statement}", queries.STATEMENTS[statement],
+                          lookup_params(statement), None))
+
+    # Picker diketik: prefix nama peminjam
+    for statement in ("peminjam_lookup", "pinjaman_lookup_nama"):
+        cases.append(("lookup", f"{statement} prefix={nama}", queries.STATEMENTS[statement],
+                      lookup_params(statement, nama), None))
+
+    # AddDataDialog: picker peminjam dan pinjaman milik peminjam terpilih
+    cases.append(("add_data_dialog", "peminjam_lookup", queries.STATEMENTS["peminjam_lookup"],
+                  lookup_params("peminjam_lookup"), None))
+    cases.append(("add_data_dialog", "pinjaman_by_peminjam", queries.STATEMENTS["pinjaman_by_peminjam"],
+                  [_sample_peminjam(conn)], None))
+    return cases
+
+
+def time_case(conn, sql, params, fetch, repeat):
+    """Jalankan satu query `repeat` kali; kembalikan (daftar durasi ms, jumlah baris)"""
+    durations = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor = conn.execute(sql, params)
+        result = cursor.fetchall() if fetch is None else cursor.fetchmany(fetch)
+        durations.append((time.perf_counter() - start) * 1000)
+        cursor.close()
+        rows = len(result)
+    return durations, rows
+
+
+def run_scale(label, seed, repeat):
+    start = time.perf_counter()
+    path = scale_database(label, seed)
+    prepare_s = time.perf_counter() - start
+
+    conn = sqlite3.connect(path)
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ("peminjam", "pinjaman", "cicilan")}
+    results = []
+    for group, name, sql, params, fetch in benchmark_cases(conn):
+        # Satu eksekusi pemanasan agar cache halaman SQLite sudah terisi
+        conn.execute(sql, params).fetchall()
+        durations, rows = time_case(conn, sql, params, fetch, repeat)
+        results.append({
+            "scale": label,
+            "group": group,
+            "query": name,
+            "rows": rows,
+            "min_ms": round(min(durations), 3),
+            "median_ms": round(statistics.median(durations), 3),
+            "mean_ms": round(statistics.mean(durations), 3),
+            "max_ms": round(max(durations), 3),
+        })
+    conn.close()
+    return {"scale": label, "database": path, "prepare_s": round(prepare_s, 2), "counts": counts}, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark query aplikasi pada data sintetis")
+    parser.add_argument("--scales", nargs="+", default=list(SCALES), choices=list(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "query_benchmark.json"))
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "query",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "scales": [],
+        "results": [],
+    }
+    for label in args.scales:
+        scale, results = run_scale(label, args.seed, args.repeat)
+        report["scales"].append(scale)
+        report["results"].extend(results)
+        slowest = max(results, key=lambda result: result["median_ms"])
+        print(f"{label}: {len(results)} query, paling lambat {slowest['group']} {slowest['query']} "
+              f"({slowest['median_ms']} ms)")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil benchmark ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
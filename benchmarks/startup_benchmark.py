@@ -0,0 +1,85 @@
+"""Ukur waktu startup aplikasi: import, jendela dibuat, paint pertama dan data pertama Table View.
+
+Setiap run menjalankan `python main.py --startup-time` sebagai proses baru (platform
+Qt offscreen) pada salinan database skala, sehingga waktu import ikut terukur.
+Angka per tahap adalah ms sejak main.py mulai dimuat (lihat main.STARTUP_MS);
+`process` adalah waktu dinding dari proses dijalankan sampai selesai ditutup.
+
+Contoh:
+    python -m benchmarks.startup_benchmark --scale 1m --runs 5
+
+Hasil ditulis sebagai JSON (default benchmarks/results/startup_benchmark.json).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import RESULTS_DIR, ROOT_DIR, SCALES, scale_database
+
+STAGES = ["import", "window", "first_paint", "first_data", "process"]
+
+
+def run_once(workdir, timeout):
+    """Satu proses aplikasi; dict tahap -> ms"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT_DIR, "main.py"), "--startup-time"],
+                            cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout)
+    process_ms = round((time.perf_counter() - start) * 1000, 1)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"main.py --startup-time gagal (exit {result.returncode}):\n{result.stderr}")
+    stages = json.loads(lines[-1])
+    stages["process"] = process_ms
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark waktu startup aplikasi")
+    parser.add_argument("--scale", default="100k", choices=list(SCALES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120, help="batas waktu per run (detik)")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "startup_benchmark.json"))
+    args = parser.parse_args(argv)
+
+    source = scale_database(args.scale, args.seed)
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copyfile(source, os.path.join(workdir, "database.db"))
+        # Satu run pemanasan: migrasi/ANALYZE pertama dan cache file OS tidak ikut terukur
+        run_once(workdir, args.timeout)
+        for number in range(1, args.runs + 1):
+            stages = run_once(workdir, args.timeout)
+            runs.append(stages)
+            print(f"run {number}: " + ", ".join(f"{stage} {stages[stage]:.0f} ms" for stage in STAGES))
+
+    median = {stage: round(statistics.median(run[stage] for run in runs), 1) for stage in STAGES}
+    print("median: " + ", ".join(f"{stage} {median[stage]:.0f} ms" for stage in STAGES))
+    report = {
+        "benchmark": "startup",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "median_ms": median,
+        "runs": runs,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil benchmark ditulis ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
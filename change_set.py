@@ -0,0 +1,76 @@
+"""Perubahan Record View yang belum disimpan, dan penyimpanannya dalam satu transaksi.
+
+Hanya record yang diubah atau ditandai hapus yang dicatat (kolom yang berubah
+per id), sehingga beberapa record bisa diedit lalu disimpan sekaligus. commit()
+menjalankan UPDATE/DELETE di dalam satu transaksi (lihat repository.apply_changes).
+Jika ada record yang gagal, seluruh transaksi dibatalkan, pesan error dicatat per
+record, dan semua perubahan tetap tersimpan di sini untuk diperbaiki lalu disimpan ulang.
+"""
+
+
+class ChangeSet:
+    """Perubahan satu tabel: kolom yang diubah per id, id yang akan dihapus, dan error per id.
+
+    `invalid` berisi hasil validasi yang menahan commit; `errors` berisi error terakhir
+    per record (validasi atau dari database) untuk ditampilkan.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.updates = {}
+        self.deletes = set()
+        self.invalid = {}
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.updates.keys() | self.deletes)
+
+    def changes(self, id_value):
+        """Kolom -> nilai yang belum disimpan untuk record `id_value`"""
+        return self.updates.get(id_value, {})
+
+    def is_deleted(self, id_value):
+        return id_value in self.deletes
+
+    def stage_update(self, id_value, changes, error=None):
+        """Catat kolom yang berbeda dari database untuk `id_value` (dict kosong = tidak ada perubahan).
+
+        `error` adalah hasil validasi record; record dengan error tidak akan disimpan.
+        """
+        self.invalid.pop(id_value, None)
+        self.errors.pop(id_value, None)
+        if not changes:
+            self.updates.pop(id_value, None)
+            return
+        self.updates[id_value] = dict(changes)
+        if error:
+            self.invalid[id_value] = self.errors[id_value] = error
+
+    def stage_delete(self, id_value):
+        self.updates.pop(id_value, None)
+        self.invalid.pop(id_value, None)
+        self.errors.pop(id_value, None)
+        self.deletes.add(id_value)
+
+    def clear(self):
+        self.updates.clear()
+        self.deletes.clear()
+        self.invalid.clear()
+        self.errors.clear()
+
+    def commit(self, repository):
+        """Simpan semua perubahan dalam satu transaksi lewat `repository` (lihat repository.py).
+
+        Mengembalikan dict id -> pesan error. Dict kosong berarti semua tersimpan dan
+        change set dikosongkan; selain itu tidak ada yang disimpan dan perubahan tetap ada.
+        """
+        if self.invalid:
+            self.errors = dict(self.invalid)
+            return dict(self.errors)
+
+        errors = repository.table(self.table).apply_changes(self.updates, self.deletes)
+        if errors:
+            self.errors = errors
+            return dict(errors)
+        self.clear()
+        return {}
@@ -0,0 +1,132 @@
+"""Profil PRAGMA SQLite yang dipasang di setiap koneksi aplikasi (Qt maupun sqlite3).
+
+Profil "tuned" (default) memakai WAL dengan synchronous=NORMAL, mmap, cache
+halaman yang lebih besar, tabel sementara di memori, dan foreign key aktif.
+Profil "bawaan" menulis ulang nilai bawaan SQLite (journal DELETE, synchronous
+FULL) untuk instalasi yang database-nya ada di folder jaringan, karena WAL butuh
+shared memory di mesin yang sama.
+
+Per instalasi, profil bisa diganti lewat file `database_profile.json` di folder
+database, contohnya:
+
+    {"profile": "tuned", "pragma": {"cache_size": -131072}, "maintenance_menit": 30,
+     "slow_query_ms": 50, "cached_statements": 512}
+
+atau nama profil lewat environment variable SIMPAN_PINJAM_DB_PROFILE.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from collections import namedtuple
+from urllib.parse import quote
+
+PROFILES = {
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        # Nilai negatif = KiB, jadi 64 MiB per koneksi
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+    "bawaan": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "foreign_keys": "OFF",
+        "busy_timeout": 5000,
+    },
+}
+DEFAULT_PROFILE = "tuned"
+CONFIG_FILE = "database_profile.json"
+ENV_PROFILE = "SIMPAN_PINJAM_DB_PROFILE"
+
+# PRAGMA yang boleh diatur lewat file konfigurasi
+ALLOWED_PRAGMAS = {"journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store",
+                   "foreign_keys", "busy_timeout", "wal_autocheckpoint"}
+_VALUE_PATTERN = re.compile(r"^(-?\d+|[A-Za-z]+)$")
+
+MAINTENANCE_MINUTES = 15
+# Ukuran cache statement ter-prepare sqlite3 per koneksi (bawaan sqlite3 hanya 128). Varian
+# keyset/urutan Table View dan UPDATE per kombinasi kolom menghasilkan banyak teks SQL berbeda.
+CACHED_STATEMENTS = 256
+
+# slow_query_ms: ambang slow query log (None = bawaan query_stats.SLOW_QUERY_MS)
+Profile = namedtuple("Profile", ["name", "pragmas", "maintenance_minutes", "slow_query_ms",
+                                 "cached_statements"])
+
+
+def config_path(db_name):
+    return os.path.join(os.path.dirname(os.path.abspath(db_name)), CONFIG_FILE)
+
+
+def load_profile(db_name=None, name=None):
+    """Profil untuk database `db_name`: `name`, lalu env SIMPAN_PINJAM_DB_PROFILE, lalu file konfigurasi"""
+    config = {}
+    path = config_path(db_name) if db_name and db_name != ":memory:" else None
+    if path and os.path.exists(path):
+        try:
+            with open(path) as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error membaca {path}: {e}")
+
+    name = name or os.environ.get(ENV_PROFILE) or config.get("profile") or DEFAULT_PROFILE
+    if name not in PROFILES:
+        print(f"Profil database '{name}' tidak dikenal, memakai '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+    pragmas = dict(PROFILES[name])
+    for pragma, value in config.get("pragma", {}).items():
+        if pragma not in ALLOWED_PRAGMAS or not _VALUE_PATTERN.match(str(value)):
+            print(f"PRAGMA {pragma} = {value!r} di {path} diabaikan")
+            continue
+        pragmas[pragma] = value
+    return Profile(name, pragmas, config.get("maintenance_menit", MAINTENANCE_MINUTES),
+                   config.get("slow_query_ms"), config.get("cached_statements", CACHED_STATEMENTS))
+
+
+def pragma_statements(profile, read_only=False):
+    """Statement PRAGMA profil, journal_mode lebih dulu (dilewati untuk koneksi read-only,
+    karena journal_mode milik file database dan hanya bisa diganti koneksi tulis)"""
+    order = sorted(profile.pragmas, key=lambda pragma: pragma != "journal_mode")
+    return [f"PRAGMA {pragma} = {profile.pragmas[pragma]}" for pragma in order
+            if not (read_only and pragma == "journal_mode")]
+
+
+def apply(conn, profile, read_only=False):
+    """Pasang profil ke koneksi sqlite3 yang baru dibuka"""
+    for statement in pragma_statements(profile, read_only):
+        conn.execute(statement).fetchall()
+
+
+def connect(db_name, profile=None, read_only=False):
+    """sqlite3.connect dengan profil koneksi aplikasi (PRAGMA dan ukuran cache statement)"""
+    profile = profile or load_profile(db_name)
+    if read_only:
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(db_name))}?mode=ro", uri=True,
+                               cached_statements=profile.cached_statements)
+    else:
+        conn = sqlite3.connect(db_name, cached_statements=profile.cached_statements)
+    apply(conn, profile, read_only)
+    return conn
+
+
+def maintenance_statements(checkpoint="PASSIVE"):
+    """ANALYZE seperlunya (dibatasi analysis_limit agar cepat) lalu checkpoint WAL.
+
+    PASSIVE (berkala) tidak menunggu pembaca; TRUNCATE (saat aplikasi ditutup)
+    mengosongkan file -wal sehingga database.db bisa disalin sendirian.
+    """
+    return ["PRAGMA analysis_limit = 1000", "PRAGMA optimize", f"PRAGMA wal_checkpoint({checkpoint})"]
+
+
+def maintenance(conn, checkpoint="PASSIVE"):
+    """PRAGMA optimize dan checkpoint WAL untuk koneksi sqlite3"""
+    for statement in maintenance_statements(checkpoint):
+        conn.execute(statement).fetchall()
@@ -1,44 +1,455 @@
-import sqlite3
+import argparse
+import datetime
+import random
+import sys
 
+import connection_profile
+import installment_schedule
+import queries
+from repository import Repository
 
-def create_database():
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+DB_NAME = 'database.db'
 
-    
-    cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS peminjam (
-                        id_peminjam INTEGER PRIMARY KEY AUTOINCREMENT, 
-                        nama TEXT NOT NULL, alamat TEXT NOT NULL, 
-                        no_telp TEXT NOT NULL, email TEXT NOT NULL
-                    )
-                   ''')
-    
-    cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS pinjaman (
-                        id_pinjaman INTEGER PRIMARY KEY AUTOINCREMENT, 
-                        id_peminjam INTEGER NOT NULL, 
-                        jumlah_pinjaman REAL NOT NULL, 
-                        tanggal_pinjam TEXT NOT NULL, 
-                        tanggal_selesai TEXT NOT NULL, 
-                        status TEXT NOT NULL, 
-                        FOREIGN KEY (id_peminjam) REFERENCES peminjam (id_peminjam)
-                    )
-                   ''')
 
-    
-    cursor.execute('''
-                   CREATE TABLE IF NOT EXISTS cicilan (
-                        id_cicilan INTEGER PRIMARY KEY AUTOINCREMENT, 
-                        id_pinjaman INTEGER NOT NULL, 
-                        cicilan_ke INTEGER NOT NULL, 
-                        jumlah_cicilan REAL NOT NULL, 
-                        tanggal_bayar TEXT, 
-                        status_bayar TEXT NOT NULL, 
-                        FOREIGN KEY (id_pinjaman) REFERENCES pinjaman (id_pinjaman)
-                    )
-                   ''')
+def _due_date(tanggal, ke):
+    """SQL tanggal jatuh tempo cicilan ke-`ke`: tanggal + ke bulan, hari dipotong ke akhir bulan"""
+    return (f"MIN(date({tanggal}, 'start of month', '+' || ({ke}) || ' months', "
+            f"'+' || (CAST(strftime('%d', {tanggal}) AS INTEGER) - 1) || ' days'), "
+            f"date({tanggal}, 'start of month', '+' || (({ke}) + 1) || ' months', '-1 day'))")
+
+
+def _next_due(id_expr):
+    """SQL tanggal jatuh tempo cicilan Belum Bayar terkecil"""
+    return (f"(SELECT {_due_date('pinjaman.tanggal_pinjam', 'MIN(cicilan.cicilan_ke)')} "
+            f"FROM pinjaman, cicilan WHERE pinjaman.id_pinjaman = {id_expr} "
+            f"AND cicilan.id_pinjaman = {id_expr} AND cicilan.status_bayar = 'Belum Bayar')")
+
+
+def _apply_cicilan(row, sign):
+    """SQL trigger yang menambah (sign=1) atau mengurangi (sign=-1) satu cicilan dari ringkasan"""
+    paid = f"({row}.status_bayar = 'Lunas')"
+    paid_amount = f"(CASE WHEN {row}.status_bayar = 'Lunas' THEN {row}.jumlah_cicilan ELSE 0 END)"
+    return f'''UPDATE pinjaman_ringkasan
+               SET total_cicilan = total_cicilan + {sign},
+                   cicilan_terbayar = cicilan_terbayar + {sign} * {paid},
+                   jumlah_dibayar = jumlah_dibayar + {sign} * {paid_amount},
+                   sisa = sisa - {sign} * {paid_amount},
+                   jatuh_tempo_berikutnya = {_next_due(f"{row}.id_pinjaman")}
+             WHERE id_pinjaman = {row}.id_pinjaman;'''
+
+
+def _add_column(table, column, definition):
+    """Langkah migrasi ALTER TABLE ADD COLUMN yang dilewati bila kolom sudah ada.
+
+    Database dari migrasi yang dulu terputus setelah ALTER (sebelum migrasi berjalan
+    dalam satu transaksi) sudah punya kolomnya tetapi user_version belum naik.
+    """
+    def apply(conn):
+        if column not in [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return apply
+
+
+RINGKASAN_REBUILD_DELETE = "DELETE FROM pinjaman_ringkasan"
+
+RINGKASAN_REBUILD_INSERT = f'''
+    INSERT INTO pinjaman_ringkasan
+        (id_pinjaman, total_cicilan, jumlah_dibayar, sisa, cicilan_terbayar, jatuh_tempo_berikutnya)
+    SELECT pinjaman.id_pinjaman,
+           COUNT(cicilan.id_cicilan),
+           COALESCE(SUM(CASE WHEN cicilan.status_bayar = 'Lunas' THEN cicilan.jumlah_cicilan END), 0),
+           pinjaman.jumlah_pinjaman
+               - COALESCE(SUM(CASE WHEN cicilan.status_bayar = 'Lunas' THEN cicilan.jumlah_cicilan END), 0),
+           COALESCE(SUM(cicilan.status_bayar = 'Lunas'), 0),
+           {_due_date("pinjaman.tanggal_pinjam",
+                      "MIN(CASE WHEN cicilan.status_bayar = 'Belum Bayar' THEN cicilan.cicilan_ke END)")}
+    FROM pinjaman
+             LEFT JOIN cicilan ON cicilan.id_pinjaman = pinjaman.id_pinjaman
+    GROUP BY pinjaman.id_pinjaman
+'''
+
+
+# Baris ringkasan ikut pindah bila id_pinjaman diubah (sebelum FOREIGN KEY diperiksa di akhir statement)
+RINGKASAN_PINJAMAN_UPDATE = f'''
+    CREATE TRIGGER IF NOT EXISTS ringkasan_pinjaman_update
+    AFTER UPDATE OF id_pinjaman, jumlah_pinjaman, tanggal_pinjam ON pinjaman BEGIN
+        UPDATE pinjaman_ringkasan SET id_pinjaman = new.id_pinjaman
+         WHERE id_pinjaman = old.id_pinjaman AND old.id_pinjaman != new.id_pinjaman;
+        UPDATE pinjaman_ringkasan
+           SET sisa = new.jumlah_pinjaman - jumlah_dibayar,
+               jatuh_tempo_berikutnya = {_next_due("new.id_pinjaman")}
+         WHERE id_pinjaman = new.id_pinjaman;
+    END
+    '''
+
+# Trigger yang menjaga pinjaman_ringkasan tetap sesuai dengan pinjaman dan cicilan
+RINGKASAN_TRIGGER_NAMES = ["ringkasan_pinjaman_insert", "ringkasan_pinjaman_update", "ringkasan_pinjaman_delete",
+                           "ringkasan_cicilan_insert", "ringkasan_cicilan_delete", "ringkasan_cicilan_update"]
+
+RINGKASAN_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS ringkasan_pinjaman_insert AFTER INSERT ON pinjaman BEGIN
+        INSERT OR REPLACE INTO pinjaman_ringkasan (id_pinjaman, sisa, jatuh_tempo_berikutnya)
+        VALUES (new.id_pinjaman, new.jumlah_pinjaman, {_next_due("new.id_pinjaman")});
+    END
+    ''',
+    RINGKASAN_PINJAMAN_UPDATE,
+    '''
+    CREATE TRIGGER IF NOT EXISTS ringkasan_pinjaman_delete AFTER DELETE ON pinjaman BEGIN
+        DELETE FROM pinjaman_ringkasan WHERE id_pinjaman = old.id_pinjaman;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS ringkasan_cicilan_insert AFTER INSERT ON cicilan BEGIN
+        {_apply_cicilan("new", 1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS ringkasan_cicilan_delete AFTER DELETE ON cicilan BEGIN
+        {_apply_cicilan("old", -1)}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS ringkasan_cicilan_update
+    AFTER UPDATE OF id_pinjaman, cicilan_ke, jumlah_cicilan, status_bayar ON cicilan BEGIN
+        {_apply_cicilan("old", -1)}
+        {_apply_cicilan("new", 1)}
+    END
+    ''',
+]
+
+
+# Setiap migrasi dijalankan sekali, urut berdasarkan PRAGMA user_version
+MIGRATIONS = [
+    (1, [
+        '''
+        CREATE TABLE IF NOT EXISTS peminjam (
+            id_peminjam INTEGER PRIMARY KEY AUTOINCREMENT,
+            nama TEXT NOT NULL, alamat TEXT NOT NULL,
+            no_telp TEXT NOT NULL, email TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS pinjaman (
+            id_pinjaman INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_peminjam INTEGER NOT NULL,
+            jumlah_pinjaman REAL NOT NULL,
+            tanggal_pinjam TEXT NOT NULL,
+            tanggal_selesai TEXT NOT NULL,
+            status TEXT NOT NULL,
+            FOREIGN KEY (id_peminjam) REFERENCES peminjam (id_peminjam)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS cicilan (
+            id_cicilan INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_pinjaman INTEGER NOT NULL,
+            cicilan_ke INTEGER NOT NULL,
+            jumlah_cicilan REAL NOT NULL,
+            tanggal_bayar TEXT,
+            status_bayar TEXT NOT NULL,
+            FOREIGN KEY (id_pinjaman) REFERENCES pinjaman (id_pinjaman)
+        )
+        ''',
+    ]),
+    (2, [
+        "CREATE INDEX IF NOT EXISTS idx_peminjam_nama ON peminjam (nama)",
+        "CREATE INDEX IF NOT EXISTS idx_pinjaman_peminjam ON pinjaman (id_peminjam, tanggal_pinjam)",
+        "CREATE INDEX IF NOT EXISTS idx_pinjaman_status ON pinjaman (status, id_pinjaman)",
+        # Covering untuk LEFT JOIN cicilan di Table View
+        "CREATE INDEX IF NOT EXISTS idx_cicilan_pinjaman "
+        "ON cicilan (id_pinjaman, cicilan_ke, jumlah_cicilan, status_bayar)",
+        "CREATE INDEX IF NOT EXISTS idx_cicilan_status "
+        "ON cicilan (status_bayar, id_pinjaman, cicilan_ke, jumlah_cicilan)",
+    ]),
+    (3, [
+        # Urutan (id_peminjam, id_pinjaman) agar sort per nama tidak butuh temp B-tree
+        "DROP INDEX IF EXISTS idx_pinjaman_peminjam",
+        "CREATE INDEX IF NOT EXISTS idx_pinjaman_peminjam ON pinjaman (id_peminjam)",
+        "CREATE INDEX IF NOT EXISTS idx_peminjam_no_telp ON peminjam (no_telp)",
+        "CREATE INDEX IF NOT EXISTS idx_pinjaman_jumlah ON pinjaman (jumlah_pinjaman)",
+        "CREATE INDEX IF NOT EXISTS idx_pinjaman_tanggal_pinjam ON pinjaman (tanggal_pinjam)",
+        "CREATE INDEX IF NOT EXISTS idx_pinjaman_tanggal_selesai ON pinjaman (tanggal_selesai)",
+    ]),
+    (4, [
+        # Index full-text peminjam untuk filter Table View, disinkronkan lewat trigger
+        "CREATE VIRTUAL TABLE IF NOT EXISTS peminjam_fts USING fts5("
+        "nama, alamat, no_telp, email, content='peminjam', content_rowid='id_peminjam', "
+        "prefix='2 3')",
+        '''
+        CREATE TRIGGER IF NOT EXISTS peminjam_fts_insert AFTER INSERT ON peminjam BEGIN
+            INSERT INTO peminjam_fts (rowid, nama, alamat, no_telp, email)
+            VALUES (new.id_peminjam, new.nama, new.alamat, new.no_telp, new.email);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS peminjam_fts_delete AFTER DELETE ON peminjam BEGIN
+            INSERT INTO peminjam_fts (peminjam_fts, rowid, nama, alamat, no_telp, email)
+            VALUES ('delete', old.id_peminjam, old.nama, old.alamat, old.no_telp, old.email);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS peminjam_fts_update AFTER UPDATE ON peminjam BEGIN
+            INSERT INTO peminjam_fts (peminjam_fts, rowid, nama, alamat, no_telp, email)
+            VALUES ('delete', old.id_peminjam, old.nama, old.alamat, old.no_telp, old.email);
+            INSERT INTO peminjam_fts (rowid, nama, alamat, no_telp, email)
+            VALUES (new.id_peminjam, new.nama, new.alamat, new.no_telp, new.email);
+        END
+        ''',
+        "INSERT INTO peminjam_fts (peminjam_fts) VALUES ('rebuild')",
+    ]),
+    (5, [
+        '''
+        CREATE TABLE IF NOT EXISTS pinjaman_ringkasan (
+            id_pinjaman INTEGER PRIMARY KEY,
+            total_cicilan INTEGER NOT NULL DEFAULT 0,
+            jumlah_dibayar REAL NOT NULL DEFAULT 0,
+            sisa REAL NOT NULL DEFAULT 0,
+            cicilan_terbayar INTEGER NOT NULL DEFAULT 0,
+            jatuh_tempo_berikutnya TEXT,
+            FOREIGN KEY (id_pinjaman) REFERENCES pinjaman (id_pinjaman)
+        )
+        ''',
+        # Pinjaman yang masih punya cicilan Belum Bayar
+        "CREATE INDEX IF NOT EXISTS idx_ringkasan_belum_bayar ON pinjaman_ringkasan (id_pinjaman) "
+        "WHERE cicilan_terbayar < total_cicilan",
+        *RINGKASAN_TRIGGERS,
+        RINGKASAN_REBUILD_DELETE,
+        RINGKASAN_REBUILD_INSERT,
+    ]),
+    (6, [
+        _add_column("cicilan", "tanggal_jatuh_tempo", "TEXT"),
+        f'''
+        UPDATE cicilan
+           SET tanggal_jatuh_tempo = (SELECT {_due_date("pinjaman.tanggal_pinjam", "cicilan.cicilan_ke")}
+                                        FROM pinjaman WHERE pinjaman.id_pinjaman = cicilan.id_pinjaman)
+        ''',
+        # Cicilan yang disimpan tanpa tanggal jatuh tempo (dialog, import CSV) diisi otomatis
+        f'''
+        CREATE TRIGGER IF NOT EXISTS cicilan_jatuh_tempo_insert AFTER INSERT ON cicilan
+        WHEN new.tanggal_jatuh_tempo IS NULL BEGIN
+            UPDATE cicilan
+               SET tanggal_jatuh_tempo = (SELECT {_due_date("pinjaman.tanggal_pinjam", "new.cicilan_ke")}
+                                            FROM pinjaman WHERE pinjaman.id_pinjaman = new.id_pinjaman)
+             WHERE id_cicilan = new.id_cicilan;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS cicilan_jatuh_tempo_update AFTER UPDATE OF id_pinjaman, cicilan_ke ON cicilan BEGIN
+            UPDATE cicilan
+               SET tanggal_jatuh_tempo = (SELECT {_due_date("pinjaman.tanggal_pinjam", "new.cicilan_ke")}
+                                            FROM pinjaman WHERE pinjaman.id_pinjaman = new.id_pinjaman)
+             WHERE id_cicilan = new.id_cicilan;
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS cicilan_jatuh_tempo_pinjaman AFTER UPDATE OF tanggal_pinjam ON pinjaman BEGIN
+            UPDATE cicilan SET tanggal_jatuh_tempo = {_due_date("new.tanggal_pinjam", "cicilan.cicilan_ke")}
+             WHERE cicilan.id_pinjaman = new.id_pinjaman;
+        END
+        ''',
+        # Jatuh tempo di ringkasan kini dipotong ke akhir bulan, sama dengan jadwal cicilan
+        *[f"DROP TRIGGER IF EXISTS {name}" for name in RINGKASAN_TRIGGER_NAMES],
+        *RINGKASAN_TRIGGERS,
+        RINGKASAN_REBUILD_DELETE,
+        RINGKASAN_REBUILD_INSERT,
+    ]),
+    (7, [
+        # Cari prefix nama tanpa beda huruf besar/kecil di picker peminjam dan pinjaman
+        "CREATE INDEX IF NOT EXISTS idx_peminjam_nama_nocase ON peminjam (nama COLLATE NOCASE)",
+    ]),
+    (8, [
+        # Urutan Table View per kolom cicilan tanpa temp B-tree (lihat queries.TABLE_VIEW_FROM_CICILAN)
+        "CREATE INDEX IF NOT EXISTS idx_cicilan_ke ON cicilan (cicilan_ke, id_pinjaman, jumlah_cicilan, status_bayar)",
+        "CREATE INDEX IF NOT EXISTS idx_cicilan_jumlah "
+        "ON cicilan (jumlah_cicilan, id_pinjaman, cicilan_ke, status_bayar)",
+        # Pinjaman yang belum punya cicilan sama sekali
+        "CREATE INDEX IF NOT EXISTS idx_ringkasan_tanpa_cicilan ON pinjaman_ringkasan (id_pinjaman) "
+        "WHERE total_cicilan = 0",
+    ]),
+    (9, [
+        # Versi lama ringkasan_pinjaman_update tidak memindahkan ringkasan saat id_pinjaman diubah
+        "DROP TRIGGER IF EXISTS ringkasan_pinjaman_update",
+        RINGKASAN_PINJAMAN_UPDATE,
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(conn):
+    """Jalankan migrasi yang belum diterapkan, masing-masing dalam satu transaksi"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        with conn:
+            # Tanpa BEGIN eksplisit DDL langsung di-commit; dengan BEGIN seluruh migrasi
+            # beserta user_version di-commit atau di-rollback bersama
+            conn.execute("BEGIN")
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+        version = target
+    return version
+
+
+def upgrade_database(db_name=DB_NAME):
+    """Upgrade file database yang sudah ada ke versi skema terbaru"""
+    conn = connection_profile.connect(db_name)
+    try:
+        return migrate(conn)
+    finally:
+        conn.close()
 
+
+def rebuild_ringkasan(conn):
+    """Hitung ulang seluruh pinjaman_ringkasan dari pinjaman dan cicilan"""
+    with conn:
+        conn.execute(RINGKASAN_REBUILD_DELETE)
+        conn.execute(RINGKASAN_REBUILD_INSERT)
+    return conn.execute("SELECT COUNT(*) FROM pinjaman_ringkasan").fetchone()[0]
+
+
+NAMA_DEPAN = ["Budi", "Siti", "Ahmad", "Dewi", "Eko", "Rina", "Agus", "Sri", "Joko", "Wati",
+              "Hendra", "Yuni", "Bambang", "Lestari", "Rudi", "Indah", "Slamet", "Ratna", "Fajar", "Ayu"]
+NAMA_BELAKANG = ["Santoso", "Nurhaliza", "Dahlan", "Lestari", "Prasetyo", "Wijaya", "Saputra",
+                 "Hidayat", "Kusuma", "Setiawan", "Rahayu", "Gunawan", "Susanto", "Purnomo", "Wibowo"]
+NAMA_JALAN = ["Merdeka", "Pahlawan", "Pemuda", "Diponegoro", "Sudirman", "Gajah Mada", "Ahmad Yani",
+              "Kartini", "Veteran", "Basuki Rahmat"]
+NAMA_KOTA = ["Surabaya", "Sidoarjo", "Gresik", "Mojokerto", "Malang", "Pasuruan"]
+TENOR_BULAN = [6, 10, 12, 18, 24]
+
+
+def _batched(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_data(conn, jumlah_peminjam, jumlah_pinjaman, jumlah_cicilan, seed=0, batch_size=50000):
+    """Isi database dengan data sintetis acak; hasil sama untuk seed yang sama.
+
+    Semua baris dimasukkan dalam satu transaksi dengan executemany per batch.
+    Trigger FTS dan ringkasan dimatikan selama insert lalu dibangun ulang sekaligus.
+    """
+    rng = random.Random(seed)
+    if jumlah_peminjam <= 0 and jumlah_pinjaman > 0:
+        raise ValueError("Pinjaman sintetis butuh minimal satu peminjam")
+    if jumlah_pinjaman <= 0 and jumlah_cicilan > 0:
+        raise ValueError("Cicilan sintetis butuh minimal satu pinjaman")
+
+    with conn:
+        # BEGIN eksplisit: DROP/CREATE TRIGGER ikut di-rollback bila insert gagal di tengah jalan
+        conn.execute("BEGIN")
+        triggers = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name IN ('peminjam', 'pinjaman', 'cicilan')").fetchall()
+        for name, _sql in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+
+        first_peminjam = conn.execute("SELECT COALESCE(MAX(id_peminjam), 0) + 1 FROM peminjam").fetchone()[0]
+        first_pinjaman = conn.execute("SELECT COALESCE(MAX(id_pinjaman), 0) + 1 FROM pinjaman").fetchone()[0]
+
+        def peminjam_rows():
+            for i in range(jumlah_peminjam):
+                depan, belakang = rng.choice(NAMA_DEPAN), rng.choice(NAMA_BELAKANG)
+                yield (first_peminjam + i, f"{depan} {belakang}",
+                       f"Jl. {rng.choice(NAMA_JALAN)} No. {rng.randint(1, 200)}, {rng.choice(NAMA_KOTA)}",
+                       f"08{rng.randrange(10 ** 9, 10 ** 10)}",
+                       f"{depan.lower()}.{belakang.lower()}{first_peminjam + i}@email.com")
+
+        for batch in _batched(peminjam_rows(), batch_size):
+            conn.executemany(
+                "INSERT INTO peminjam (id_peminjam, nama, alamat, no_telp, email) VALUES (?, ?, ?, ?, ?)", batch)
+
+        # Cicilan dibagi rata ke semua pinjaman; sisa pembagian masuk ke pinjaman pertama
+        per_pinjaman, lebih = divmod(jumlah_cicilan, jumlah_pinjaman) if jumlah_pinjaman else (0, 0)
+        start = datetime.date(2022, 1, 1)
+        pinjaman_batch, cicilan_batch = [], []
+        for i in range(jumlah_pinjaman):
+            id_pinjaman = first_pinjaman + i
+            tenor = per_pinjaman + (1 if i < lebih else 0)
+            jumlah = rng.randint(2, 100) * 500000
+            tanggal_pinjam = start + datetime.timedelta(days=rng.randrange(365 * 3))
+            terbayar = rng.randint(0, tenor)
+            tanggal_selesai = installment_schedule.add_months(tanggal_pinjam, tenor or rng.choice(TENOR_BULAN))
+            pinjaman_batch.append((
+                id_pinjaman, rng.randrange(jumlah_peminjam) + first_peminjam, jumlah,
+                tanggal_pinjam.isoformat(), tanggal_selesai.isoformat(),
+                "Lunas" if tenor and terbayar == tenor else "Aktif"))
+            if tenor:
+                for _id, ke, nominal, jatuh_tempo, _status in installment_schedule.build_schedule(
+                        id_pinjaman, jumlah, tanggal_pinjam, tanggal_selesai):
+                    if ke <= terbayar:
+                        cicilan_batch.append((id_pinjaman, ke, nominal, jatuh_tempo, jatuh_tempo, "Lunas"))
+                    else:
+                        cicilan_batch.append((id_pinjaman, ke, nominal, None, jatuh_tempo, "Belum Bayar"))
+
+            if len(cicilan_batch) >= batch_size or len(pinjaman_batch) >= batch_size or i == jumlah_pinjaman - 1:
+                conn.executemany(
+                    "INSERT INTO pinjaman (id_pinjaman, id_peminjam, jumlah_pinjaman, tanggal_pinjam, "
+                    "tanggal_selesai, status) VALUES (?, ?, ?, ?, ?, ?)", pinjaman_batch)
+                conn.executemany(
+                    "INSERT INTO cicilan (id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_bayar, "
+                    "tanggal_jatuh_tempo, status_bayar) VALUES (?, ?, ?, ?, ?, ?)", cicilan_batch)
+                pinjaman_batch, cicilan_batch = [], []
+
+        conn.execute("INSERT INTO peminjam_fts (peminjam_fts) VALUES ('rebuild')")
+        conn.execute(RINGKASAN_REBUILD_DELETE)
+        conn.execute(RINGKASAN_REBUILD_INSERT)
+        for _name, sql in triggers:
+            conn.execute(sql)
+
+
+def generate_database(db_name, jumlah_peminjam, jumlah_pinjaman, jumlah_cicilan, seed=0):
+    """Buat (atau tambah ke) file database berisi data sintetis"""
+    conn = connection_profile.connect(db_name)
+    try:
+        migrate(conn)
+        generate_data(conn, jumlah_peminjam, jumlah_pinjaman, jumlah_cicilan, seed)
+    finally:
+        conn.close()
+
+
+def check_query_plans(conn):
+    """Pastikan EXPLAIN QUERY PLAN setiap query aplikasi memakai index yang diharapkan.
+
+    Mengembalikan daftar pesan kegagalan; list kosong berarti semua query lolos.
+    """
+    failures = []
+    for name, query_str, expected_indexes in queries.all_app_queries():
+        params = (None,) * query_str.count("?")
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query_str, params)]
+        for index_name in expected_indexes:
+            # Tuple = salah satu boleh dipakai (pilihan planner bisa bergantung pada statistik ANALYZE)
+            alternatives = index_name if isinstance(index_name, tuple) else (index_name,)
+            if not any(alternative in detail for alternative in alternatives for detail in plan):
+                failures.append(f"{name}: index {' / '.join(alternatives)} tidak dipakai -> {plan}")
+        # Urutan Table View harus dipenuhi index, bukan diurutkan ulang per halaman. Bagian kanan
+        # UNION ALL (pinjaman tanpa cicilan, lihat queries.table_view_page) cukup kecil untuk diurutkan
+        ordered = plan[:plan.index("RIGHT")] if "RIGHT" in plan else plan
+        if name.startswith("table_view_sort[") and any("TEMP B-TREE" in detail for detail in ordered):
+            failures.append(f"{name}: urutan memakai temp B-tree -> {plan}")
+        # Hanya loop terluar yang boleh full scan; setiap join harus lewat index
+        for detail in plan[1:]:
+            if detail.startswith("SCAN") and "INDEX" not in detail:
+                failures.append(f"{name}: join tanpa index ({detail})")
+    return failures
+
+
+def create_database(db_name=DB_NAME):
+    conn = connection_profile.connect(db_name)
+    migrate(conn)
+    cursor = conn.cursor()
     
     peminjam_data = [
         ('Budi Santoso', 'Jl. Merdeka No. 10, Surabaya', '081234567890', 'budi@email.com'),
@@ -99,8 +510,49 @@ def create_database():
 
     conn.commit()
     conn.close()
-    print("Database berhasil dibuat: database.db")
+    print(f"Database berhasil dibuat: {db_name}")
 
 
 if __name__ == "__main__":
-    create_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Buat, upgrade atau periksa database simpan pinjam")
+    parser.add_argument("--check-plans", nargs="?", const=":memory:", metavar="DB",
+                        help="pastikan setiap query aplikasi memakai index")
+    parser.add_argument("--rebuild-ringkasan", nargs="?", const=DB_NAME, metavar="DB",
+                        help="hitung ulang tabel pinjaman_ringkasan")
+    parser.add_argument("--backfill-jadwal", nargs="?", const=DB_NAME, metavar="DB",
+                        help="buat jadwal cicilan untuk pinjaman yang belum punya cicilan")
+    parser.add_argument("--generate", metavar="DB",
+                        help="isi DB dengan data sintetis (lihat --peminjam/--pinjaman/--cicilan/--seed)")
+    parser.add_argument("--peminjam", type=int, default=1000, help="jumlah peminjam sintetis")
+    parser.add_argument("--pinjaman", type=int, default=2000, help="jumlah pinjaman sintetis")
+    parser.add_argument("--cicilan", type=int, default=12000, help="jumlah cicilan sintetis")
+    parser.add_argument("--seed", type=int, default=0, help="seed generator acak")
+    args = parser.parse_args()
+
+    if args.check_plans:
+        conn = connection_profile.connect(args.check_plans)
+        migrate(conn)
+        failures = check_query_plans(conn)
+        conn.close()
+        for failure in failures:
+            print(failure)
+        if failures:
+            sys.exit(1)
+        print("Semua query memakai index.")
+    elif args.rebuild_ringkasan:
+        conn = connection_profile.connect(args.rebuild_ringkasan)
+        migrate(conn)
+        print(f"Ringkasan dibangun ulang untuk {rebuild_ringkasan(conn)} pinjaman.")
+        conn.close()
+    elif args.backfill_jadwal:
+        conn = connection_profile.connect(args.backfill_jadwal)
+        migrate(conn)
+        loans, cicilan = installment_schedule.backfill_schedules(Repository(conn))
+        conn.close()
+        print(f"Jadwal dibuat untuk {loans} pinjaman ({cicilan} cicilan).")
+    elif args.generate:
+        generate_database(args.generate, args.peminjam, args.pinjaman, args.cicilan, args.seed)
+        print(f"Data sintetis dibuat: {args.generate} ({args.peminjam} peminjam, "
+              f"{args.pinjaman} pinjaman, {args.cicilan} cicilan, seed {args.seed})")
+    else:
+        create_database()
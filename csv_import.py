@@ -0,0 +1,253 @@
+"""Import data peminjam, pinjaman dan cicilan dari file CSV secara streaming.
+
+File dibaca baris per baris dan dimasukkan per batch dalam satu transaksi, sehingga
+pemakaian memori tetap datar berapa pun ukuran file. Baris yang gagal validasi
+ditulis ke laporan error CSV (nomor baris, pesan, isi baris asli).
+
+Kolom yang dikenali (header tidak peka huruf besar/kecil):
+    peminjam: nama, alamat, no_telp, email
+    pinjaman: id_peminjam | no_telp | nama, jumlah_pinjaman, tanggal_pinjam,
+              tanggal_selesai, status (default Aktif)
+    cicilan:  id_pinjaman | (id_peminjam | no_telp | nama) + tanggal_pinjam,
+              cicilan_ke, jumlah_cicilan, tanggal_bayar (boleh kosong),
+              status_bayar (default Belum Bayar)
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+from collections import namedtuple
+
+import connection_profile
+import create_database
+from repository import Repository
+import validators
+
+ImportResult = namedtuple("ImportResult", ["imported", "failed", "error_report"])
+
+TABLES = ["peminjam", "pinjaman", "cicilan"]
+BATCH_SIZE = 5000
+DELIMITERS = [",", ";", "\t"]
+
+
+class _LineStream:
+    """Iterator baris teks dari file biner yang mencatat jumlah byte terbaca"""
+
+    def __init__(self, binary_file, encoding):
+        self._file = binary_file
+        self._encoding = encoding
+        self.bytes_read = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self._file)
+        self.bytes_read += len(line)
+        return line.decode(self._encoding)
+
+
+class _Resolver:
+    """Cari id peminjam / pinjaman yang dirujuk baris CSV"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def _single(self, sql, params, label):
+        rows = self.conn.execute(sql + " LIMIT 2", params).fetchall()
+        if not rows:
+            return None, f"{label} tidak ditemukan."
+        if len(rows) > 1:
+            return None, f"{label} tidak unik; gunakan kolom id."
+        return rows[0][0], None
+
+    def peminjam(self, row):
+        if row.get("id_peminjam"):
+            return self._single("SELECT id_peminjam FROM peminjam WHERE id_peminjam = ?",
+                                [row["id_peminjam"]], f"Peminjam id {row['id_peminjam']}")
+        if row.get("no_telp"):
+            return self._single("SELECT id_peminjam FROM peminjam WHERE no_telp = ?",
+                                [row["no_telp"]], f"Peminjam dengan no. telp {row['no_telp']}")
+        if row.get("nama"):
+            return self._single("SELECT id_peminjam FROM peminjam WHERE nama = ?",
+                                [row["nama"]], f"Peminjam bernama {row['nama']}")
+        return None, "Peminjam harus diisi (id_peminjam, no_telp atau nama)."
+
+    def pinjaman(self, row):
+        if row.get("id_pinjaman"):
+            return self._single("SELECT id_pinjaman FROM pinjaman WHERE id_pinjaman = ?",
+                                [row["id_pinjaman"]], f"Pinjaman id {row['id_pinjaman']}")
+        tanggal_pinjam = validators.parse_date(row.get("tanggal_pinjam", ""))
+        if tanggal_pinjam is None:
+            return None, "Pinjaman harus diisi (id_pinjaman, atau peminjam + tanggal_pinjam)."
+        id_peminjam, error = self.peminjam(row)
+        if error:
+            return None, error
+        return self._single("SELECT id_pinjaman FROM pinjaman WHERE id_peminjam = ? AND tanggal_pinjam = ?",
+                            [id_peminjam, tanggal_pinjam], f"Pinjaman tanggal {tanggal_pinjam}")
+
+
+def _peminjam_params(row, resolver):
+    values = [row.get(column, "") for column in ("nama", "alamat", "no_telp", "email")]
+    return values, validators.validate_peminjam(*values)
+
+
+def _pinjaman_params(row, resolver):
+    id_peminjam, error = resolver.peminjam(row)
+    if error:
+        return None, error
+    jumlah_pinjaman = validators.parse_amount(row.get("jumlah_pinjaman", ""))
+    status = row.get("status") or "Aktif"
+    error = validators.validate_pinjaman(id_peminjam, jumlah_pinjaman, status)
+    if error:
+        return None, error
+    tanggal_pinjam = validators.parse_date(row.get("tanggal_pinjam", ""))
+    tanggal_selesai = validators.parse_date(row.get("tanggal_selesai", ""))
+    if tanggal_pinjam is None or tanggal_selesai is None:
+        return None, "Tanggal Pinjam dan Tanggal Selesai harus berupa tanggal yang valid."
+    return [id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status], None
+
+
+def _cicilan_params(row, resolver):
+    id_pinjaman, error = resolver.pinjaman(row)
+    if error:
+        return None, error
+    cicilan_ke = row.get("cicilan_ke", "")
+    jumlah_cicilan = validators.parse_amount(row.get("jumlah_cicilan", ""))
+    status_bayar = row.get("status_bayar") or "Belum Bayar"
+    error = validators.validate_cicilan(id_pinjaman, cicilan_ke, jumlah_cicilan, status_bayar)
+    if error:
+        return None, error
+    tanggal_bayar = None
+    if row.get("tanggal_bayar"):
+        tanggal_bayar = validators.parse_date(row["tanggal_bayar"])
+        if tanggal_bayar is None:
+            return None, "Tanggal Bayar harus berupa tanggal yang valid."
+    return [id_pinjaman, int(cicilan_ke), jumlah_cicilan, tanggal_bayar, status_bayar], None
+
+
+ROW_PARAMS = {
+    "peminjam": _peminjam_params,
+    "pinjaman": _pinjaman_params,
+    "cicilan": _cicilan_params,
+}
+
+
+class _ErrorReport:
+    """Laporan error CSV yang baru dibuat saat error pertama muncul"""
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, line_number, message, values):
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["baris", "error"] + self.header)
+        self._writer.writerow([line_number, message] + list(values))
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _insert_batch(table_repository, batch, report):
+    """Insert satu batch; jika gagal, ulangi per baris agar baris yang salah bisa dilaporkan"""
+    def failed(position, error):
+        line_number, values, _params = batch[position]
+        report.add(line_number, f"Gagal menyimpan: {error}", values)
+
+    return table_repository.add_many([params for _line, _values, params in batch], on_error=failed)
+
+
+def import_csv(conn, table, path, batch_size=BATCH_SIZE, progress=None, error_report=None,
+               delimiter=None, encoding="utf-8-sig"):
+    """Import satu file CSV ke tabel `table` (peminjam, pinjaman atau cicilan).
+
+    `progress(baris, byte_terbaca, total_byte)` dipanggil setiap selesai satu batch.
+    Mengembalikan ImportResult; `error_report` None jika semua baris berhasil.
+    """
+    if table not in TABLES:
+        raise ValueError(f"Tabel tidak dikenal: {table}")
+    row_params = ROW_PARAMS[table]
+    table_repository = Repository(conn).table(table)
+    resolver = _Resolver(conn)
+    total_bytes = os.path.getsize(path)
+    if error_report is None:
+        error_report = os.path.splitext(path)[0] + ".errors.csv"
+    if os.path.exists(error_report):
+        os.remove(error_report)
+
+    imported = rows_read = 0
+    with open(path, "rb") as binary_file:
+        stream = _LineStream(binary_file, encoding)
+        first_line = next(stream, "")
+        if delimiter is None:
+            delimiter = max(DELIMITERS, key=first_line.count)
+        reader = csv.reader(itertools.chain([first_line], stream), delimiter=delimiter)
+        header = next(reader, [])
+        columns = [column.strip().lower().replace(" ", "_") for column in header]
+        report = _ErrorReport(error_report, header)
+
+        batch = []
+        try:
+            for values in reader:
+                if not any(value.strip() for value in values):
+                    continue
+                rows_read += 1
+                row = {column: value.strip() for column, value in zip(columns, values)}
+                params, error = row_params(row, resolver)
+                if error:
+                    report.add(reader.line_num, error, values)
+                    continue
+                batch.append((reader.line_num, values, params))
+                if len(batch) >= batch_size:
+                    imported += _insert_batch(table_repository, batch, report)
+                    batch = []
+                    if progress:
+                        progress(rows_read, stream.bytes_read, total_bytes)
+            if batch:
+                imported += _insert_batch(table_repository, batch, report)
+            if progress:
+                progress(rows_read, stream.bytes_read, total_bytes)
+        finally:
+            report.close()
+
+    return ImportResult(imported, report.count, error_report if report.count else None)
+
+
+def _print_progress(rows, bytes_read, total_bytes):
+    percent = 100 * bytes_read // total_bytes if total_bytes else 100
+    print(f"\r{rows} baris dibaca ({percent}%)", end="", file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import data simpan pinjam dari file CSV")
+    parser.add_argument("table", choices=TABLES)
+    parser.add_argument("files", nargs="+", metavar="CSV")
+    parser.add_argument("--db", default=create_database.DB_NAME)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--delimiter", help="default: dideteksi dari header (, ; atau tab)")
+    args = parser.parse_args()
+
+    conn = connection_profile.connect(args.db)
+    create_database.migrate(conn)
+    failed = 0
+    for path in args.files:
+        result = import_csv(conn, args.table, path, args.batch_size, _print_progress,
+                            delimiter=args.delimiter)
+        print(file=sys.stderr)
+        print(f"{path}: {result.imported} baris diimport, {result.failed} gagal")
+        if result.error_report:
+            print(f"  Laporan error: {result.error_report}")
+        failed += result.failed
+    conn.close()
+    if failed:
+        sys.exit(1)
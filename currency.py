@@ -0,0 +1,43 @@
+"""Format dan baca nilai rupiah yang dipakai tampilan tabel, form dan export.
+
+QLocale Indonesia dibuat sekali untuk seluruh aplikasi, dan teks hasil format
+disimpan di cache LRU berdasarkan nilai rupiah bulat. Delegate tabel memanggil
+format_rupiah di setiap paint, sehingga nilai yang sama tidak diformat ulang.
+"""
+
+import functools
+import math
+
+from PyQt6.QtCore import QLocale
+
+CACHE_SIZE = 4096
+
+INDONESIAN_LOCALE = QLocale(QLocale.Language.Indonesian, QLocale.Country.Indonesia)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _format_integer(rupiah):
+    return f"Rp {INDONESIAN_LOCALE.toString(rupiah)}"
+
+
+def format_rupiah(value):
+    """Format angka sebagai "Rp 1.500.000" (locale Indonesia, tanpa desimal).
+
+    Pecahan dibulatkan ke rupiah terdekat (0,5 menjauhi nol, sama seperti QLocale).
+    ValueError/TypeError diteruskan jika `value` bukan angka.
+    """
+    num = float(value)
+    if not math.isfinite(num):
+        return f"Rp {INDONESIAN_LOCALE.toString(num, 'f', 0)}"
+    return _format_integer(int(math.copysign(math.floor(abs(num) + 0.5), num)))
+
+
+def parse_rupiah(text):
+    """Baca teks "Rp 1.500.000" / "1500000" dengan locale Indonesia; 0.0 jika tidak valid"""
+    num, ok = INDONESIAN_LOCALE.toDouble(text.replace("Rp ", "").strip())
+    return num if ok else 0.0
+
+
+def cache_info():
+    """Statistik cache format (hits, misses, maxsize, currsize)"""
+    return _format_integer.cache_info()
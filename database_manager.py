@@ -1,29 +1,251 @@
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, Qt, pyqtSignal
 from PyQt6.QtSql import QSqlDatabase, QSqlQuery
-from PyQt6.QtWidgets import QMessageBox
+import connection_profile
+from query_stats import QueryStats
+from repository import Repository
+
+SLOW_QUERY_LOG = "slow_queries.log"
+
+
+class DatabaseJobSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class DatabaseJob(QRunnable):
+    """Menjalankan `function(repository)` di thread pool dengan koneksi milik thread tersebut"""
+
+    def __init__(self, pool, function, write=False):
+        super().__init__()
+        self._pool = pool
+        self._function = function
+        self._write = write
+        self.signals = DatabaseJobSignals()
+
+    def run(self):
+        try:
+            repository = self._pool._writer() if self._write else self._pool.reader()
+            result = self._function(repository)
+        except Exception as e:
+            print(f"Error di job database: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class ConnectionPool:
+    """Koneksi sqlite3 per thread (lihat repository.py) untuk thread GUI dan worker.
+
+    Koneksi sqlite3 hanya boleh dipakai di thread yang membukanya, jadi setiap
+    thread, termasuk thread GUI, mendapat koneksi baca read-only sendiri. Semua job
+    tulis dijalankan berurutan di satu thread penulis dengan satu koneksi tulis.
+    Koneksi thread worker ditutup saat thread itu selesai (thread pool yang idle,
+    atau pool yang dihapus); koneksi thread GUI ditutup lewat close().
+    """
+
+    def __init__(self, db_name, profile=None):
+        self.db_name = db_name
+        self.profile = profile
+        self.readers = QThreadPool()
+        self._writer_pool = QThreadPool()
+        self._writer_pool.setMaxThreadCount(1)
+        self._writer_pool.setExpiryTimeout(-1)
+        self._repositories = {}
+        self._labels = {}
+        self._workers_opened = 0
+        # Hitungan cache statement koneksi yang sudah ditutup
+        self._closed_stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def reader(self):
+        """Repository baca (koneksi read-only) untuk thread pemanggil"""
+        return self._thread_repository(True)
+
+    def _writer(self):
+        # Hanya dipanggil DatabaseJob di thread penulis (satu thread, tidak pernah expired)
+        return self._thread_repository(False)
+
+    def _thread_repository(self, read_only):
+        key = (threading.get_ident(), read_only)
+        repository = self._repositories.get(key)
+        if repository is not None:
+            return repository
+        repository = Repository.open(self.db_name, self.profile, read_only)
+        is_main = threading.current_thread() is threading.main_thread()
+        with self._lock:
+            self._repositories[key] = repository
+            if not read_only:
+                self._labels[key] = "penulis"
+            elif is_main:
+                self._labels[key] = "thread GUI"
+            else:
+                self._workers_opened += 1
+                self._labels[key] = f"worker {self._workers_opened}"
+        if not is_main:
+            # finished dipancarkan di thread itu sendiri, jadi koneksi ditutup di thread pemiliknya
+            QThread.currentThread().finished.connect(lambda: self._close(key), Qt.ConnectionType.DirectConnection)
+        return repository
+
+    def _close(self, key):
+        with self._lock:
+            repository = self._repositories.pop(key, None)
+            self._labels.pop(key, None)
+            if repository is not None:
+                for counter in self._closed_stats:
+                    self._closed_stats[counter] += getattr(repository.statements, counter)
+        if repository is not None:
+            repository.close()
+
+    def close(self):
+        """Tutup koneksi milik thread GUI (panggil setelah wait())"""
+        self._close((threading.get_ident(), True))
+
+    def statement_stats(self):
+        """Hit/miss cache statement per koneksi yang terbuka, plus total koneksi yang sudah ditutup"""
+        stats = {}
+        with self._lock:
+            for key, repository in self._repositories.items():
+                stats[self._labels[key]] = repository.statements.stats()
+            if any(self._closed_stats.values()):
+                stats["ditutup"] = dict(self._closed_stats)
+        return stats
+
+    def reset_statement_stats(self):
+        with self._lock:
+            for repository in self._repositories.values():
+                repository.statements.reset()
+            self._closed_stats = dict.fromkeys(self._closed_stats, 0)
+
+    def run(self, function, finished=None, failed=None, write=False):
+        """Jalankan `function(repository)` di thread pool; hasil/error dikirim ke `finished`/`failed`
+        di thread GUI.
+
+        Dengan `write=True` job masuk antrean thread penulis dan dijalankan satu per satu.
+        """
+        job = DatabaseJob(self, function, write)
+        if finished is not None:
+            job.signals.finished.connect(finished)
+        if failed is not None:
+            job.signals.failed.connect(failed)
+        (self._writer_pool if write else self.readers).start(job)
+        return job
+
+    def wait(self, msecs=-1):
+        """Tunggu semua job yang sedang berjalan atau mengantre selesai"""
+        return self.readers.waitForDone(msecs) and self._writer_pool.waitForDone(msecs)
 
 
 class DatabaseManager:
+    """Koneksi QSQLITE utama (QSqlTableModel Record View, maintenance) dan pool koneksi sqlite3.
+
+    Query aplikasi lainnya berjalan lewat repository.py: repository() di thread GUI,
+    pool().run() untuk worker dan penulisan.
+    """
+
+    _pool = None
 
     def __init__(self, db_name="database.db"):
         self.db_name = db_name
         self.db = None
+        self.profile = None
 
     def connect(self):
-        """Membuat koneksi ke database SQLite"""
-        self.db = QSqlDatabase.addDatabase("QSQLITE")
-        self.db.setDatabaseName(self.db_name)
-
-        if not self.db.open():
-            QMessageBox.critical(None, "Database Error",
-                                 f"Tidak dapat membuka database: {self.db_name}")
+        """Membuat koneksi ke database SQLite; False jika gagal (pesan untuk user ditampilkan pemanggil)"""
+        self.profile = connection_profile.load_profile(self.db_name)
+        self.db = self.open_connection(self.db_name, profile=self.profile)
+        if not self.db.isOpen():
+            print(f"Tidak dapat membuka database {self.db_name}: {self.db.lastError().text()}")
             return False
 
+        DatabaseManager._pool = ConnectionPool(self.db_name, self.profile)
+        QueryStats.instance().configure(
+            self.profile.slow_query_ms,
+            os.path.join(os.path.dirname(os.path.abspath(self.db_name)), SLOW_QUERY_LOG))
         return True
 
+    @staticmethod
+    def open_connection(db_name, connection_name=None, profile=None):
+        """Buka koneksi QSQLITE dan pasang profil PRAGMA (lihat connection_profile.py)"""
+        if connection_name is None:
+            db = QSqlDatabase.addDatabase("QSQLITE")
+        else:
+            db = QSqlDatabase.addDatabase("QSQLITE", connection_name)
+        db.setDatabaseName(db_name)
+        if not db.open():
+            return db
+
+        for statement in connection_profile.pragma_statements(profile or connection_profile.load_profile(db_name)):
+            DatabaseManager.exec_sql(db, statement)
+        return db
+
+    def maintenance(self, checkpoint="PASSIVE"):
+        """PRAGMA optimize dan checkpoint WAL di koneksi utama (dipanggil berkala dari MainWindow)"""
+        for statement in connection_profile.maintenance_statements(checkpoint):
+            DatabaseManager.exec_sql(self.db, statement)
+
     def execute_query(self, query_string):
         """Eksekusi query SQL"""
-        query = QSqlQuery()
-        if not query.exec(query_string):
-            print(f"Error executing query: {query.lastError().text()}")
-            return False
-        return True
\ No newline at end of file
+        return DatabaseManager.exec_sql(self.db or QSqlDatabase.database(), query_string)
+
+    @staticmethod
+    def exec_sql(db, sql, name=None):
+        """Eksekusi satu statement tanpa parameter (tercatat di QueryStats); False jika gagal"""
+        query = QSqlQuery(db)
+        start = time.perf_counter()
+        ok = query.exec(sql)
+        if not ok:
+            print(f"Error executing '{sql}': {query.lastError().text()}")
+        DatabaseManager.record_query(db, name or sql, query, start)
+        query.finish()
+        return ok
+
+    @staticmethod
+    def record_query(db, name, query, start, rows=None):
+        """Catat eksekusi `query` yang dimulai pada time.perf_counter() `start` ke QueryStats.
+
+        `rows` default: jumlah baris terpengaruh untuk statement selain SELECT.
+        """
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if rows is None and not query.isSelect():
+            rows = query.numRowsAffected()
+        sql = query.lastQuery()
+        QueryStats.instance().record(name, sql, elapsed_ms, rows, query.lastError().isValid(),
+                                     lambda: DatabaseManager.explain(db, sql))
+
+    @staticmethod
+    def explain(db, sql):
+        """Baris detail EXPLAIN QUERY PLAN untuk `sql` (parameter diisi NULL)"""
+        query = QSqlQuery(db)
+        query.setForwardOnly(True)
+        if not query.prepare("EXPLAIN QUERY PLAN " + sql):
+            return [f"(EXPLAIN gagal: {query.lastError().text()})"]
+        for position in range(sql.count("?")):
+            query.bindValue(position, None)
+        if not query.exec():
+            return [f"(EXPLAIN gagal: {query.lastError().text()})"]
+        plan = []
+        while query.next():
+            plan.append(query.value(3))
+        query.finish()
+        return plan
+
+    @classmethod
+    def pool(cls):
+        """Pool koneksi sqlite3 per thread (dibuat saat connect, atau dari koneksi utama)"""
+        if cls._pool is None:
+            cls._pool = ConnectionPool(QSqlDatabase.database().databaseName())
+        return cls._pool
+
+    @classmethod
+    def statement_stats(cls):
+        """Hit/miss cache statement per koneksi sqlite3 (lihat repository.StatementRegistry)"""
+        return cls._pool.statement_stats() if cls._pool is not None else {}
+
+    @classmethod
+    def repository(cls):
+        """Repository baca milik thread pemanggil (lihat repository.py)"""
+        return cls.pool().reader()
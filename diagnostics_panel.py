@@ -0,0 +1,129 @@
+"""Panel diagnostik tersembunyi (Ctrl+Shift+D di jendela utama): statement paling mahal.
+
+Isi QueryStats dimuat ulang setiap detik selama panel terlihat. Baris terpilih
+menampilkan SQL dan histogram waktu eksekusi terakhirnya. Di atas tabel ditampilkan
+hit/miss cache statement sqlite3 per koneksi (DatabaseManager.statement_stats).
+"""
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+                             QTableWidget, QTableWidgetItem, QPlainTextEdit, QAbstractItemView)
+
+from database_manager import DatabaseManager
+from query_stats import BUCKETS_MS, QueryStats
+
+COLUMNS = ["Statement", "Jumlah", "Total ms", "Rata-rata ms", "p50 ms", "p95 ms", "Maks ms",
+           "Baris", "Lambat", "Error", "Lokasi terakhir"]
+SORT_KEYS = {"Total waktu": "total_ms", "p95": "p95_ms", "Maks": "max_ms", "Jumlah": "count"}
+
+
+class DiagnosticsPanel(QWidget):
+
+    REFRESH_MS = 1000
+    LIMIT = 30
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle("Diagnostik Query")
+        self.resize(1100, 600)
+        self._snapshots = []
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Urutkan:"))
+        self.sort_key = QComboBox()
+        self.sort_key.addItems(SORT_KEYS)
+        self.sort_key.currentTextChanged.connect(self.refresh)
+        top_layout.addWidget(self.sort_key)
+        self.lbl_log = QLabel()
+        top_layout.addWidget(self.lbl_log, 1)
+        self.btn_reset = QPushButton("Reset")
+        self.btn_reset.clicked.connect(self.reset)
+        top_layout.addWidget(self.btn_reset)
+        layout.addLayout(top_layout)
+
+        self.lbl_statements = QLabel()
+        self.lbl_statements.setWordWrap(True)
+        layout.addWidget(self.lbl_statements)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.currentCellChanged.connect(lambda *_args: self._show_detail())
+        layout.addWidget(self.table, 3)
+
+        self.detail = QPlainTextEdit()
+        self.detail.setReadOnly(True)
+        layout.addWidget(self.detail, 2)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        QueryStats.instance().reset()
+        DatabaseManager.pool().reset_statement_stats()
+        self.refresh()
+
+    def refresh(self):
+        stats = QueryStats.instance()
+        self.lbl_log.setText(f"Slow query >= {stats.slow_ms} ms -> {stats.log_path or '(tidak ditulis)'}")
+        self._show_statement_cache()
+        row = self.table.currentRow()
+        selected = self._snapshots[row].name if 0 <= row < len(self._snapshots) else None
+        self._snapshots = stats.top(self.LIMIT, SORT_KEYS[self.sort_key.currentText()])
+
+        self.table.blockSignals(True)
+        self.table.setRowCount(len(self._snapshots))
+        for row, snapshot in enumerate(self._snapshots):
+            values = [snapshot.name, snapshot.count, f"{snapshot.total_ms:.1f}", f"{snapshot.mean_ms:.2f}",
+                      f"{snapshot.p50_ms:.2f}", f"{snapshot.p95_ms:.2f}", f"{snapshot.max_ms:.2f}",
+                      "-" if snapshot.mean_rows is None else f"{snapshot.mean_rows:.0f}",
+                      snapshot.slow, snapshot.errors, snapshot.site]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if isinstance(value, int) or column in range(2, 8):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+            if snapshot.name == selected:
+                self.table.setCurrentCell(row, 0)
+        self.table.blockSignals(False)
+        self._show_detail()
+
+    def _show_statement_cache(self):
+        connections = DatabaseManager.statement_stats()
+        parts = []
+        for label, counts in connections.items():
+            text = f"{label}: {counts['hits']:,} hit / {counts['misses']:,} miss / {counts['evictions']:,} terbuang"
+            if "prepared" in counts:
+                text += f" ({counts['prepared']}/{counts['capacity']} ter-prepare)"
+            parts.append(text)
+        text = "Cache statement — " + ("; ".join(parts) if parts else "belum ada koneksi")
+        if any(counts["evictions"] for counts in connections.values()):
+            text += ". Cache penuh: naikkan cached_statements di database_profile.json."
+        self.lbl_statements.setText(text)
+
+    def _show_detail(self):
+        row = self.table.currentRow()
+        if not 0 <= row < len(self._snapshots):
+            self.detail.clear()
+            return
+        snapshot = self._snapshots[row]
+        histogram = snapshot.histogram
+        labels = [f"<= {bound:g} ms" for bound in BUCKETS_MS] + [f"> {BUCKETS_MS[-1]:g} ms"]
+        peak = max(histogram) or 1
+        lines = [" ".join(snapshot.sql.split()), "",
+                 f"Histogram {sum(histogram)} eksekusi terakhir ({snapshot.site}):"]
+        lines += [f"{label:>12} {count:6d} {'#' * round(40 * count / peak)}"
+                  for label, count in zip(labels, histogram) if count]
+        self.detail.setPlainText("\n".join(lines))
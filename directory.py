@@ -0,0 +1,53 @@
+"""Direktori pinjaman per peminjam dan sinyal perubahan data bersama.
+
+Pinjaman milik satu peminjam dimuat sekali lalu disimpan; penulisan lewat
+aplikasi menambal daftar itu (pinjaman baru) atau membuangnya agar dimuat ulang
+saat dibaca berikutnya. Sinyal `changed` (nama tabel) memberi tahu picker dan
+form yang menampilkan data tabel itu (lihat lookup.py dan record_view.py).
+"""
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from database_manager import DatabaseManager
+
+
+class Directory(QObject):
+
+    changed = pyqtSignal(str)
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pinjaman_milik = {}
+
+    @classmethod
+    def instance(cls):
+        """Direktori milik proses ini (dibuat saat pertama dipakai)"""
+        if cls._instance is None:
+            cls._instance = Directory()
+        return cls._instance
+
+    def pinjaman_milik(self, id_peminjam):
+        """List (id_pinjaman, jumlah_pinjaman, tanggal_pinjam) milik satu peminjam"""
+        rows = self._pinjaman_milik.get(id_peminjam)
+        if rows is None:
+            rows = DatabaseManager.repository().pinjaman.by_peminjam(id_peminjam)
+            self._pinjaman_milik[id_peminjam] = rows
+        return rows
+
+    def peminjam_added(self, id_peminjam, nama):
+        """Beri tahu picker bahwa ada peminjam baru"""
+        self.changed.emit("peminjam")
+
+    def pinjaman_added(self, id_pinjaman, id_peminjam, jumlah_pinjaman, tanggal_pinjam):
+        """Tambahkan pinjaman baru ke daftar yang sudah dimuat tanpa query ulang"""
+        if id_peminjam in self._pinjaman_milik:
+            self._pinjaman_milik[id_peminjam].append((id_pinjaman, jumlah_pinjaman, tanggal_pinjam))
+        self.changed.emit("pinjaman")
+
+    def invalidate(self, table):
+        """Beri tahu bahwa `table` berubah; daftar yang terpengaruh dimuat ulang saat dibaca lagi"""
+        if table in ("peminjam", "pinjaman"):
+            self._pinjaman_milik = {}
+        self.changed.emit(table)
@@ -0,0 +1,82 @@
+"""Pembuatan jadwal cicilan dari data pinjaman (tenor, nominal, tanggal jatuh tempo)"""
+
+import datetime
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def add_months(date, months):
+    """Tambah sejumlah bulan ke tanggal, hari dipotong ke akhir bulan bila perlu"""
+    month = date.month - 1 + months
+    year = date.year + month // 12
+    month = month % 12 + 1
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return datetime.date(year, month, min(date.day, (next_month - datetime.timedelta(days=1)).day))
+
+
+def _as_date(value):
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def tenor_bulan(tanggal_pinjam, tanggal_selesai):
+    """Jumlah bulan penuh antara tanggal pinjam dan tanggal selesai (0 jika tidak valid)"""
+    start, end = _as_date(tanggal_pinjam), _as_date(tanggal_selesai)
+    months = (end.year - start.year) * 12 + end.month - start.month
+    if add_months(start, months) > end:
+        months -= 1
+    return max(months, 0)
+
+
+def split_amount(jumlah, tenor):
+    """Nominal per cicilan; sisa pembulatan masuk ke cicilan terakhir seperti data awal"""
+    angsuran = round(jumlah / tenor)
+    return [angsuran] * (tenor - 1) + [jumlah - angsuran * (tenor - 1)]
+
+
+def build_schedule(id_pinjaman, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status="Aktif"):
+    """Baris cicilan (id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_jatuh_tempo, status_bayar)
+    untuk satu pinjaman.
+
+    Jadwal pinjaman berstatus Lunas langsung ditandai Lunas (tanggal bayar tidak
+    diketahui), selain itu Belum Bayar.
+    """
+    start = _as_date(tanggal_pinjam)
+    tenor = tenor_bulan(start, tanggal_selesai)
+    if tenor == 0:
+        return []
+    status_bayar = "Lunas" if status == "Lunas" else "Belum Bayar"
+    return [(id_pinjaman, ke, nominal, add_months(start, ke).isoformat(), status_bayar)
+            for ke, nominal in enumerate(split_amount(jumlah_pinjaman, tenor), start=1)]
+
+
+def backfill_schedules(repository, batch_size=BACKFILL_BATCH_SIZE, progress=None):
+    """Buat jadwal untuk setiap pinjaman yang belum punya cicilan sama sekali (lihat repository.py).
+
+    Pinjaman dibaca per batch (keyset id_pinjaman) dan cicilannya ditulis dengan
+    executemany, satu transaksi per batch. `progress(pinjaman, cicilan)` dipanggil
+    setelah setiap batch. Mengembalikan (jumlah pinjaman, jumlah cicilan) yang dibuat.
+    """
+    loans = cicilan = 0
+    after_id = 0
+    while True:
+        batch = repository.rows("pinjaman_tanpa_cicilan", [after_id, batch_size])
+        if not batch:
+            break
+        rows = []
+        for id_pinjaman, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status in batch:
+            try:
+                schedule = build_schedule(id_pinjaman, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status)
+            except (ValueError, TypeError) as e:
+                print(f"Jadwal pinjaman {id_pinjaman} dilewati: {e}")
+                continue
+            if schedule:
+                loans += 1
+                rows.extend(schedule)
+        repository.cicilan.add_schedule(rows)
+        cicilan += len(rows)
+        after_id = batch[-1][0]
+        if progress:
+            progress(loans, cicilan)
+    return loans, cicilan
@@ -0,0 +1,236 @@
+"""Picker peminjam dan pinjaman yang dimuat bertahap dari SQL.
+
+Daftar combo tidak pernah dimuat penuh: LookupModel mengambil satu halaman
+(keyset) setiap kali view butuh baris berikutnya, dan teks yang diketik dicari
+sebagai prefix nama lewat index idx_peminjam_nama_nocase di model terpisah
+milik QCompleter. Id terpilih tersedia sebagai user property sehingga bisa
+dipetakan QDataWidgetMapper seperti combo biasa.
+"""
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, pyqtProperty
+from PyQt6.QtWidgets import QComboBox, QCompleter, QLineEdit
+
+from currency import format_rupiah
+from database_manager import DatabaseManager
+from directory import Directory
+import queries
+
+
+class PeminjamLookup:
+    """Sumber picker peminjam: baris (id_peminjam, nama), urut nama"""
+
+    table = "peminjam"
+    by_id = "peminjam_lookup_id"
+
+    def page(self, text, last_row, limit):
+        after = [last_row[1], last_row[0]] if last_row else ["", 0]
+        return "peminjam_lookup", queries.lookup_prefix_bounds(text) + after + [limit]
+
+    def display(self, row):
+        return row[1]
+
+
+class PinjamanLookup:
+    """Sumber picker pinjaman: baris (id_pinjaman, jumlah, nama, id_peminjam).
+
+    Teks angka melompat ke ID pinjaman tersebut (urut id); teks lain dicari
+    sebagai prefix nama peminjam (urut nama).
+    """
+
+    table = "pinjaman"
+    by_id = "pinjaman_lookup_id"
+
+    def page(self, text, last_row, limit):
+        text = text.strip()
+        if not text or text.isdigit():
+            start = int(text) - 1 if text else 0
+            after = max(start, last_row[0]) if last_row else start
+            return "pinjaman_lookup", [after, limit]
+        after = [last_row[2], last_row[3], last_row[0]] if last_row else ["", 0, 0]
+        return "pinjaman_lookup_nama", queries.lookup_prefix_bounds(text) + after + [limit]
+
+    def display(self, row):
+        id_pinjaman, jumlah, nama, _id_peminjam = row
+        return f"ID: {id_pinjaman} - {nama} ({format_rupiah(jumlah)})"
+
+
+class LookupModel(QAbstractListModel):
+    """Model list (teks, id di UserRole) yang memuat halaman berikutnya lewat fetchMore.
+
+    Baris tetap di atas: `placeholder` (id None) dan baris terpilih yang belum
+    termuat di halaman mana pun (lihat row_for_id). Dengan `lazy=False` view
+    tidak bisa meminta halaman sendiri; pemilik model memanggil fetchMore.
+    """
+
+    PAGE_SIZE = 50
+
+    def __init__(self, source, placeholder=None, parent=None, lazy=True):
+        super().__init__(parent)
+        self._source = source
+        self._lazy = lazy
+        self._fixed = [(None, placeholder)] if placeholder else []
+        self._has_placeholder = bool(placeholder)
+        self._text = ""
+        self._rows = []
+        self._positions = {}
+        self._last_row = None
+        self._has_more = True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._fixed) + len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        id_value, text = self._fixed[row] if row < len(self._fixed) else self._rows[row - len(self._fixed)]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return text
+        if role == Qt.ItemDataRole.UserRole:
+            return id_value
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return self._lazy and not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more:
+            return
+        name, params = self._source.page(self._text, self._last_row, self.PAGE_SIZE)
+        page = DatabaseManager.repository().rows(name, params)
+        self._has_more = len(page) == self.PAGE_SIZE
+        if not page:
+            return
+        self._last_row = page[-1]
+        pinned = {id_value for id_value, _text in self._fixed}
+        entries = [(row[0], self._source.display(row)) for row in page if row[0] not in pinned]
+        if not entries:
+            return
+        first = len(self._fixed) + len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        for entry in entries:
+            self._positions[entry[0]] = len(self._rows)
+            self._rows.append(entry)
+        self.endInsertRows()
+
+    def _clear_pages(self):
+        self._rows = []
+        self._positions = {}
+        self._last_row = None
+        self._has_more = True
+
+    def set_text(self, text):
+        """Ganti teks pencarian; halaman pertama dimuat saat view memintanya (atau langsung jika tidak lazy)"""
+        self.beginResetModel()
+        self._text = text
+        self._clear_pages()
+        self.endResetModel()
+        if not self._lazy:
+            self.fetchMore()
+
+    def reload(self):
+        """Buang semua baris termuat (termasuk baris terpilih) setelah data berubah"""
+        self.beginResetModel()
+        del self._fixed[int(self._has_placeholder):]
+        self._clear_pages()
+        self.endResetModel()
+
+    def row_for_id(self, id_value):
+        """Nomor baris untuk `id_value`; diambil satu baris lewat primary key bila belum termuat"""
+        if id_value is None:
+            return 0 if self._has_placeholder else -1
+        for row, (fixed_id, _text) in enumerate(self._fixed):
+            if fixed_id == id_value:
+                return row
+        if id_value in self._positions:
+            return len(self._fixed) + self._positions[id_value]
+
+        rows = DatabaseManager.repository().rows(self._source.by_id, [id_value])
+        if not rows:
+            return -1
+        entry = (id_value, self._source.display(rows[0]))
+        row = int(self._has_placeholder)
+        if len(self._fixed) > row:
+            # Hanya satu baris terpilih yang disematkan; ganti yang lama
+            self._fixed[row] = entry
+            self.dataChanged.emit(self.index(row), self.index(row))
+        else:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._fixed.append(entry)
+            self.endInsertRows()
+        return row
+
+
+class LookupComboBox(QComboBox):
+    """Combo yang bisa diketik dengan completer prefix; id terpilih di currentData_property"""
+
+    SEARCH_DEBOUNCE_MS = 150
+
+    def __init__(self, source, placeholder=None, parent=None, lazy=True):
+        super().__init__(parent)
+        self._source = source
+        self._lazy = lazy
+        self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        # Lebar tetap: jangan menghitung lebar dari semua item
+        self.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.setMinimumContentsLength(30)
+        self.setModel(LookupModel(source, placeholder, self))
+
+        # QCompleter memfilter ulang setiap ada baris baru dan memanggil fetchMore lagi,
+        # jadi model pencarian tidak lazy: halaman berikutnya dimuat saat popup di-scroll ke bawah
+        self._search_model = LookupModel(source, parent=self, lazy=False)
+        completer = QCompleter(self._search_model, self)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        completer.activated[QModelIndex].connect(self._on_completion_activated)
+        completer.popup().verticalScrollBar().valueChanged.connect(self._on_popup_scrolled)
+        # Line edit dipasang setelah model dengan completer sendiri: completer bawaan
+        # QComboBox memakai model combo dan akan memanggil fetchMore sampai habis
+        line_edit = QLineEdit(self)
+        line_edit.setCompleter(completer)
+        self.setLineEdit(line_edit)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._search)
+        self.lineEdit().textEdited.connect(lambda _text: self._search_timer.start())
+        self.lineEdit().editingFinished.connect(self._restore_text)
+
+        Directory.instance().changed.connect(self._on_directory_changed)
+        # Halaman pertama langsung dimuat agar panah/scroll di combo tertutup bisa memilih
+        self.model().fetchMore()
+        self.setCurrentIndex(0 if placeholder else -1)
+
+    def current_id(self):
+        return self.currentData()
+
+    def set_current_id(self, id_value):
+        self.setCurrentIndex(self.model().row_for_id(id_value))
+
+    currentData_property = pyqtProperty("QVariant", current_id, set_current_id, user=True)
+
+    def _search(self):
+        self._search_model.set_text(self.lineEdit().text())
+        self.completer().complete()
+
+    def _on_popup_scrolled(self, value):
+        if value == self.completer().popup().verticalScrollBar().maximum():
+            self._search_model.fetchMore()
+
+    def _on_completion_activated(self, index):
+        self.set_current_id(index.data(Qt.ItemDataRole.UserRole))
+
+    def _restore_text(self):
+        # Teks ketikan yang tidak dipilih dari daftar dikembalikan ke item terpilih
+        if self.currentIndex() >= 0 and self.lineEdit().text() != self.itemText(self.currentIndex()):
+            self.setEditText(self.itemText(self.currentIndex()))
+
+    def _on_directory_changed(self, table):
+        if table not in ("peminjam", self._source.table):
+            return
+        id_value = self.current_id()
+        self.model().reload()
+        self.model().fetchMore()
+        self._search_model.reload()
+        self.set_current_id(id_value)
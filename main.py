@@ -1,39 +1,119 @@
+import time
+# Titik nol pengukuran startup, sebelum PyQt6 dan modul aplikasi dimuat
+STARTED = time.perf_counter()
+
+import json
 import sys
 import os
-from PyQt6.QtWidgets import QApplication, QMainWindow, QTabWidget
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QTabWidget, QWidget
 from database_manager import DatabaseManager
 from table_view import TableViewWidget
-from record_view import RecordViewWidget
 import create_database
 
+# Tahap startup -> ms sejak main.py mulai dimuat (lihat benchmarks/startup_benchmark.py)
+STARTUP_MS = {}
+
+
+def mark_startup(stage):
+    """Catat waktu pertama kali tahap startup `stage` tercapai"""
+    STARTUP_MS.setdefault(stage, round((time.perf_counter() - STARTED) * 1000, 1))
+
+
+mark_startup("import")
+
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+
+    RECORD_VIEW_TAB = 1
+
+    def __init__(self, report_startup=False):
         super().__init__()
+        self.report_startup = report_startup
 
         
         self.db_manager = DatabaseManager("database.db")
         if not self.db_manager.connect():
+            QMessageBox.critical(None, "Database Error",
+                                 f"Tidak dapat membuka database: {self.db_manager.db_name}")
             sys.exit(1)
 
+        # PRAGMA optimize dan checkpoint WAL berkala (lihat connection_profile.py)
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.setInterval(int(self.db_manager.profile.maintenance_minutes * 60 * 1000))
+        self.maintenance_timer.timeout.connect(self.db_manager.maintenance)
+        if self.db_manager.profile.maintenance_minutes > 0:
+            self.maintenance_timer.start()
+
         self.init_ui()
+        mark_startup("window")
 
     def init_ui(self):
         self.setWindowTitle("Aplikasi Simpan Pinjam Uang - UAS Pemrograman Desktop")
         self.setGeometry(100, 100, 1200, 700)
 
         
-        tabs = QTabWidget()
+        self.tabs = QTabWidget()
 
         
         self.table_view = TableViewWidget()
-        tabs.addTab(self.table_view, "Table View (Filter)")
+        self.table_view.dataLoaded.connect(lambda: self._startup_stage("first_data"))
+        self.tabs.addTab(self.table_view, "Table View (Filter)")
+
+        # Record View (beserta query awalnya) baru dibuat saat tab-nya pertama kali dibuka
+        self.record_view = None
+        self.tabs.addTab(QWidget(), "Record View (CRUD)")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+        self.setCentralWidget(self.tabs)
+
+        # Panel diagnostik query tidak ada di menu; hanya lewat shortcut
+        self.diagnostics_panel = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self).activated.connect(self.show_diagnostics)
+
+    def _on_tab_changed(self, index):
+        if index != self.RECORD_VIEW_TAB or self.record_view is not None:
+            return
+        from record_view import RecordViewWidget
 
-        
         self.record_view = RecordViewWidget()
-        tabs.addTab(self.record_view, "Record View (CRUD)")
+        self.tabs.blockSignals(True)
+        placeholder = self.tabs.widget(index)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, self.record_view, "Record View (CRUD)")
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        self._startup_stage("first_paint")
+
+    def _startup_stage(self, stage):
+        if stage in STARTUP_MS:
+            return
+        mark_startup(stage)
+        if self.report_startup and {"first_paint", "first_data"} <= STARTUP_MS.keys():
+            print(json.dumps(STARTUP_MS), flush=True)
+            QTimer.singleShot(0, self.close)
+
+    def show_diagnostics(self):
+        if self.diagnostics_panel is None:
+            from diagnostics_panel import DiagnosticsPanel
+
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
 
-        self.setCentralWidget(tabs)
+    def closeEvent(self, event):
+        self.maintenance_timer.stop()
+        self.table_view.shutdown()
+        # Tulisan yang masih mengantre di thread penulis diselesaikan sebelum keluar
+        DatabaseManager.pool().wait()
+        DatabaseManager.pool().close()
+        self.db_manager.maintenance("TRUNCATE")
+        super().closeEvent(event)
 
 
 def main():
@@ -41,9 +121,12 @@ def main():
     if not os.path.exists('database.db'):
         print("Database 'database.db' tidak ditemukan. Membuat database baru...")
         create_database.create_database()
+    else:
+        create_database.upgrade_database()
 
     app = QApplication(sys.argv)
-    window = MainWindow()
+    # --startup-time: cetak waktu startup (JSON) setelah data pertama tampil, lalu keluar
+    window = MainWindow(report_startup="--startup-time" in sys.argv)
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,468 @@
+"""Kumpulan query SQL yang dijalankan aplikasi"""
+
+import re
+
+TABLE_VIEW_COLUMNS = '''
+        SELECT pinjaman.id_pinjaman     AS "ID Pinjaman",
+               peminjam.nama            AS "Nama Peminjam",
+               peminjam.no_telp         AS "No. Telp",
+               pinjaman.jumlah_pinjaman AS "Jumlah Pinjaman",
+               pinjaman.tanggal_pinjam  AS "Tanggal Pinjam",
+               pinjaman.tanggal_selesai AS "Tanggal Selesai",
+               pinjaman.status          AS "Status Pinjaman",
+               cicilan.cicilan_ke       AS "Cicilan Ke",
+               cicilan.jumlah_cicilan   AS "Jumlah Cicilan",
+               cicilan.status_bayar     AS "Status Cicilan",
+               peminjam.id_peminjam     AS "ID Peminjam"'''
+
+TABLE_VIEW_FROM = '''
+        FROM pinjaman
+                 JOIN peminjam ON pinjaman.id_peminjam = peminjam.id_peminjam
+                 LEFT JOIN cicilan ON pinjaman.id_pinjaman = cicilan.id_pinjaman
+        WHERE 1 = 1'''
+
+# CROSS JOIN memaksa SQLite menelusuri peminjam lebih dulu (lewat idx_peminjam_nama)
+TABLE_VIEW_FROM_PEMINJAM = '''
+        FROM peminjam
+                 CROSS JOIN pinjaman ON pinjaman.id_peminjam = peminjam.id_peminjam
+                 LEFT JOIN cicilan ON pinjaman.id_pinjaman = cicilan.id_pinjaman
+        WHERE 1 = 1'''
+
+# Urutan kolom cicilan: telusuri cicilan lewat index kolom urutnya. ID Pinjaman diambil dari
+# cicilan agar index yang sama juga memenuhi kunci pemecah seri (tanpa temp B-tree)
+TABLE_VIEW_COLUMNS_CICILAN = TABLE_VIEW_COLUMNS.replace("SELECT pinjaman.id_pinjaman ", "SELECT cicilan.id_pinjaman  ")
+TABLE_VIEW_FROM_CICILAN = '''
+        FROM cicilan
+                 CROSS JOIN pinjaman ON pinjaman.id_pinjaman = cicilan.id_pinjaman
+                 JOIN peminjam ON pinjaman.id_peminjam = peminjam.id_peminjam
+        WHERE 1 = 1'''
+# ... digabung (UNION ALL) dengan pinjaman tanpa cicilan, yang kolom cicilannya NULL
+TABLE_VIEW_FROM_TANPA_CICILAN = TABLE_VIEW_FROM + '''
+          AND pinjaman.id_pinjaman IN (SELECT id_pinjaman FROM pinjaman_ringkasan WHERE total_cicilan = 0)'''
+TABLE_VIEW_CICILAN_SORT_COLUMNS = (7, 8, 9)
+
+TABLE_VIEW_SELECT = TABLE_VIEW_COLUMNS + TABLE_VIEW_FROM
+
+# Kolom hasil yang tidak ditampilkan (hanya dipakai sebagai kunci urutan)
+TABLE_VIEW_HIDDEN_COLUMNS = [10]
+
+# Kolom hasil yang berisi nominal rupiah (ditampilkan lewat CurrencyDelegate)
+TABLE_VIEW_CURRENCY_COLUMNS = [3, 8]
+
+# Ekspresi ORDER BY dan apakah nilainya bisa NULL (LEFT JOIN cicilan), per kolom hasil
+TABLE_VIEW_SORT_COLUMNS = [
+    ("pinjaman.id_pinjaman", False),
+    ("peminjam.nama", False),
+    ("peminjam.no_telp", False),
+    ("pinjaman.jumlah_pinjaman", False),
+    ("pinjaman.tanggal_pinjam", False),
+    ("pinjaman.tanggal_selesai", False),
+    ("pinjaman.status", False),
+    ("cicilan.cicilan_ke", True),
+    ("cicilan.jumlah_cicilan", True),
+    ("cicilan.status_bayar", True),
+    ("peminjam.id_peminjam", False),
+]
+
+# Index yang dipakai untuk mengurutkan kolom tertentu tanpa temp B-tree
+TABLE_VIEW_SORT_INDEXES = {
+    1: "idx_peminjam_nama",
+    2: "idx_peminjam_no_telp",
+    3: "idx_pinjaman_jumlah",
+    4: "idx_pinjaman_tanggal_pinjam",
+    5: "idx_pinjaman_tanggal_selesai",
+    6: "idx_pinjaman_status",
+    7: "idx_cicilan_ke",
+    8: "idx_cicilan_jumlah",
+    9: "idx_cicilan_status",
+}
+
+# Jenis query halaman untuk model Table View yang memuat data per jendela
+TABLE_VIEW_PAGES = ["count", "first", "next", "prev", "offset"]
+
+# Cari peminjam lewat index FTS5 (nama, alamat, no_telp, email)
+FILTER_NAMA = " AND peminjam.id_peminjam IN (SELECT rowid FROM peminjam_fts WHERE peminjam_fts MATCH ?)"
+FILTER_STATUS_PINJAMAN = " AND pinjaman.status = ?"
+FILTER_STATUS_CICILAN = " AND cicilan.status_bayar = ?"
+
+QUERIES = {
+    "pinjaman_by_peminjam": (
+        "SELECT id_pinjaman, jumlah_pinjaman, tanggal_pinjam FROM pinjaman WHERE id_peminjam = ?"),
+    "pinjaman_tanpa_cicilan": (
+        "SELECT id_pinjaman, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status FROM pinjaman "
+        "WHERE id_pinjaman > ? AND NOT EXISTS (SELECT 1 FROM cicilan WHERE cicilan.id_pinjaman = pinjaman.id_pinjaman) "
+        "ORDER BY id_pinjaman LIMIT ?"),
+    # Picker peminjam/pinjaman: prefix nama (lihat lookup_prefix_bounds) lalu keyset per halaman
+    "peminjam_lookup": (
+        "SELECT id_peminjam, nama FROM peminjam "
+        "WHERE nama >= ? COLLATE NOCASE AND nama < ? COLLATE NOCASE "
+        "AND (nama COLLATE NOCASE, id_peminjam) > (?, ?) "
+        "ORDER BY nama COLLATE NOCASE, id_peminjam LIMIT ?"),
+    "peminjam_lookup_id": "SELECT id_peminjam, nama FROM peminjam WHERE id_peminjam = ?",
+    "pinjaman_lookup_nama": (
+        "SELECT pinjaman.id_pinjaman, pinjaman.jumlah_pinjaman, peminjam.nama, peminjam.id_peminjam "
+        "FROM peminjam CROSS JOIN pinjaman ON pinjaman.id_peminjam = peminjam.id_peminjam "
+        "WHERE peminjam.nama >= ? COLLATE NOCASE AND peminjam.nama < ? COLLATE NOCASE "
+        "AND (peminjam.nama COLLATE NOCASE, peminjam.id_peminjam, pinjaman.id_pinjaman) > (?, ?, ?) "
+        "ORDER BY peminjam.nama COLLATE NOCASE, peminjam.id_peminjam, pinjaman.id_pinjaman LIMIT ?"),
+    "pinjaman_lookup": (
+        "SELECT pinjaman.id_pinjaman, pinjaman.jumlah_pinjaman, peminjam.nama, peminjam.id_peminjam "
+        "FROM pinjaman JOIN peminjam ON pinjaman.id_peminjam = peminjam.id_peminjam "
+        "WHERE pinjaman.id_pinjaman > ? ORDER BY pinjaman.id_pinjaman LIMIT ?"),
+    "pinjaman_lookup_id": (
+        "SELECT pinjaman.id_pinjaman, pinjaman.jumlah_pinjaman, peminjam.nama, peminjam.id_peminjam "
+        "FROM pinjaman JOIN peminjam ON pinjaman.id_peminjam = peminjam.id_peminjam "
+        "WHERE pinjaman.id_pinjaman = ?"),
+}
+
+# Index yang wajib muncul di EXPLAIN QUERY PLAN untuk setiap query
+QUERY_INDEXES = {
+    "pinjaman_by_peminjam": ["idx_pinjaman_peminjam"],
+    "pinjaman_tanpa_cicilan": ["idx_cicilan_pinjaman"],
+    "peminjam_lookup": ["idx_peminjam_nama_nocase"],
+    "peminjam_lookup_id": [],
+    "pinjaman_lookup_nama": ["idx_peminjam_nama_nocase", "idx_pinjaman_peminjam"],
+    "pinjaman_lookup": [],
+    "pinjaman_lookup_id": [],
+}
+
+# Primary key tabel Record View; navigasi record memakai keyset pada kolom ini
+RECORD_VIEW_KEYS = {"peminjam": "id_peminjam", "pinjaman": "id_pinjaman", "cicilan": "id_cicilan"}
+
+for _table, _key in RECORD_VIEW_KEYS.items():
+    QUERIES.update({
+        f"record_{_table}_count": f"SELECT COUNT(*) FROM {_table}",
+        f"record_{_table}_first": f"SELECT {_key} FROM {_table} ORDER BY {_key} LIMIT 1",
+        f"record_{_table}_last": f"SELECT {_key} FROM {_table} ORDER BY {_key} DESC LIMIT 1",
+        f"record_{_table}_next": f"SELECT {_key} FROM {_table} WHERE {_key} > ? ORDER BY {_key} LIMIT 1",
+        f"record_{_table}_prev": f"SELECT {_key} FROM {_table} WHERE {_key} < ? ORDER BY {_key} DESC LIMIT 1",
+        f"record_{_table}_from": f"SELECT {_key} FROM {_table} WHERE {_key} >= ? ORDER BY {_key} LIMIT 1",
+        f"record_{_table}_position": f"SELECT COUNT(*) FROM {_table} WHERE {_key} <= ?",
+    })
+    # Langkah berikut/sebelumnya harus SEARCH lewat rowid, bukan scan tabel
+    QUERY_INDEXES.update({
+        f"record_{_table}_count": [],
+        f"record_{_table}_first": [],
+        f"record_{_table}_last": [],
+        f"record_{_table}_next": ["INTEGER PRIMARY KEY"],
+        f"record_{_table}_prev": ["INTEGER PRIMARY KEY"],
+        f"record_{_table}_from": ["INTEGER PRIMARY KEY"],
+        f"record_{_table}_position": ["INTEGER PRIMARY KEY"],
+    })
+
+# Batas atas rentang prefix: lebih besar dari karakter apa pun setelah prefix
+LOOKUP_PREFIX_END = "\U0010ffff"
+
+
+def lookup_prefix_bounds(prefix):
+    """Parameter (batas bawah, batas atas) untuk nama yang diawali `prefix` (NOCASE)"""
+    return [prefix, prefix + LOOKUP_PREFIX_END]
+
+
+STATEMENTS = dict(QUERIES)
+STATEMENTS.update({
+    "insert_peminjam": "INSERT INTO peminjam (nama, alamat, no_telp, email) VALUES (?, ?, ?, ?)",
+    "insert_pinjaman": (
+        "INSERT INTO pinjaman (id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status) "
+        "VALUES (?, ?, ?, ?, ?)"),
+    "insert_cicilan": (
+        "INSERT INTO cicilan (id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_bayar, status_bayar) "
+        "VALUES (?, ?, ?, ?, ?)"),
+    "insert_cicilan_jadwal": (
+        "INSERT INTO cicilan (id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_jatuh_tempo, status_bayar) "
+        "VALUES (?, ?, ?, ?, ?)"),
+    "update_pinjaman_peminjam": "UPDATE pinjaman SET id_peminjam = ? WHERE id_pinjaman = ?",
+    # Berubah setiap kali koneksi lain meng-commit perubahan ke file database
+    "data_version": "PRAGMA data_version",
+})
+for _table, _key in RECORD_VIEW_KEYS.items():
+    STATEMENTS[f"record_{_table}_delete"] = f"DELETE FROM {_table} WHERE {_key} = ?"
+
+
+def record_update(table, columns):
+    """(nama statement, sql) UPDATE kolom `columns` satu record; parameter: nilai kolom lalu id"""
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    name = f"record_{table}_update[{','.join(columns)}]"
+    return name, f"UPDATE {table} SET {assignments} WHERE {RECORD_VIEW_KEYS[table]} = ?"
+
+
+def table_view_statement(nama_filter=False, status_filter="Semua"):
+    """Nama statement Table View untuk kombinasi filter yang aktif"""
+    if status_filter in ["Aktif", "Lunas"]:
+        status_key = "pinjaman"
+    elif status_filter != "Semua":
+        status_key = "cicilan"
+    else:
+        status_key = "semua"
+    return f"table_view_{'nama' if nama_filter else 'semua'}_{status_key}"
+
+
+def fts_match_query(text):
+    """Ubah teks filter menjadi query FTS5: setiap kata dicocokkan sebagai prefix"""
+    tokens = re.findall(r"\w+", text or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def table_view_params(nama_filter="", status_filter="Semua"):
+    params = []
+    match = fts_match_query(nama_filter)
+    if match:
+        params.append(match)
+    if status_filter != "Semua":
+        params.append(status_filter)
+    return params
+
+
+def table_view_sort_keys(sort_column=0):
+    """Kolom hasil yang membentuk urutan unik: kolom sort lalu pemecah seri"""
+    keys = [sort_column]
+    if sort_column in (1, 2):
+        keys.append(10)
+    for column in (0, 7):
+        if column not in keys:
+            keys.append(column)
+    return keys
+
+
+def _sort_expr(column, status_filter, sort_column=0, cicilan_first=False):
+    expr, nullable = TABLE_VIEW_SORT_COLUMNS[column]
+    if cicilan_first:
+        # Cicilan di-join tanpa LEFT JOIN, jadi kolomnya tidak pernah NULL
+        return ("cicilan.id_pinjaman" if column == 0 else expr), False
+    
+    if column == 0 and sort_column == 0 and status_filter not in ["Semua", "Aktif", "Lunas"]:
+        return "cicilan.id_pinjaman", False
+    return expr, nullable
+
+
+def _keyset_condition(keys, values, greater):
+    """Kondisi baris sesudah (`greater`) atau sebelum kunci `values` dalam urutan naik.
+
+    NULL dianggap paling kecil, sama seperti urutan ASC SQLite.
+    """
+    terms, params = [], []
+    prefix, prefix_params = [], []
+    for (expr, nullable), value in zip(keys, values):
+        if greater:
+            if value is None:
+                terms.append(" AND ".join(prefix + [f"{expr} IS NOT NULL"]))
+                params += prefix_params
+            else:
+                terms.append(" AND ".join(prefix + [f"{expr} > ?"]))
+                params += prefix_params + [value]
+        elif value is not None:
+            compare = f"({expr} < ? OR {expr} IS NULL)" if nullable else f"{expr} < ?"
+            terms.append(" AND ".join(prefix + [compare]))
+            params += prefix_params + [value]
+        if value is None:
+            prefix.append(f"{expr} IS NULL")
+        else:
+            prefix.append(f"{expr} = ?")
+            prefix_params.append(value)
+
+    condition = "(" + " OR ".join(f"({term})" for term in terms) + ")" if terms else "0"
+    
+    (lead_expr, lead_nullable), lead_value = keys[0], values[0]
+    if lead_value is not None and not lead_nullable:
+        bound = f"{lead_expr} >= ?" if greater else f"{lead_expr} <= ?"
+        return f" AND {bound} AND {condition}", [lead_value] + params
+    return f" AND {condition}", params
+
+
+def table_view_page(nama_filter="", status_filter="Semua", page=None, sort_column=0,
+                    descending=False, key=None, limit=0, offset=0):
+    """Susun (nama statement, SQL, parameter) Table View untuk filter dan urutan aktif.
+
+    `page` memilih bentuk query untuk pemuatan per halaman: None (semua baris),
+    "count", "first", "next"/"prev" (keyset dari nilai `key` baris batas, lihat
+    table_view_sort_keys; `offset` baris setelah kunci dilewati) dan "offset".
+    Statement "prev" mengembalikan baris dalam urutan terbalik.
+    """
+    has_match = bool(fts_match_query(nama_filter))
+    name = table_view_statement(has_match, status_filter)
+    params = table_view_params(nama_filter, status_filter)
+    filter_cicilan = status_filter not in ["Semua", "Aktif", "Lunas"]
+    filters = ""
+    if has_match:
+        filters += FILTER_NAMA
+    if status_filter != "Semua":
+        filters += FILTER_STATUS_CICILAN if filter_cicilan else FILTER_STATUS_PINJAMAN
+        # Index status hanya dipakai jika juga memenuhi urutan; selain itu unary + mematikannya
+        # agar SQLite menelusuri hasil FTS atau index kolom urut lebih dulu
+        if has_match or sort_column not in (0, 9 if filter_cicilan else 6):
+            filters = filters.replace("AND pinjaman.status", "AND +pinjaman.status")
+            filters = filters.replace("AND cicilan.status_bayar", "AND +cicilan.status_bayar")
+
+    if page == "count":
+        return f"{name}:count", "SELECT COUNT(*)" + TABLE_VIEW_FROM + filters, params
+
+    if page is not None:
+        name += f":{page}"
+    if (sort_column, descending) != (0, False):
+        name += f":s{sort_column}{'d' if descending else 'a'}"
+
+    # (kolom SELECT, FROM, telusuri cicilan lebih dulu) per bagian UNION ALL
+    if sort_column in TABLE_VIEW_CICILAN_SORT_COLUMNS and not has_match:
+        parts = [(TABLE_VIEW_COLUMNS_CICILAN, TABLE_VIEW_FROM_CICILAN, True)]
+        if not filter_cicilan:
+            parts.append((TABLE_VIEW_COLUMNS, TABLE_VIEW_FROM_TANPA_CICILAN, False))
+    elif sort_column in (1, 2):
+        parts = [(TABLE_VIEW_COLUMNS, TABLE_VIEW_FROM_PEMINJAM, False)]
+    else:
+        parts = [(TABLE_VIEW_COLUMNS, TABLE_VIEW_FROM, False)]
+
+    sort_keys = table_view_sort_keys(sort_column)
+    reverse = descending != (page == "prev")
+    if page in ("next", "prev") and None in key:
+        name += ":" + "".join("n" if value is None else "v" for value in key)
+
+    selects, part_params = [], []
+    for columns, from_clause, cicilan_first in parts:
+        keys = [_sort_expr(column, status_filter, sort_column, cicilan_first) for column in sort_keys]
+        selects.append(columns + from_clause + filters)
+        part_params += params
+        if page in ("next", "prev"):
+            
+            condition, key_params = _keyset_condition(keys, key, greater=(page == "next") != descending)
+            selects[-1] += condition
+            part_params += key_params
+    query_str = "\n        UNION ALL".join(selects)
+    params = part_params
+
+    if len(parts) == 1:
+        order = [expr for expr, _ in keys]
+    else:
+        # ORDER BY gabungan UNION ALL hanya boleh menyebut nomor kolom hasil
+        order = [str(column + 1) for column in sort_keys]
+    query_str += " ORDER BY " + ", ".join(f"{term} DESC" if reverse else term for term in order)
+    if page == "first":
+        query_str += " LIMIT ?"
+        params.append(limit)
+    elif page in ("next", "prev", "offset"):
+        query_str += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    return name, query_str, params
+
+
+def table_view_query(nama_filter=False, status_filter="Semua", page=None, sort_column=0,
+                     descending=False):
+    """SQL Table View dengan placeholder untuk setiap filter aktif"""
+    key = [0] * len(table_view_sort_keys(sort_column))
+    return table_view_page("x" if nama_filter else "", status_filter, page, sort_column,
+                           descending, key)[1]
+
+
+for _nama_filter in (False, True):
+    for _status_filter in ["Semua", "Aktif", "Belum Bayar"]:
+        _name = table_view_statement(_nama_filter, _status_filter)
+        STATEMENTS[_name] = table_view_query(_nama_filter, _status_filter)
+        for _page in TABLE_VIEW_PAGES:
+            STATEMENTS[f"{_name}:{_page}"] = table_view_query(_nama_filter, _status_filter, _page)
+
+# Baris Table View milik satu pinjaman, untuk menyegarkan baris yang baru diedit
+QUERIES["table_view_rows_pinjaman"] = TABLE_VIEW_SELECT + " AND pinjaman.id_pinjaman = ?"
+STATEMENTS["table_view_rows_pinjaman"] = QUERIES["table_view_rows_pinjaman"]
+QUERY_INDEXES["table_view_rows_pinjaman"] = ["idx_cicilan_pinjaman"]
+
+
+LOAN_TREE_HEADERS = ["ID Pinjaman", "Nama Peminjam", "Jumlah", "Status", "Cicilan Terbayar",
+                     "Sisa Pinjaman", "Jatuh Tempo / Tgl Bayar"]
+
+# Satu baris per pinjaman; agregat cicilan dibaca dari pinjaman_ringkasan yang dijaga trigger
+LOAN_TREE_SELECT = '''
+        SELECT pinjaman.id_pinjaman,
+               peminjam.nama,
+               pinjaman.jumlah_pinjaman,
+               pinjaman.status,
+               pinjaman_ringkasan.cicilan_terbayar,
+               pinjaman_ringkasan.total_cicilan,
+               pinjaman_ringkasan.sisa,
+               pinjaman_ringkasan.jatuh_tempo_berikutnya
+        FROM pinjaman_ringkasan
+                 JOIN pinjaman ON pinjaman.id_pinjaman = pinjaman_ringkasan.id_pinjaman
+                 JOIN peminjam ON pinjaman.id_peminjam = peminjam.id_peminjam
+        WHERE {key} > ?'''
+
+FILTER_LOAN_BELUM_BAYAR = " AND pinjaman_ringkasan.cicilan_terbayar < pinjaman_ringkasan.total_cicilan"
+
+STATEMENTS["loan_tree_cicilan"] = (
+    "SELECT cicilan_ke, jumlah_cicilan, status_bayar, tanggal_bayar FROM cicilan "
+    "WHERE id_pinjaman = ? ORDER BY cicilan_ke")
+QUERY_INDEXES["loan_tree_cicilan"] = ["idx_cicilan_pinjaman"]
+
+
+def loan_tree_page(nama_filter="", status_filter="Semua", after_id=0, limit=200):
+    """(nama statement, SQL, parameter) untuk halaman pinjaman berikutnya di tampilan per pinjaman"""
+    match = fts_match_query(nama_filter)
+    # Kunci halaman mengikuti tabel penggerak agar ORDER BY tidak butuh sort tambahan
+    key = "pinjaman.id_pinjaman" if match or status_filter in ["Aktif", "Lunas"] else "pinjaman_ringkasan.id_pinjaman"
+    query_str = LOAN_TREE_SELECT.format(key=key)
+    params = [after_id]
+    name = "loan_tree"
+    if match:
+        query_str += FILTER_NAMA
+        params.append(match)
+        name += "_nama"
+    if status_filter in ["Aktif", "Lunas"]:
+        query_str += FILTER_STATUS_PINJAMAN.replace("AND pinjaman", "AND +pinjaman" if match else "AND pinjaman")
+        params.append(status_filter)
+        name += "_pinjaman"
+    elif status_filter != "Semua":
+        query_str += FILTER_LOAN_BELUM_BAYAR
+        name += "_belum_bayar"
+    query_str += f" ORDER BY {key} LIMIT ?"
+    params.append(limit)
+    return name, query_str, params
+
+
+for _nama_filter in ("", "x"):
+    for _status_filter in ["Semua", "Aktif", "Belum Bayar"]:
+        _name, _sql, _params = loan_tree_page(_nama_filter, _status_filter)
+        STATEMENTS[_name] = _sql
+
+
+def table_view_indexes(status_filter="Semua", nama_filter=False):
+    if nama_filter:
+        return ["peminjam_fts", "idx_pinjaman_peminjam"]
+    if status_filter in ["Aktif", "Lunas"]:
+        return ["idx_pinjaman_status", "idx_cicilan_pinjaman"]
+    if status_filter != "Semua":
+        return ["idx_cicilan_status"]
+    return ["idx_cicilan_pinjaman"]
+
+
+def all_app_queries():
+    """Semua query aplikasi (nama, sql, index wajib) termasuk variasi filter Table View"""
+    queries = [(name, sql, QUERY_INDEXES[name]) for name, sql in QUERIES.items()]
+    for nama_filter in (False, True):
+        for status_filter in ["Semua", "Aktif", "Belum Bayar"]:
+            name = table_view_statement(nama_filter, status_filter)
+            queries.append((name, STATEMENTS[name],
+                            table_view_indexes(status_filter, nama_filter)))
+            for page in TABLE_VIEW_PAGES:
+                if page == "count":
+                    continue
+                queries.append((f"{name}:{page}", STATEMENTS[f"{name}:{page}"],
+                                table_view_indexes(status_filter, nama_filter)))
+    for nama_filter in ("", "x"):
+        for status_filter in ["Semua", "Aktif", "Belum Bayar"]:
+            name, sql, _ = loan_tree_page(nama_filter, status_filter)
+            indexes = ["peminjam_fts"] if nama_filter else []
+            if status_filter == "Aktif" and not nama_filter:
+                indexes.append("idx_pinjaman_status")
+            if status_filter == "Belum Bayar" and not nama_filter:
+                # Jika hampir semua pinjaman belum lunas, keyset lewat rowid sama murahnya
+                indexes.append(("idx_ringkasan_belum_bayar", "pinjaman_ringkasan USING INTEGER PRIMARY KEY"))
+            queries.append((name, sql, indexes))
+    for sort_column, index_name in TABLE_VIEW_SORT_INDEXES.items():
+        for status_filter in ["Semua", "Aktif", "Belum Bayar"]:
+            for descending in (False, True):
+                for page in ("first", "next"):
+                    sql = table_view_query(False, status_filter, page, sort_column, descending)
+                    expected = index_name
+                    if (sort_column, status_filter) in ((6, "Aktif"), (9, "Belum Bayar")):
+                        # Status sudah ditetapkan filter, urutan id saja (rowid atau idx_cicilan_pinjaman) cukup
+                        expected = (index_name, "SCAN pinjaman", "idx_cicilan_pinjaman")
+                    queries.append((f"table_view_sort[{sort_column}, {status_filter}, desc={descending}]:{page}",
+                                    sql, [expected]))
+    return queries
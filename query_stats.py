@@ -0,0 +1,156 @@
+"""Statistik eksekusi query: waktu, jumlah baris dan lokasi pemanggil per statement.
+
+Semua eksekusi lewat Repository (repository.py) dan koneksi Qt DatabaseManager
+(select() Record View, PRAGMA) dicatat di sini. Per statement disimpan total sejak awal
+dan sampel terakhir (WINDOW) untuk histogram dan persentil bergulir. Eksekusi
+yang lebih lama dari ambang (`slow_query_ms` di database_profile.json) ditulis
+ke slow log beserta EXPLAIN QUERY PLAN. Lihat diagnostics_panel.py untuk panel
+yang menampilkan statement paling mahal.
+"""
+
+import datetime
+import os
+import sys
+import threading
+from collections import deque, namedtuple
+
+SLOW_QUERY_MS = 100
+WINDOW = 500
+# Batas atas setiap kotak histogram (ms); sampel di atas batas terakhir masuk kotak "lebih"
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+# Frame di file ini dilewati saat mencari lokasi pemanggil
+INTERNAL_FILES = {"database_manager.py", "repository.py", "query_stats.py"}
+
+StatementSnapshot = namedtuple("StatementSnapshot", [
+    "name", "sql", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms",
+    "mean_rows", "slow", "errors", "site", "histogram"])
+
+
+def call_site():
+    """'file.py:baris fungsi' dari frame pertama di luar INTERNAL_FILES"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename not in INTERNAL_FILES:
+            return f"{filename}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+class StatementStats:
+    """Angka satu statement: total sejak awal dan sampel (ms, baris) terakhir"""
+
+    def __init__(self, name, sql):
+        self.name = name
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.counted_rows = 0
+        self.slow = 0
+        self.errors = 0
+        self.site = None
+        self.samples = deque(maxlen=WINDOW)
+
+    def add(self, elapsed_ms, rows, site, slow, error):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if rows is not None and rows >= 0:
+            self.rows += rows
+            self.counted_rows += 1
+        self.slow += slow
+        self.errors += error
+        self.site = site
+        self.samples.append(elapsed_ms)
+
+    def histogram(self):
+        """Jumlah sampel bergulir per kotak BUCKETS_MS (+ satu kotak terakhir untuk sisanya)"""
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for sample in self.samples:
+            bucket = 0
+            while bucket < len(BUCKETS_MS) and sample > BUCKETS_MS[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return counts
+
+    def snapshot(self):
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+        return StatementSnapshot(
+            self.name, self.sql, self.count, self.total_ms, self.total_ms / self.count if self.count else 0.0,
+            percentile(0.5), percentile(0.95), self.max_ms,
+            self.rows / self.counted_rows if self.counted_rows else None,
+            self.slow, self.errors, self.site, self.histogram())
+
+
+class QueryStats:
+    """Statistik semua statement di proses ini; aman dipanggil dari thread worker"""
+
+    _instance = None
+
+    def __init__(self, slow_ms=SLOW_QUERY_MS, log_path=None):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._plans = {}
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = QueryStats()
+        return cls._instance
+
+    def configure(self, slow_ms=None, log_path=None):
+        """Ambang slow log (ms) dan file slow log (None = tidak ditulis)"""
+        with self._lock:
+            if slow_ms is not None:
+                self.slow_ms = slow_ms
+            self.log_path = log_path
+
+    def record(self, name, sql, elapsed_ms, rows=None, error=False, explain=None):
+        """Catat satu eksekusi. `explain()` mengembalikan baris EXPLAIN QUERY PLAN dan hanya
+        dipanggil (sekali per statement) jika eksekusi ini lambat; harus dipanggil di thread koneksinya."""
+        site = call_site()
+        slow = elapsed_ms >= self.slow_ms
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = StatementStats(name, sql)
+            stats.add(elapsed_ms, rows, site, slow, error)
+            plan = self._plans.get(name)
+        if not slow or not self.log_path:
+            return
+        if plan is None and explain is not None:
+            plan = explain()
+            with self._lock:
+                self._plans[name] = plan
+        self._write_slow(name, sql, elapsed_ms, rows, site, plan or [])
+
+    def _write_slow(self, name, sql, elapsed_ms, rows, site, plan):
+        lines = [f"{datetime.datetime.now().isoformat(timespec='seconds')} {elapsed_ms:.1f} ms "
+                 f"rows={'-' if rows is None else rows} {site} [{name}]",
+                 f"    {' '.join(sql.split())}"]
+        lines += [f"    PLAN {detail}" for detail in plan]
+        try:
+            with self._lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"Error menulis slow query log {self.log_path}: {e}")
+
+    def top(self, limit=20, key="total_ms"):
+        """Snapshot statement terurut menurut `key` (terbesar dulu)"""
+        with self._lock:
+            snapshots = [stats.snapshot() for stats in self._stats.values()]
+        snapshots.sort(key=lambda snapshot: getattr(snapshot, key), reverse=True)
+        return snapshots[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._plans.clear()
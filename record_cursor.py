@@ -0,0 +1,72 @@
+"""Navigasi record Record View lewat primary key, tanpa memuat seluruh tabel.
+
+Setiap langkah First/Prev/Next/Last mengambil satu id dengan keyset
+`WHERE id > ? ORDER BY id LIMIT 1` (atau kebalikannya) lewat rowid, sehingga
+biayanya sama di tabel 10 baris maupun 1 juta baris. Jumlah record diambil dari
+COUNT yang disimpan sampai data berubah (lihat invalidate/refresh).
+"""
+
+from database_manager import DatabaseManager
+
+
+class RecordCursor:
+    """Record aktif satu tabel: `id` (primary key) dan `position` (1..total, 0 jika kosong)"""
+
+    def __init__(self, table):
+        self.table = table
+        self.id = None
+        self.position = 0
+        self._total = None
+
+    def _value(self, step, params=()):
+        return DatabaseManager.repository().value(f"record_{self.table}_{step}", params)
+
+    def total(self):
+        """Jumlah record di tabel (COUNT disimpan sampai invalidate)"""
+        if self._total is None:
+            self._total = self._value("count")
+        return self._total
+
+    def invalidate(self):
+        self._total = None
+
+    def first(self):
+        id_value = self._value("first")
+        self.id, self.position = id_value, 1 if id_value is not None else 0
+        return id_value
+
+    def last(self):
+        id_value = self._value("last")
+        self.id, self.position = id_value, self.total() if id_value is not None else 0
+        return id_value
+
+    def next(self):
+        """Pindah ke record berikutnya; False jika sudah di record terakhir"""
+        id_value = self._value("next", [self.id]) if self.id is not None else None
+        if id_value is None:
+            return False
+        self.id, self.position = id_value, self.position + 1
+        return True
+
+    def previous(self):
+        """Pindah ke record sebelumnya; False jika sudah di record pertama"""
+        id_value = self._value("prev", [self.id]) if self.id is not None else None
+        if id_value is None:
+            return False
+        self.id, self.position = id_value, self.position - 1
+        return True
+
+    def refresh(self):
+        """Hitung ulang setelah data berubah; jika record aktif terhapus, pindah ke record
+        sesudahnya (atau sebelumnya jika itu record terakhir)"""
+        self._total = None
+        if self.id is None:
+            return self.first()
+        id_value = self._value("from", [self.id])
+        if id_value is None:
+            id_value = self._value("prev", [self.id])
+        if id_value is None:
+            return self.first()
+        # Nomor urut dihitung ulang karena record sebelum record aktif bisa bertambah/berkurang
+        self.id, self.position = id_value, self._value("position", [id_value])
+        return id_value
@@ -1,32 +1,36 @@
+import time
+from collections import namedtuple
+
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
-                             QPushButton, QLabel, QLineEdit, QComboBox,
+                             QPushButton, QLabel, QLineEdit, QComboBox, QStackedWidget,
                              QDateEdit, QDataWidgetMapper, QMessageBox, QDialog)
-from PyQt6.QtCore import Qt, pyqtProperty, QLocale
-from PyQt6.QtSql import QSqlTableModel, QSqlQuery, QSqlRelationalTableModel, QSqlRelation, QSqlDatabase
+from PyQt6.QtCore import Qt, QDate, pyqtProperty
+from PyQt6.QtSql import QSqlTableModel
 from PyQt6.QtGui import QDoubleValidator 
 from add_data_dialog import AddDataDialog 
-
-
-
-class MappingComboBox(QComboBox):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        
-    def _get_current_data_property(self):
-        return self.currentData()
-
-    def _set_current_data_property(self, value):
-        
-        index = self.findData(value)
-        if index >= 0:
-            self.setCurrentIndex(index)
-        
-        elif value is None and self.count() > 0 and self.itemData(0) is None:
-            self.setCurrentIndex(0)
-
-    
-    
-    currentData_property = pyqtProperty(int, _get_current_data_property, _set_current_data_property, user=True)
+from change_set import ChangeSet
+from currency import format_rupiah, parse_rupiah
+from database_manager import DatabaseManager
+from directory import Directory
+from lookup import LookupComboBox, PeminjamLookup, PinjamanLookup
+from record_cursor import RecordCursor
+import queries
+import validators
+
+# Model, mapper, form, posisi record dan perubahan belum disimpan satu tabel (dibuat saat pertama dibuka)
+TableForm = namedtuple("TableForm", ["widget", "model", "mapper", "fields", "cursor", "changes"])
+
+
+def _same_value(a, b):
+    """Bandingkan nilai form dengan nilai database (NULL = teks kosong, angka dibandingkan sebagai angka)"""
+    if a in (None, "") or b in (None, ""):
+        return a in (None, "") and b in (None, "")
+    if isinstance(a, (int, float)) or isinstance(b, (int, float)):
+        try:
+            return float(a) == float(b)
+        except (TypeError, ValueError):
+            return False
+    return str(a) == str(b)
 
 
 class CurrencyLineEdit(QLineEdit):
@@ -38,31 +42,18 @@ class CurrencyLineEdit(QLineEdit):
         self.setValidator(validator)
 
         self._numeric_value = 0.0
-        self.indonesian_locale = QLocale(QLocale.Language.Indonesian, QLocale.Country.Indonesia)
         self.editingFinished.connect(self._on_editing_finished)
         self.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
     def _format_value_for_display(self, value):
         try:
-            num = float(value)
-            
-            
-            return f"Rp {self.indonesian_locale.toString(num, 'f', 0)}"
+            return format_rupiah(value)
         except (ValueError, TypeError):
             return ""
 
     def _get_numeric_from_display_text(self, text):
         
-        cleaned_text = text.replace("Rp ", "").strip()
-        try:
-            
-            num, ok = self.indonesian_locale.toDouble(cleaned_text)
-            if ok:
-                return num
-            else:
-                return 0.0
-        except (ValueError, TypeError):
-            return 0.0
+        return parse_rupiah(text)
 
     def get_numeric_value(self):
         
@@ -88,11 +79,39 @@ class CurrencyLineEdit(QLineEdit):
         self.set_numeric_value(parsed_value) 
 
 
+class DateEdit(QDateEdit):
+    """QDateEdit yang bisa kosong; dipetakan sebagai teks yyyy-MM-dd atau None (NULL)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setCalendarPopup(True)
+        self.setDisplayFormat("yyyy-MM-dd")
+        # Tanggal minimum ditampilkan "-" dan berarti NULL (mis. tanggal_bayar yang belum dibayar)
+        self.setMinimumDate(QDate(1900, 1, 1))
+        self.setSpecialValueText("-")
+
+    def get_date_text(self):
+        if self.date() == self.minimumDate():
+            return None
+        return self.date().toString("yyyy-MM-dd")
+
+    def set_date_text(self, value):
+        date = QDate.fromString(str(value), "yyyy-MM-dd") if value else QDate()
+        self.setDate(date if date.isValid() else self.minimumDate())
+
+    date_text = pyqtProperty("QVariant", get_date_text, set_date_text, user=True)
+
+
 class RecordViewWidget(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_table = "peminjam"
+        self._forms = {}
+        self._stale = set()
+        self._data_versions = {}
+        # Nilai database record aktif per tabel, pembanding untuk _stage_current
+        self._record_values = {}
         self.init_ui()
 
     def init_ui(self):
@@ -108,8 +127,8 @@ class RecordViewWidget(QWidget):
         layout.addLayout(table_layout)
 
         
-        self.form_layout = QFormLayout()
-        layout.addLayout(self.form_layout)
+        self.forms = QStackedWidget()
+        layout.addWidget(self.forms)
 
         
         nav_layout = QHBoxLayout()
@@ -152,70 +171,125 @@ class RecordViewWidget(QWidget):
         action_layout.addWidget(self.btn_cancel)
         layout.addLayout(action_layout)
 
+        self.lbl_changes = QLabel()
+        self.lbl_changes.setWordWrap(True)
+        layout.addWidget(self.lbl_changes)
+
         self.setLayout(layout)
 
         
-        self.mapper = QDataWidgetMapper()
-        self.mapper.currentIndexChanged.connect(self.update_position)
+        Directory.instance().changed.connect(self._on_data_changed)
 
         
         self.change_table("peminjam")
 
     def change_table(self, table_name):
-        """Ganti tabel yang ditampilkan"""
+        """Ganti tabel yang ditampilkan; model dan form tabel yang pernah dibuka dipakai ulang"""
+        if self._forms:
+            # Edit di form tabel sebelumnya tetap tercatat walau belum disimpan
+            self._stage_current()
         self.current_table = table_name
 
-        
-        while self.form_layout.rowCount() > 0:
-            self.form_layout.removeRow(0)
-
-        
-        if table_name == "pinjaman":
-            
-            self.model = QSqlRelationalTableModel()
-            self.model.setTable(table_name)
-            self.model.setRelation(1, QSqlRelation("peminjam", "id_peminjam", "nama"))
-            self.model.setEditStrategy(QSqlRelationalTableModel.EditStrategy.OnManualSubmit)
-        elif table_name == "cicilan":
-            
-            self.model = QSqlRelationalTableModel()
-            self.model.setTable(table_name)
-            
-            
-            self.model.setRelation(1, QSqlRelation("pinjaman", "id_pinjaman", "id_pinjaman"))
-            self.model.setEditStrategy(QSqlRelationalTableModel.EditStrategy.OnManualSubmit)
+        table_form = self._forms.get(table_name)
+        if table_form is None:
+            table_form = self._create_table_form(table_name)
+            self._forms[table_name] = table_form
         else:
-            
-            self.model = QSqlTableModel()
-            self.model.setTable(table_name)
-            self.model.setEditStrategy(QSqlTableModel.EditStrategy.OnManualSubmit)
+            self.model, self.mapper, self.fields = table_form.model, table_form.mapper, table_form.fields
+            self.cursor, self.changes, self.form_widget = table_form.cursor, table_form.changes, table_form.widget
+            self._refresh_if_stale()
+        self.forms.setCurrentWidget(table_form.widget)
+        self.update_position()
 
-        self.model.select()
+    def _create_table_form(self, table_name):
+        # Model hanya memuat record aktif (filter primary key, lihat _load_record); kolom
+        # id_peminjam/id_pinjaman dipetakan langsung ke picker lewat id
+        self.model = QSqlTableModel()
+        self.model.setTable(table_name)
+        self.model.setEditStrategy(QSqlTableModel.EditStrategy.OnManualSubmit)
 
         
+        self.mapper = QDataWidgetMapper(self)
         self.mapper.setModel(self.model)
         self.mapper.setSubmitPolicy(QDataWidgetMapper.SubmitPolicy.ManualSubmit)
 
         
+        self.form_widget = QWidget()
+        self.form_layout = QFormLayout(self.form_widget)
         self.create_form_fields()
+        self.forms.addWidget(self.form_widget)
 
         
-        if self.model.rowCount() > 0: 
+        self.cursor = RecordCursor(table_name)
+        self.changes = ChangeSet(table_name)
+        self._load_record(self.cursor.first())
+        return TableForm(self.form_widget, self.model, self.mapper, self.fields, self.cursor, self.changes)
+
+    def _data_version(self):
+        return DatabaseManager.repository().value("data_version")
+
+    def _load_record(self, id_value):
+        """Muat satu record lewat primary key ke form; form kosong jika `id_value` None"""
+        key = queries.RECORD_VIEW_KEYS[self.current_table]
+        record_filter = f"{key} = {int(id_value)}" if id_value is not None else "0"
+        # setFilter() sudah memanggil select() ulang jika model pernah dimuat
+        start = time.perf_counter()
+        self.model.setFilter(record_filter)
+        if not self.model.query().isActive():
+            self.model.select()
+        DatabaseManager.record_query(self.model.database(), f"record_{self.current_table}_select",
+                                     self.model.query(), start, self.model.rowCount())
+        self._stale.discard(self.current_table)
+        self._data_versions[self.current_table] = self._data_version()
+
+        if self.model.rowCount() > 0:
+            self._record_values[self.current_table] = [self.model.data(self.model.index(0, column))
+                                                       for column in range(self.model.columnCount())]
+            # Perubahan yang belum disimpan ditampilkan di atas nilai dari database
+            for column_name, value in self.changes.changes(id_value).items():
+                self.model.setData(self.model.index(0, self.model.fieldIndex(column_name)), value)
             self.mapper.toFirst()
+        else:
+            self._record_values[self.current_table] = None
+            # Tanpa baris aktif revert() mengosongkan widget; mapping tetap ada karena form dipakai ulang
+            self.mapper.revert()
+        self.form_widget.setEnabled(not self.changes.is_deleted(id_value))
         self.update_position()
 
-    def _load_pinjaman_with_peminjam_names_to_combo(self, combo_box):
-        combo_box.clear()
-        combo_box.addItem("Pilih Pinjaman", None) 
-        query = QSqlQuery(QSqlDatabase.database())
-        query.exec("SELECT p.id_pinjaman, p.jumlah_pinjaman, pm.nama FROM pinjaman p JOIN peminjam pm ON p.id_peminjam = pm.id_peminjam ORDER BY p.id_pinjaman")
-        
-        while query.next():
-            loan_id = query.value(0)
-            amount = query.value(1)
-            peminjam_name = query.value(2)
-            display_text = f"ID: {loan_id} - {peminjam_name} (Rp {amount:,.0f})"
-            combo_box.addItem(display_text, loan_id) 
+    def _stage_current(self):
+        """Catat kolom record aktif yang berbeda dari database ke change set tabel ini"""
+        id_value = self.cursor.id
+        record_values = self._record_values.get(self.current_table)
+        if record_values is None or self.changes.is_deleted(id_value):
+            return
+        self.mapper.submit()
+        record = {}
+        changes = {}
+        for column in range(self.model.columnCount()):
+            column_name = self.model.record().fieldName(column)
+            value = self.model.data(self.model.index(0, column))
+            record[column_name] = value
+            if not _same_value(value, record_values[column]):
+                changes[column_name] = value
+        error = validators.validate_record(self.current_table, record) if changes else None
+        self.changes.stage_update(id_value, changes, error)
+
+    def _on_data_changed(self, table):
+        self._stale.add(table)
+
+    def _refresh_if_stale(self):
+        """Muat ulang tabel aktif hanya jika berubah lewat aplikasi atau koneksi lain sejak dimuat"""
+        if (self.current_table not in self._stale
+                and self._data_versions.get(self.current_table) == self._data_version()):
+            return
+        self._stage_current()
+        self._load_record(self.cursor.refresh())
+
+    def showEvent(self, event):
+        # Data bisa berubah dari tab Table View selama Record View tersembunyi
+        super().showEvent(event)
+        self._refresh_if_stale()
+        self.update_position()
 
     def create_form_fields(self):
         self.fields = {}
@@ -233,32 +307,24 @@ class RecordViewWidget(QWidget):
             
             
             elif self.current_table == "cicilan" and col_name and col_name.lower() == 'id_pinjaman':
-                field = MappingComboBox() 
-                self._load_pinjaman_with_peminjam_names_to_combo(field)
+                field = LookupComboBox(PinjamanLookup(), "Pilih Pinjaman")
                 self.fields[col_name] = field
                 self.form_layout.addRow("ID Pinjaman (Peminjam):", field)
                 self.mapper.addMapping(field, i, b"currentData_property") 
             
             
             elif col_name and col_name.lower() == 'id_peminjam':
-                field = QComboBox()
-                
-                query = QSqlQuery(QSqlDatabase.database())
-                query.exec("SELECT id_peminjam, nama FROM peminjam ORDER BY nama")
-                while query.next():
-                    field.addItem(query.value(1), query.value(0))  
+                field = LookupComboBox(PeminjamLookup())
                 self.fields[col_name] = field
                 self.form_layout.addRow("Peminjam:", field)
-                self.mapper.addMapping(field, i)
+                self.mapper.addMapping(field, i, b"currentData_property")
 
             
             elif col_name and 'tanggal' in col_name.lower():
-                field = QDateEdit()
-                field.setCalendarPopup(True)
-                field.setDisplayFormat("yyyy-MM-dd")
+                field = DateEdit()
                 self.fields[col_name] = field
                 self.form_layout.addRow(col_name + ":", field)
-                self.mapper.addMapping(field, i)
+                self.mapper.addMapping(field, i, b"date_text")
 
             
             elif col_name and 'status' in col_name.lower():
@@ -286,8 +352,8 @@ class RecordViewWidget(QWidget):
                 self.mapper.addMapping(field, i)
 
     def update_position(self):
-        current = self.mapper.currentIndex() + 1
-        total = self.model.rowCount()
+        current = self.cursor.position
+        total = self.cursor.total()
         self.lbl_position.setText(f"{current}/{total}")
 
         
@@ -295,96 +361,99 @@ class RecordViewWidget(QWidget):
         self.btn_prev.setEnabled(current > 1)
         self.btn_next.setEnabled(current < total)
         self.btn_last.setEnabled(current < total)
+        self._update_changes_label()
+
+    def _update_changes_label(self):
+        text = f"{len(self.changes)} record belum disimpan" if len(self.changes) else ""
+        if self.changes.is_deleted(self.cursor.id):
+            text += " - record ini ditandai untuk dihapus"
+        error = self.changes.errors.get(self.cursor.id)
+        if error:
+            text += f" - Error: {error}"
+        self.lbl_changes.setText(text)
 
     
     def first_record(self):
-        self.mapper.toFirst()
+        self._stage_current()
+        self._load_record(self.cursor.first())
 
     def prev_record(self):
-        self.mapper.toPrevious()
+        self._stage_current()
+        if self.cursor.previous():
+            self._load_record(self.cursor.id)
 
     def next_record(self):
-        self.mapper.toNext()
-        
-        
-        
-        if self.model.rowCount() > 0 and self.mapper.currentIndex() == -1:
-            self.mapper.toFirst()
-        elif self.model.rowCount() == 0:
-            self.mapper.clearMapping()
-            self.update_position()
+        self._stage_current()
+        if self.cursor.next():
+            self._load_record(self.cursor.id)
 
     def last_record(self):
-        self.mapper.toLast()
+        self._stage_current()
+        self._load_record(self.cursor.last())
 
     
     def add_record(self):
+        self._stage_current()
         dialog = AddDataDialog(self, table_type=self.current_table) 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             
-            self.model.select()
-            if self.model.rowCount() > 0:
-                self.mapper.toLast() 
-            else:
-                self.mapper.clearMapping() 
-            self.update_position()
+            self.cursor.invalidate()
+            self._load_record(self.cursor.last())
 
 
     def delete_record(self):
+        if self.cursor.id is None:
+            QMessageBox.warning(self, "Peringatan", "Tidak ada record untuk dihapus.")
+            return
+
         reply = QMessageBox.question(
             self,
             "Konfirmasi Hapus",
-            "Yakin ingin menghapus record ini?",
+            "Yakin ingin menghapus record ini?\nRecord dihapus dari database saat Simpan.",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            current_index = self.mapper.currentIndex()
-            if current_index >= 0:
-                self.model.removeRow(current_index)
-                if self.model.submitAll():
-                    QMessageBox.information(self, "Sukses", "Data berhasil dihapus!")
-                    self.model.select() 
-                    if self.model.rowCount() > 0:
-                        self.mapper.toFirst() 
-                    else:
-                        self.mapper.clearMapping() 
-                    self.update_position()
-                else:
-                    QMessageBox.critical(self, "Error",
-                                         f"Gagal menghapus: {self.model.lastError().text()}")
-                    self.model.revertAll()
-            else:
-                QMessageBox.warning(self, "Peringatan", "Tidak ada record untuk dihapus.")
+            self.changes.stage_delete(self.cursor.id)
+            self._load_record(self.cursor.id)
 
     def save_record(self):
-        
-        if self.current_table == "pinjaman" and 'id_peminjam' in self.fields:
-            combo = self.fields['id_peminjam']
-            id_peminjam = combo.currentData()
-            
-            current_row = self.mapper.currentIndex()
-            self.model.setData(self.model.index(current_row, 1), id_peminjam) 
-
-        
-        elif self.current_table == "cicilan" and 'id_pinjaman' in self.fields:
-            combo = self.fields['id_pinjaman']
-            id_pinjaman = combo.currentData()
-            current_row = self.mapper.currentIndex()
-            
-            self.model.setData(self.model.index(current_row, 1), id_pinjaman)
-
-
-        self.mapper.submit()
-
-        if self.model.submitAll():
-            QMessageBox.information(self, "Sukses", "Data berhasil disimpan!")
-            self.model.select()
-        else:
+        """Simpan semua record yang diubah/ditandai hapus di tabel ini dalam satu transaksi.
+
+        Commit berjalan di thread penulis (DatabaseManager.pool); selama itu form dikunci
+        karena change set sedang dipakai thread tersebut.
+        """
+        self._stage_current()
+        if not len(self.changes):
+            QMessageBox.information(self, "Info", "Tidak ada perubahan untuk disimpan.")
+            return
+
+        count = len(self.changes)
+        deleted = bool(self.changes.deletes)
+        self.setEnabled(False)
+        DatabaseManager.pool().run(self.changes.commit,
+                                   finished=lambda errors: self._on_saved(count, deleted, errors),
+                                   failed=lambda error: self._on_saved(count, deleted, {None: error}),
+                                   write=True)
+
+    def _on_saved(self, count, deleted, errors):
+        self.setEnabled(True)
+        if errors:
+            details = "\n".join(f"ID {id_value}: {message}" if id_value is not None else message
+                                for id_value, message in sorted(errors.items(), key=lambda item: str(item[0])))
             QMessageBox.critical(self, "Error",
-                                 f"Gagal menyimpan: {self.model.lastError().text()}")
-            self.model.revertAll()
+                                 f"Gagal menyimpan, tidak ada perubahan yang disimpan:\n{details}")
+            self.update_position()
+            return
+
+        Directory.instance().invalidate(self.current_table)
+        QMessageBox.information(self, "Sukses", f"{count} record berhasil disimpan!")
+        # Hanya record aktif yang dimuat ulang; posisi dihitung ulang jika ada yang dihapus
+        if deleted:
+            self.cursor.refresh()
+        self._load_record(self.cursor.id)
 
     def cancel_edit(self):
-        self.model.revertAll()
-        self.mapper.revert()
\ No newline at end of file
+        """Buang semua perubahan yang belum disimpan di tabel ini"""
+        self.changes.clear()
+        self._load_record(self.cursor.id)
@@ -0,0 +1,282 @@
+"""Akses data peminjam, pinjaman dan cicilan lewat sqlite3, tanpa Qt.
+
+Semua SQL aplikasi ada di queries.py dan dijalankan lewat Repository. Widget
+memakai repository milik thread-nya (DatabaseManager.repository(), atau argumen
+job DatabaseManager.pool().run), sedangkan script CLI, job terjadwal dan
+benchmark cukup membuka koneksi sendiri tanpa memuat PyQt6:
+
+    repository = Repository.open("database.db")
+    id_pinjaman, jumlah_jadwal = repository.pinjaman.add_with_schedule(
+        id_peminjam, 6000000, "2024-01-01", "2024-07-01", "Aktif")
+    repository.cicilan.add_many(rows)
+
+Setiap eksekusi dicatat di QueryStats, dan pemakaian cache statement per koneksi
+di Repository.statements. Query baca mencetak error dan
+mengembalikan list kosong; penulisan melempar sqlite3.Error setelah
+transaksinya dibatalkan.
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+
+import connection_profile
+import installment_schedule
+from query_stats import QueryStats
+import queries
+
+
+class StatementRegistry:
+    """Statement bernama yang sedang ter-prepare di satu koneksi sqlite3, dengan hit/miss.
+
+    sqlite3 menyimpan statement ter-prepare dalam cache LRU per koneksi berkunci teks
+    SQL (ukuran `cached_statements`, lihat connection_profile.CACHED_STATEMENTS) tanpa
+    angka apa pun. Registry ini mengikuti cache tersebut: hit = statement dipakai
+    ulang, miss = harus di-prepare, terbuang = didepak karena cache penuh.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # teks SQL -> nama statement, urutan = pemakaian terakhir
+        self._statements = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def use(self, name, sql):
+        """Catat satu eksekusi `sql`; True jika statement-nya masih ada di cache"""
+        if sql in self._statements:
+            self._statements.move_to_end(sql)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        if self.capacity > 0:
+            self._statements[sql] = name
+            if len(self._statements) > self.capacity:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+        return False
+
+    def names(self):
+        """Nama statement di cache, yang paling lama tidak dipakai lebih dulu"""
+        return list(self._statements.values())
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "prepared": len(self._statements), "capacity": self.capacity}
+
+    def reset(self):
+        """Nolkan hitungan (statement di cache tetap)"""
+        self.hits = self.misses = self.evictions = 0
+
+
+class Repository:
+    """Statement bernama (queries.STATEMENTS) di satu koneksi sqlite3, plus repository per tabel.
+
+    Koneksi sqlite3 hanya boleh dipakai di thread yang membukanya. `cached_statements`
+    harus sama dengan ukuran cache statement koneksi `conn`.
+    """
+
+    def __init__(self, conn, cached_statements=connection_profile.CACHED_STATEMENTS):
+        self.conn = conn
+        self.statements = StatementRegistry(cached_statements)
+        self.peminjam = PeminjamRepository(self)
+        self.pinjaman = PinjamanRepository(self)
+        self.cicilan = CicilanRepository(self)
+
+    @classmethod
+    def open(cls, db_name, profile=None, read_only=False):
+        """Buka koneksi dengan profil aplikasi (lihat connection_profile.py)"""
+        profile = profile or connection_profile.load_profile(db_name)
+        return cls(connection_profile.connect(db_name, profile, read_only), profile.cached_statements)
+
+    def close(self):
+        self.conn.close()
+
+    def table(self, name):
+        """Repository tabel `name` (peminjam, pinjaman atau cicilan)"""
+        return getattr(self, name)
+
+    def _record(self, name, sql, start, rows=None, error=False):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        QueryStats.instance().record(name, sql, elapsed_ms, None if rows is None or rows < 0 else rows,
+                                     error, lambda: self.explain(sql))
+
+    def _exec(self, name, params, sql, many=False):
+        sql = sql if sql is not None else queries.STATEMENTS[name]
+        self.statements.use(name, sql)
+        start = time.perf_counter()
+        try:
+            cursor = self.conn.executemany(sql, params) if many else self.conn.execute(sql, params)
+        except sqlite3.Error:
+            self._record(name, sql, start, error=True)
+            raise
+        return cursor, sql, start
+
+    def execute(self, name, params=(), sql=None):
+        """Eksekusi statement bernama; kembalikan cursor. Melempar sqlite3.Error jika gagal.
+
+        Waktu yang dicatat hanya eksekusi; baris SELECT belum diambil (lihat fetch/rows/cursor).
+        """
+        cursor, sql, start = self._exec(name, params, sql)
+        self._record(name, sql, start, cursor.rowcount)
+        return cursor
+
+    def executemany(self, name, rows, sql=None):
+        """Eksekusi statement untuk banyak baris sekaligus; kembalikan jumlah baris terpengaruh"""
+        cursor, sql, start = self._exec(name, rows, sql, many=True)
+        self._record(name, sql, start, cursor.rowcount)
+        return cursor.rowcount
+
+    def cursor(self, name, params=(), sql=None):
+        """Eksekusi SELECT dan kembalikan cursor untuk dibaca bertahap (fetchmany)"""
+        return self.execute(name, params, sql)
+
+    def fetch(self, name, params=(), sql=None):
+        """Eksekusi statement dan ambil (nama kolom, semua baris sebagai list of tuple)"""
+        try:
+            cursor, sql, start = self._exec(name, params, sql)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error executing statement '{name}': {e}")
+            return [], []
+        self._record(name, sql, start, len(rows))
+        return [column[0] for column in cursor.description or ()], rows
+
+    def rows(self, name, params=(), sql=None):
+        """Eksekusi statement dan ambil semua baris sebagai list of tuple"""
+        return self.fetch(name, params, sql)[1]
+
+    def value(self, name, params=(), sql=None):
+        """Kolom pertama baris pertama, atau None"""
+        rows = self.rows(name, params, sql)
+        return rows[0][0] if rows else None
+
+    def explain(self, sql):
+        """Baris detail EXPLAIN QUERY PLAN untuk `sql` (parameter diisi NULL)"""
+        try:
+            return [row[3] for row in self.conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count("?"))]
+        except sqlite3.Error as e:
+            return [f"(EXPLAIN gagal: {e})"]
+
+
+class TableRepository:
+    """Tambah, ubah dan hapus record satu tabel; setiap method tulis adalah satu transaksi"""
+
+    TABLE = None
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def add(self, *values):
+        """Simpan satu record (kolom sesuai insert_<tabel>); kembalikan id barunya"""
+        with self.repository.conn:
+            return self.repository.execute(f"insert_{self.TABLE}", values).lastrowid
+
+    def add_many(self, rows, on_error=None):
+        """Simpan banyak record dalam satu transaksi; kembalikan jumlah yang tersimpan.
+
+        Tanpa `on_error` satu baris gagal membatalkan semuanya. Dengan `on_error(posisi,
+        error)` baris diulang satu per satu dan hanya baris yang gagal yang dilewati.
+        """
+        rows = list(rows)
+        name = f"insert_{self.TABLE}"
+        try:
+            with self.repository.conn:
+                self.repository.executemany(name, rows)
+            return len(rows)
+        except sqlite3.Error:
+            if on_error is None:
+                raise
+
+        conn = self.repository.conn
+        inserted = 0
+        with conn:
+            conn.execute("BEGIN")
+            for position, values in enumerate(rows):
+                conn.execute("SAVEPOINT baris")
+                try:
+                    self.repository.execute(name, values)
+                    inserted += 1
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO baris")
+                    on_error(position, e)
+                conn.execute("RELEASE baris")
+        return inserted
+
+    def apply_changes(self, updates, deletes):
+        """Hapus `deletes` dan ubah `updates` (id -> kolom -> nilai) dalam satu transaksi.
+
+        Mengembalikan dict id -> pesan error; jika tidak kosong seluruh transaksi dibatalkan.
+        """
+        conn = self.repository.conn
+        errors = {}
+        for id_value in sorted(deletes):
+            try:
+                self.repository.execute(f"record_{self.TABLE}_delete", [id_value])
+            except sqlite3.Error as e:
+                errors[id_value] = str(e)
+        for id_value, changes in updates.items():
+            # Statement UPDATE dibuat sekali untuk setiap kombinasi kolom yang berubah
+            columns = sorted(changes)
+            name, sql = queries.record_update(self.TABLE, columns)
+            try:
+                cursor = self.repository.execute(name, [changes[column] for column in columns] + [id_value], sql)
+            except sqlite3.Error as e:
+                errors[id_value] = str(e)
+                continue
+            if cursor.rowcount == 0:
+                errors[id_value] = "Record sudah tidak ada di database."
+
+        # Gagal di satu record membatalkan semuanya
+        if errors:
+            conn.rollback()
+            return errors
+        try:
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            return {None: str(e)}
+        return {}
+
+
+class PeminjamRepository(TableRepository):
+    TABLE = "peminjam"
+
+
+class PinjamanRepository(TableRepository):
+    TABLE = "pinjaman"
+
+    def by_peminjam(self, id_peminjam):
+        """List (id_pinjaman, jumlah_pinjaman, tanggal_pinjam) milik satu peminjam"""
+        return self.repository.rows("pinjaman_by_peminjam", [id_peminjam])
+
+    def add_with_schedule(self, id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status):
+        """Simpan pinjaman dan seluruh jadwal cicilan bulanannya dalam satu transaksi.
+
+        Mengembalikan (id_pinjaman, jumlah cicilan jadwal).
+        """
+        with self.repository.conn:
+            id_pinjaman = self.repository.execute(
+                "insert_pinjaman", [id_peminjam, jumlah_pinjaman, tanggal_pinjam, tanggal_selesai, status]).lastrowid
+            jadwal = installment_schedule.build_schedule(id_pinjaman, jumlah_pinjaman, tanggal_pinjam,
+                                                         tanggal_selesai, status)
+            if jadwal:
+                self.repository.executemany("insert_cicilan_jadwal", jadwal)
+        return id_pinjaman, len(jadwal)
+
+    def set_peminjam(self, id_pinjaman, id_peminjam):
+        """Pindahkan pinjaman ke peminjam lain; False jika pinjaman tidak ada"""
+        with self.repository.conn:
+            return self.repository.execute("update_pinjaman_peminjam", [id_peminjam, id_pinjaman]).rowcount > 0
+
+
+class CicilanRepository(TableRepository):
+    TABLE = "cicilan"
+
+    def add_schedule(self, rows):
+        """Simpan baris jadwal (id_pinjaman, cicilan_ke, jumlah_cicilan, tanggal_jatuh_tempo, status_bayar)
+        dalam satu transaksi"""
+        with self.repository.conn:
+            return self.repository.executemany("insert_cicilan_jadwal", rows)
@@ -0,0 +1,199 @@
+"""Export isi Table View (filter dan urutan aktif) ke CSV atau XLSX di thread worker.
+
+Query dijalankan ulang sebagai cursor forward-only di koneksi baca milik thread
+worker (DatabaseManager.pool), lalu baris ditulis per potongan langsung ke file.
+Tidak ada baris yang ditampung di model maupun di memori, sehingga export jutaan
+baris tidak membebani GUI.
+"""
+
+import csv
+import os
+import tempfile
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from currency import format_rupiah
+from database_manager import DatabaseManager
+import queries
+
+CHUNK_SIZE = 2000
+EXPORT_FORMATS = {"csv": "CSV (*.csv)", "xlsx": "Excel (*.xlsx)"}
+
+
+class _CsvWriter:
+    def __init__(self, path, headers):
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(headers)
+        self._currency_columns = []
+
+    def set_currency_columns(self, columns):
+        self._currency_columns = columns
+
+    def write_rows(self, rows):
+        for row in rows:
+            for column in self._currency_columns:
+                if row[column] is not None:
+                    try:
+                        row[column] = format_rupiah(row[column])
+                    except (ValueError, TypeError):
+                        pass
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+    def discard(self):
+        self._file.close()
+        os.remove(self._file.name)
+
+
+class _XlsxWriter:
+    """Workbook write-only openpyxl: baris langsung di-flush ke file sementara"""
+
+    # Angka tetap numerik agar bisa dijumlah; tampil "Rp 1.500.000" sesuai locale Excel
+    RUPIAH_FORMAT = '"Rp "#,##0'
+    # Batas baris satu sheet Excel (termasuk header); sisanya pindah ke sheet berikutnya
+    MAX_SHEET_ROWS = 1048576
+
+    def __init__(self, path, headers):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+
+        self._path = path
+        self._headers = headers
+        self._workbook = Workbook(write_only=True)
+        self._cell = WriteOnlyCell
+        self._currency_columns = []
+        self._sheets = []
+        self._new_sheet()
+        # Workbook disimpan ke file sementara di folder tujuan, lalu dipindah ke `path` saat selesai
+        handle, self._temp_path = tempfile.mkstemp(suffix=".xlsx", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(handle)
+        self._saved = False
+
+    def _new_sheet(self):
+        title = "Table View" if not self._sheets else f"Table View {len(self._sheets) + 1}"
+        self._sheet = self._workbook.create_sheet(title)
+        self._sheet.append(self._headers)
+        self._sheets.append(self._sheet)
+        self._sheet_rows = 1
+
+    def set_currency_columns(self, columns):
+        self._currency_columns = columns
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self._sheet_rows >= self.MAX_SHEET_ROWS:
+                self._new_sheet()
+            for column in self._currency_columns:
+                if row[column] is not None:
+                    cell = self._cell(self._sheet, value=row[column])
+                    cell.number_format = self.RUPIAH_FORMAT
+                    row[column] = cell
+            self._sheet.append(row)
+            self._sheet_rows += 1
+
+    def close(self):
+        self._saved = True
+        self._workbook.save(self._temp_path)
+        os.replace(self._temp_path, self._path)
+
+    def discard(self):
+        # File tujuan belum disentuh. save() adalah satu-satunya cara publik openpyxl untuk
+        # menutup dan menghapus file sementara setiap worksheet; hasilnya langsung dihapus
+        try:
+            if not self._saved:
+                self._saved = True
+                self._workbook.save(self._temp_path)
+        finally:
+            if os.path.exists(self._temp_path):
+                os.remove(self._temp_path)
+
+
+WRITERS = {"csv": _CsvWriter, "xlsx": _XlsxWriter}
+
+
+def export_format(path):
+    """Format export berdasarkan ekstensi file (default csv)"""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return extension if extension in WRITERS else "csv"
+
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str, int)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ExportWorker(QRunnable):
+    """Menjalankan query Table View tanpa paging dan menulis hasilnya ke `path`"""
+
+    def __init__(self, state, path, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self.state = state
+        self.path = path
+        self.chunk_size = chunk_size
+        self.signals = ExportSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """Hentikan export setelah potongan yang sedang ditulis (aman dipanggil dari thread GUI)"""
+        self._cancelled = True
+
+    def _cursor(self, repository, page=None):
+        # Hanya waktu eksekusi yang dicatat; baris dibaca bertahap selama file ditulis
+        name, sql, params = self.state.page(page)
+        return repository.cursor(f"export:{name}", params, sql)
+
+    def run(self):
+        writer = None
+        try:
+            repository = DatabaseManager.pool().reader()
+            row = self._cursor(repository, "count").fetchone()
+            total = row[0] if row else 0
+
+            cursor = self._cursor(repository)
+            columns = [column for column in range(len(cursor.description))
+                       if column not in queries.TABLE_VIEW_HIDDEN_COLUMNS]
+            writer = WRITERS[export_format(self.path)](self.path, [cursor.description[c][0] for c in columns])
+            writer.set_currency_columns([columns.index(c) for c in queries.TABLE_VIEW_CURRENCY_COLUMNS
+                                         if c in columns])
+
+            written = 0
+            while not self._cancelled:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                writer.write_rows([[row[c] for c in columns] for row in rows])
+                written += len(rows)
+                if len(rows) == self.chunk_size:
+                    self.signals.progress.emit(written, total)
+            cursor.close()
+            if not self._cancelled:
+                writer.close()
+        except ImportError:
+            self._discard(writer)
+            self.signals.failed.emit("Export XLSX membutuhkan paket openpyxl (pip install openpyxl).")
+            return
+        except Exception as e:
+            self._discard(writer)
+            self.signals.failed.emit(f"Export gagal: {e}")
+            return
+
+        if self._cancelled:
+            self._discard(writer)
+            self.signals.cancelled.emit()
+            return
+        self.signals.progress.emit(written, total)
+        self.signals.finished.emit(self.path, written)
+
+    def _discard(self, writer):
+        """Hapus file export yang belum selesai"""
+        if writer is None:
+            return
+        try:
+            writer.discard()
+        except OSError as e:
+            print(f"Error removing incomplete export: {e}")
@@ -1,15 +1,74 @@
+import bisect
+from collections import namedtuple
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
-                             QTableView, QLabel, QLineEdit, QComboBox,
+                             QTableView, QTreeView, QStackedWidget, QLabel, QLineEdit, QComboBox,
+                             QPushButton, QFileDialog, QProgressDialog, QMessageBox,
                              QStyledItemDelegate, QStyleOptionViewItem)
-from PyQt6.QtCore import Qt, QModelIndex, QLocale
-from PyQt6.QtSql import QSqlQueryModel, QSqlQuery, QSqlDatabase 
+from PyQt6.QtCore import (Qt, QModelIndex, QAbstractTableModel, QAbstractItemModel, QObject,
+                          QRunnable, QThreadPool, QTimer, pyqtSignal)
+from currency import format_rupiah
+from database_manager import DatabaseManager
+from directory import Directory
+from lookup import LookupComboBox, PeminjamLookup
+from table_export import EXPORT_FORMATS, ExportWorker
+import queries
 
 
 
-class EditableSqlQueryModel(QSqlQueryModel):
+class EditableSqlQueryModel(QAbstractTableModel):
+    """Model Table View yang hanya menyimpan jendela baris di sekitar viewport.
+
+    Jumlah baris diambil dari COUNT, sedangkan isi baris dimuat per halaman di
+    thread pool dengan keyset pada kolom urutan (lihat queries.table_view_sort_keys);
+    selama halaman dimuat selnya kosong. Baris di luar MAX_WINDOW dibuang.
+    Pengurutan dilakukan di SQL: sort() hanya memancarkan sortRequested agar
+    widget menjalankan ulang query.
+    """
+
+    PAGE_SIZE = 100
+    MAX_WINDOW = 400
+
+    sortRequested = pyqtSignal(int, bool)
+    # True selama halaman di luar jendela sedang dimuat di thread pool
+    pageLoading = pyqtSignal(bool)
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._db = QSqlDatabase.database() 
+        self._headers = []
+        self._rows = []
+        self._window_start = 0
+        self._total = 0
+        self._state = None
+        # Halaman yang sedang dimuat (awal, akhir) dan nomor permintaan terakhir
+        self._pending = None
+        self._request = 0
+        # Nomor muat ulang select() terakhir; hasil yang sudah digantikan dibuang
+        self._reload = 0
+        # Posisi baris -> kunci urutan, dari halaman yang pernah dimuat (lihat _seek)
+        self._bookmarks = {}
+        self._bookmark_positions = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._total
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            row = self._row(index.row())
+            return row[index.column()] if row is not None else None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal and section < len(self._headers):
+                return self._headers[section]
+            if orientation == Qt.Orientation.Vertical:
+                return section + 1
+        return super().headerData(section, orientation, role)
 
     def flags(self, index):
         
@@ -18,12 +77,161 @@ class EditableSqlQueryModel(QSqlQueryModel):
             return super().flags(index) | Qt.ItemFlag.ItemIsEditable
         return super().flags(index)
 
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sortRequested.emit(column, order == Qt.SortOrder.DescendingOrder)
+
+    def set_result(self, state, headers, total, rows, window_start=0):
+        """Ganti isi model dengan jumlah baris dan halaman pertama yang sudah diambil.
+
+        `state` adalah TableViewState (filter dan urutan) yang menghasilkan baris tersebut.
+        """
+        self.beginResetModel()
+        if self._pending is not None:
+            self.pageLoading.emit(False)
+        self._state = state
+        self._headers = headers
+        self._total = total
+        self._rows = rows
+        self._window_start = window_start
+        # Halaman dan muat ulang yang masih berjalan untuk hasil lama dibuang saat tiba
+        self._request += 1
+        self._reload += 1
+        self._pending = None
+        self._bookmarks = {}
+        self._bookmark_positions = []
+        if rows:
+            self._remember(window_start, rows)
+        self.endResetModel()
+
+    def set_total(self, total):
+        """Ganti jumlah baris setelah COUNT selesai; baris yang sudah dimuat dan posisi scroll tetap"""
+        if total > self._total:
+            self.beginInsertRows(QModelIndex(), self._total, total - 1)
+            self._total = total
+            self.endInsertRows()
+        elif total < self._total:
+            self.beginRemoveRows(QModelIndex(), total, self._total - 1)
+            self._total = total
+            del self._rows[max(0, total - self._window_start):]
+            position = bisect.bisect_left(self._bookmark_positions, total)
+            for stale in self._bookmark_positions[position:]:
+                del self._bookmarks[stale]
+            del self._bookmark_positions[position:]
+            self.endRemoveRows()
+
+    def window(self):
+        """Rentang baris yang sedang tersimpan di memori (awal, akhir)"""
+        return self._window_start, self._window_start + len(self._rows)
+
+    def _row(self, row):
+        start, end = self.window()
+        if start <= row < end:
+            return self._rows[row - start]
+        self._request_page(row)
+        return None
+
+    def _request_page(self, row):
+        """Muat halaman yang memuat `row` di thread pool; sampai halaman tiba sel tampil kosong"""
+        if self._pending is not None and self._pending[0] <= row < self._pending[1]:
+            return
+        start, end = self.window()
+        if self._rows and end <= row < end + self.PAGE_SIZE:
+            first = end
+        elif self._rows and start - self.PAGE_SIZE <= row < start:
+            first = max(0, start - self.PAGE_SIZE)
+        else:
+            first = max(0, min(row - self.PAGE_SIZE // 2, self._total - self.PAGE_SIZE))
+        limit = min(self.PAGE_SIZE, self._total - first)
+        state, page, key, offset, backward = self._seek(first, limit)
+        self._request += 1
+        request = self._request
+        self._pending = (first, first + limit)
+
+        def fetch(repository):
+            if request != self._request:
+                # Sudah digantikan permintaan lain selagi mengantre (scrollbar terus digeser)
+                return []
+            name, sql, params = state.page(page, key, limit, offset)
+            return repository.rows(name, params, sql)
+
+        DatabaseManager.pool().run(
+            fetch,
+            finished=lambda rows: self._on_page_loaded(request, first, backward, rows),
+            failed=lambda message: self._on_page_failed(request, message))
+        self.pageLoading.emit(True)
+
+    def _seek(self, first, limit):
+        """Pilih titik awal termurah untuk baris [first, first + limit).
+
+        Kunci baris yang pernah dimuat (_bookmarks) dipakai sebagai keyset sehingga
+        OFFSET hanya melewati jarak dari kunci terdekat; tanpa kunci dekat, OFFSET
+        dihitung dari awal atau dari akhir (urutan dibalik), mana yang lebih pendek.
+        Mengembalikan (state, page, key, offset, backward); `backward` berarti baris
+        datang dalam urutan terbalik.
+        """
+        reverse = self._state._replace(descending=not self._state.descending)
+        plans = [(first, self._state, "offset", None, first, False),
+                 (self._total - first - limit, reverse, "offset", None, self._total - first - limit, True)]
+        position = bisect.bisect_left(self._bookmark_positions, first)
+        if position > 0:
+            before = self._bookmark_positions[position - 1]
+            offset = first - before - 1
+            plans.append((offset, self._state, "next", self._bookmarks[before], offset, False))
+        position = bisect.bisect_left(self._bookmark_positions, first + limit)
+        if position < len(self._bookmark_positions):
+            after = self._bookmark_positions[position]
+            offset = after - first - limit
+            plans.append((offset, self._state, "prev", self._bookmarks[after], offset, True))
+        return min(plans, key=lambda plan: plan[0])[1:]
+
+    def _on_page_loaded(self, request, first, backward, rows):
+        if request != self._request:
+            return
+        self.pageLoading.emit(False)
+        if not rows:
+            # Baris sudah tidak ada (terhapus setelah COUNT): _pending tetap agar tidak diminta berulang
+            return
+        self._pending = None
+        if backward:
+            rows.reverse()
+        start, end = self.window()
+        if self._rows and first == end:
+            self._rows.extend(rows)
+            overflow = len(self._rows) - self.MAX_WINDOW
+            if overflow > 0:
+                del self._rows[:overflow]
+                self._window_start += overflow
+        elif self._rows and first + len(rows) == start:
+            self._rows[:0] = rows
+            self._window_start = first
+            overflow = len(self._rows) - self.MAX_WINDOW
+            if overflow > 0:
+                del self._rows[-overflow:]
+        else:
+            self._rows = rows
+            self._window_start = first
+        self._remember(first, rows)
+        self.dataChanged.emit(self.index(first, 0), self.index(first + len(rows) - 1, self.columnCount() - 1))
+
+    def _on_page_failed(self, request, message):
+        if request != self._request:
+            return
+        # _pending tetap: sel dibiarkan kosong daripada query gagal diulang di setiap paint
+        self.pageLoading.emit(False)
+        print(f"Error loading Table View page: {message}")
+
+    def _remember(self, first, rows):
+        """Simpan kunci baris pertama dan terakhir halaman sebagai titik awal seek"""
+        for position, row in ((first, rows[0]), (first + len(rows) - 1, rows[-1])):
+            if position not in self._bookmarks:
+                bisect.insort(self._bookmark_positions, position)
+            self._bookmarks[position] = self._key(row)
+
+    def _key(self, row):
+        return tuple(row[column] for column in queries.table_view_sort_keys(self._state.sort_column))
+
     def setData(self, index, value, role):
         if index.column() == 1 and role == Qt.ItemDataRole.EditRole:
-            if not self._db.isOpen():
-                print("Database not open in EditableSqlQueryModel.setData")
-                return False
-
             
             id_pinjaman_index = self.index(index.row(), 0) 
             id_pinjaman = self.data(id_pinjaman_index)
@@ -31,63 +239,175 @@ class EditableSqlQueryModel(QSqlQueryModel):
             
             new_id_peminjam = value 
 
-            
-            query = QSqlQuery(self._db)
-            query.prepare("UPDATE pinjaman SET id_peminjam = ? WHERE id_pinjaman = ?")
-            query.addBindValue(new_id_peminjam)
-            query.addBindValue(id_pinjaman)
-
-            if query.exec():
-                
-                self.setQuery(self.query().lastQuery()) 
-                return True
-            else:
-                print(f"Failed to update pinjaman.id_peminjam: {query.lastError().text()}")
-                return False
+            # Disimpan di thread penulis; baris diperbarui setelah commit lewat refresh_pinjaman
+            DatabaseManager.pool().run(
+                lambda repository: repository.pinjaman.set_peminjam(id_pinjaman, new_id_peminjam),
+                finished=lambda updated: self._on_peminjam_updated(id_pinjaman, updated),
+                write=True)
+            return True
         return super().setData(index, value, role)
 
+    def _on_peminjam_updated(self, id_pinjaman, updated):
+        if not updated:
+            print(f"Failed to update pinjaman.id_peminjam: pinjaman {id_pinjaman} tidak ada")
+            return
+        Directory.instance().invalidate("pinjaman")
+        self.refresh_pinjaman(id_pinjaman)
+
+    def refresh_pinjaman(self, id_pinjaman):
+        """Baca ulang baris milik satu pinjaman yang ada di jendela dan kabarkan lewat dataChanged.
+
+        Model tidak di-reset sehingga posisi scroll dan seleksi tetap. Baris yang
+        tidak lagi cocok dengan filter tetap tampil sampai query berikutnya; hanya
+        bila kunci urutannya berubah seluruh jendela dimuat ulang lewat select().
+        """
+        fresh = {(row[0], row[7]): row for row in
+                 DatabaseManager.repository().rows("table_view_rows_pinjaman", [id_pinjaman])}
+        sort_keys = queries.table_view_sort_keys(self._state.sort_column)
+        changed = []
+        for position, row in enumerate(self._rows):
+            if row[0] != id_pinjaman:
+                continue
+            new_row = fresh.get((row[0], row[7]))
+            if new_row is None or new_row == row:
+                continue
+            if any(new_row[column] != row[column] for column in sort_keys):
+                # Posisi baris di urutan berubah, kunci keyset jendela tidak lagi valid
+                self.select()
+                return
+            self._rows[position] = new_row
+            changed.append(self._window_start + position)
+
+        last_column = self.columnCount() - 1
+        for row in changed:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
     def select(self):
-        
-        self.setQuery(self.query().lastQuery())
+        """Muat ulang jumlah baris dan jendela di posisi scroll sekarang lewat thread pool.
+
+        Baris lama tetap tampil sampai COUNT dan halaman baru tiba.
+        """
+        if self._state is None:
+            return
+        state, window_start = self._state, self._window_start
+        self._reload += 1
+        reload = self._reload
+        DatabaseManager.pool().run(
+            lambda repository: load_first_page(repository, state, self.PAGE_SIZE, window_start),
+            finished=lambda result: self._on_reloaded(reload, state, window_start, result),
+            failed=lambda message: self._on_reload_failed(reload, message))
+        self.pageLoading.emit(True)
+
+    def _on_reloaded(self, reload, state, window_start, result):
+        if reload != self._reload:
+            return
+        self.pageLoading.emit(False)
+        total, headers, rows = result
+        if headers is None:
+            return
+        self.set_result(state, headers, total, rows, window_start if rows else 0)
+
+    def _on_reload_failed(self, reload, message):
+        if reload != self._reload:
+            return
+        self.pageLoading.emit(False)
+        print(f"Error reloading Table View: {message}")
+
+
+class TableViewState(namedtuple("TableViewState",
+                                ["nama_filter", "status_filter", "sort_column", "descending"])):
+    """Filter dan urutan yang menentukan isi Table View"""
+
+    def page(self, page=None, key=None, limit=0, offset=0):
+        return queries.table_view_page(self.nama_filter, self.status_filter, page,
+                                       self.sort_column, self.descending, key, limit, offset)
+
+
+def load_first_page(repository, state, page_size, offset=0):
+    """Hitung total baris dan ambil satu halaman; (total, None, None) jika gagal"""
+    name, sql, params = state.page("count")
+    count_rows = repository.rows(name, params, sql)
+    if not count_rows:
+        return 0, None, None
+    total = count_rows[0][0]
+    if offset:
+        name, sql, params = state.page("offset", limit=page_size, offset=offset)
+    else:
+        name, sql, params = state.page("first", limit=page_size)
+    headers, rows = repository.fetch(name, params, sql)
+    if not headers:
+        return total, None, None
+    return total, headers, rows
+
+
+class FilterQuerySignals(QObject):
+    page = pyqtSignal(int, object, list, list)
+    finished = pyqtSignal(int, int)
+    failed = pyqtSignal(int, str)
+
+
+class FilterQueryWorker(QRunnable):
+    """Menjalankan query Table View di thread worker dengan koneksi baca milik thread itu.
+
+    Halaman pertama dikirim lewat `page` sebelum COUNT dijalankan, sehingga baris
+    sudah tampil selagi jumlah total (`finished`) masih dihitung. COUNT dilewati
+    jika halaman pertama tidak penuh.
+    """
+
+    def __init__(self, generation, state, page_size=100):
+        super().__init__()
+        self.generation = generation
+        self.state = state
+        self.page_size = page_size
+        self.signals = FilterQuerySignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """Lewati COUNT jika belum dimulai (hasilnya sudah tidak dipakai)"""
+        self._cancelled = True
+
+    def run(self):
+        repository = DatabaseManager.pool().reader()
+        name, sql, params = self.state.page("first", limit=self.page_size)
+        headers, rows = repository.fetch(name, params, sql)
+        if not headers:
+            self.signals.failed.emit(self.generation, "Query Table View gagal dijalankan")
+            return
+        self.signals.page.emit(self.generation, self.state, headers, rows)
+        if len(rows) < self.page_size:
+            self.signals.finished.emit(self.generation, len(rows))
+            return
+        if self._cancelled:
+            return
+
+        name, sql, params = self.state.page("count")
+        count_rows = repository.rows(name, params, sql)
+        if not count_rows:
+            self.signals.failed.emit(self.generation, "Query Table View gagal dijalankan")
+            return
+        self.signals.finished.emit(self.generation, count_rows[0][0])
 
 
 
 class PeminjamDelegate(QStyledItemDelegate):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._db = QSqlDatabase.database() 
-        self._peminjam_data = self._load_peminjam_data()
-
-    def _load_peminjam_data(self):
-        
-        data = {}
-        query = QSqlQuery(self._db)
-        query.exec("SELECT id_peminjam, nama FROM peminjam ORDER BY nama")
-        while query.next():
-            data[query.value(1)] = query.value(0) 
-        return data
+    """Editor picker peminjam (lihat lookup.LookupComboBox) untuk kolom Nama Peminjam"""
 
     def createEditor(self, parent, option, index):
         if index.column() == 1: 
-            editor = QComboBox(parent)
-            editor.addItems(sorted(self._peminjam_data.keys()))
-            return editor
+            return LookupComboBox(PeminjamLookup(), parent=parent)
         return super().createEditor(parent, option, index)
 
     def setEditorData(self, editor, index):
         if index.column() == 1: 
-            current_name = index.model().data(index, Qt.ItemDataRole.EditRole)
-            if current_name in self._peminjam_data:
-                editor.setCurrentText(current_name)
-            else:
-                editor.setCurrentIndex(0) 
+            # Pilih lewat kolom tersembunyi ID Peminjam agar nama kembar tidak tertukar
+            editor.set_current_id(index.model().data(index.siblingAtColumn(10), Qt.ItemDataRole.EditRole))
         else:
             super().setEditorData(editor, index)
 
     def setModelData(self, editor, model, index):
         if index.column() == 1: 
             selected_name = editor.currentText()
-            selected_id = self._peminjam_data.get(selected_name)
+            selected_id = editor.current_id()
             if selected_id is not None:
                 
                 model.setData(index, selected_id, Qt.ItemDataRole.EditRole)
@@ -104,30 +424,214 @@ class PeminjamDelegate(QStyledItemDelegate):
 class CurrencyDelegate(QStyledItemDelegate):
 
     def displayText(self, value, qt_locale):
+        # Dipanggil di setiap paint: tanpa print, nilai bukan angka ditampilkan apa adanya
         try:
-            
-            num = float(str(value))
+            return format_rupiah(value)
+        except (ValueError, TypeError):
+            return str(value)
 
-            
-            indonesian_locale = QLocale(QLocale.Language.Indonesian, QLocale.Country.Indonesia)
 
-            
-            formatted_string = indonesian_locale.toString(num, 'f', 0)
-            return f"Rp {formatted_string}"
 
-        except Exception as e:
-            
-            
-            
-            print(f"DEBUG: Error in CurrencyDelegate for value '{value}': {e}") 
-            return str(value)
+class LoanTreeModel(QAbstractItemModel):
+    """Tampilan per pinjaman: satu baris ringkasan per pinjaman, cicilan sebagai anak.
+
+    Pinjaman dimuat per halaman (keyset id_pinjaman) lewat fetchMore, sedangkan
+    cicilan sebuah pinjaman baru diambil saat barisnya di-expand. Keduanya dijalankan
+    di thread pool; hasil dari filter yang sudah diganti dibuang lewat nomor generasi.
+    """
+
+    PAGE_SIZE = 200
+
+    # True selama halaman pinjaman sedang dimuat di thread pool
+    pageLoading = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._loans = []
+        self._children = {}
+        self._nama_filter = ""
+        self._status_filter = "Semua"
+        self._has_more = False
+        self._generation = 0
+        self._loading = False
+        self._children_loading = set()
+        # Baris pinjaman terbawah yang pernah diminta view lewat data()
+        self._last_seen_row = 0
+
+    def set_filter(self, nama_filter, status_filter):
+        self.beginResetModel()
+        self._generation += 1
+        self._nama_filter = nama_filter
+        self._status_filter = status_filter
+        self._loans = []
+        self._children = {}
+        self._has_more = True
+        self._loading = False
+        self._children_loading = set()
+        self._last_seen_row = 0
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if parent.isValid():
+            return self.createIndex(row, column, parent.row() + 1)
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._loans)
+        if parent.internalId() == 0 and parent.column() == 0:
+            return len(self._children.get(parent.row(), []))
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(queries.LOAN_TREE_HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return True
+        if parent.internalId() == 0 and parent.column() == 0:
+            children = self._children.get(parent.row())
+            return children is None or len(children) > 0
+        return False
+
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return self._has_more
+        return parent.internalId() == 0 and parent.row() not in self._children
+
+    def fetchMore(self, parent):
+        generation = self._generation
+        if not parent.isValid():
+            # QTreeView memanggil fetchMore di setiap layout root, termasuk setelah halaman
+            # sebelumnya tiba; halaman baru hanya dimuat bila halaman terakhir sudah terlihat
+            if self._loading or not self._last_page_seen():
+                return
+            after_id = self._loans[-1][0] if self._loans else 0
+            name, sql, params = queries.loan_tree_page(self._nama_filter, self._status_filter,
+                                                       after_id, self.PAGE_SIZE)
+            self._loading = True
+            DatabaseManager.pool().run(
+                lambda repository: repository.rows(name, params, sql),
+                finished=lambda page: self._on_loans_loaded(generation, page),
+                failed=lambda message: self._on_load_failed(generation, message))
+            self.pageLoading.emit(True)
+            return
+
+        row = parent.row()
+        if row in self._children or row in self._children_loading:
+            return
+        id_pinjaman = self._loans[row][0]
+        self._children_loading.add(row)
+        DatabaseManager.pool().run(
+            lambda repository: repository.rows("loan_tree_cicilan", [id_pinjaman]),
+            finished=lambda children: self._on_children_loaded(generation, row, children),
+            failed=lambda message: self._on_load_failed(generation, message, row))
+
+    def _last_page_seen(self):
+        return not self._loans or self._last_seen_row >= len(self._loans) - self.PAGE_SIZE
+
+    def _on_loans_loaded(self, generation, page):
+        if generation != self._generation:
+            return
+        self._loading = False
+        self.pageLoading.emit(False)
+        self._has_more = len(page) == self.PAGE_SIZE
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self._loans), len(self._loans) + len(page) - 1)
+            self._loans.extend(page)
+            self.endInsertRows()
+
+    def _on_children_loaded(self, generation, row, children):
+        if generation != self._generation:
+            return
+        self._children_loading.discard(row)
+        parent = self.index(row, 0)
+        if children:
+            self.beginInsertRows(parent, 0, len(children) - 1)
+            self._children[row] = children
+            self.endInsertRows()
+        else:
+            self._children[row] = []
+            # Tanda expand hilang karena ternyata tidak ada cicilan
+            self.dataChanged.emit(parent, parent)
+
+    def _on_load_failed(self, generation, message, row=None):
+        if generation != self._generation:
+            return
+        print(f"Error loading loan tree: {message}")
+        if row is not None:
+            # Cicilan dicoba lagi saat baris di-expand berikutnya
+            self._children_loading.discard(row)
+            return
+        # Halaman pinjaman tidak diminta ulang otomatis; ganti filter untuk mencoba lagi
+        self._has_more = False
+        self._loading = False
+        self.pageLoading.emit(False)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        column = index.column()
+        if index.internalId() == 0:
+            if index.row() > self._last_seen_row:
+                seen = self._last_page_seen()
+                self._last_seen_row = index.row()
+                if not seen and self._has_more and self._last_page_seen():
+                    # fetchMore dari scroll datang sebelum baris ini tergambar dan ditolak
+                    QTimer.singleShot(0, lambda: self.fetchMore(QModelIndex()))
+            id_pinjaman, nama, jumlah, status, terbayar, total, sisa, jatuh_tempo = self._loans[index.row()]
+            return [id_pinjaman, nama, jumlah, status, f"{terbayar}/{total}", sisa, jatuh_tempo][column]
+
+        cicilan_ke, jumlah_cicilan, status_bayar, tanggal_bayar = \
+            self._children[index.internalId() - 1][index.row()]
+        return [f"Cicilan ke-{cicilan_ke}", None, jumlah_cicilan, status_bayar, None, None,
+                tanggal_bayar][column]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return queries.LOAN_TREE_HEADERS[section]
+        return None
 
 
 
 class TableViewWidget(QWidget):
 
+    FILTER_DEBOUNCE_MS = 300
+
+    # Halaman pertama hasil filter sudah tampil di tabel
+    dataLoaded = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._generation = 0
+        self._sort_column = 0
+        self._descending = False
+
+        
+        self._filter_pool = QThreadPool(self)
+        self._filter_pool.setMaxThreadCount(1)
+        self._filter_pool.setExpiryTimeout(-1)
+
+        # Export berjalan di pool terpisah agar filter tetap responsif selama export
+        self._export_pool = QThreadPool(self)
+        self._export_pool.setMaxThreadCount(1)
+        self._export_pool.setExpiryTimeout(-1)
+        self._export_worker = None
+        self._filter_worker = None
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self.update_query)
+
         self.init_ui()
 
     def init_ui(self):
@@ -139,8 +643,8 @@ class TableViewWidget(QWidget):
         
         filter_layout.addWidget(QLabel("Filter Peminjam:"))
         self.filter_peminjam = QLineEdit()
-        self.filter_peminjam.setPlaceholderText("Ketik nama peminjam...")
-        self.filter_peminjam.textChanged.connect(self.update_query)
+        self.filter_peminjam.setPlaceholderText("Ketik nama, alamat, no. telp atau email peminjam...")
+        self.filter_peminjam.textChanged.connect(self._debounce_timer.start)
         filter_layout.addWidget(self.filter_peminjam)
 
         
@@ -150,11 +654,26 @@ class TableViewWidget(QWidget):
         self.filter_status.currentTextChanged.connect(self.update_query)
         filter_layout.addWidget(self.filter_status)
 
+        filter_layout.addWidget(QLabel("Tampilan:"))
+        self.view_mode = QComboBox()
+        self.view_mode.addItems(["Per Cicilan", "Per Pinjaman"])
+        self.view_mode.currentIndexChanged.connect(self.change_view_mode)
+        filter_layout.addWidget(self.view_mode)
+
+        self.lbl_loading = QLabel("Memuat data...")
+        self.lbl_loading.hide()
+        filter_layout.addWidget(self.lbl_loading)
+
+        self.btn_export = QPushButton("Export...")
+        self.btn_export.clicked.connect(self.export_data)
+        filter_layout.addWidget(self.btn_export)
+
         layout.addLayout(filter_layout)
 
         
         self.table = QTableView()
-        self.table.setSortingEnabled(True)
+        
+        self.table.horizontalHeader().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
 
         
         self.peminjam_delegate = PeminjamDelegate(self)
@@ -164,14 +683,29 @@ class TableViewWidget(QWidget):
         
         self.currency_delegate = CurrencyDelegate()
         
-        self.table.setItemDelegateForColumn(3, self.currency_delegate)
-        self.table.setItemDelegateForColumn(8, self.currency_delegate)
+        for column in queries.TABLE_VIEW_CURRENCY_COLUMNS:
+            self.table.setItemDelegateForColumn(column, self.currency_delegate)
 
-        layout.addWidget(self.table)
+        
+        self.tree = QTreeView()
+        self.tree.setUniformRowHeights(True)
+        self.tree.setItemDelegateForColumn(2, self.currency_delegate)
+        self.tree.setItemDelegateForColumn(5, self.currency_delegate)
+        self.tree_model = LoanTreeModel(self)
+        self.tree_model.pageLoading.connect(self._on_page_loading)
+        self.tree.setModel(self.tree_model)
+
+        self.views = QStackedWidget()
+        self.views.addWidget(self.table)
+        self.views.addWidget(self.tree)
+        layout.addWidget(self.views)
 
         
         self.model = EditableSqlQueryModel()
+        self.model.sortRequested.connect(self.sort_by)
+        self.model.pageLoading.connect(self._on_page_loading)
         self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
 
         self.setLayout(layout)
         self.update_query()
@@ -180,38 +714,128 @@ class TableViewWidget(QWidget):
         nama_filter = self.filter_peminjam.text()
         status_filter = self.filter_status.currentText()
 
-        
-        query_str = '''
-                SELECT pinjaman.id_pinjaman     AS "ID Pinjaman", \
-                       peminjam.nama            AS "Nama Peminjam", \
-                       peminjam.no_telp         AS "No. Telp", \
-                       pinjaman.jumlah_pinjaman AS "Jumlah Pinjaman", \
-                       pinjaman.tanggal_pinjam  AS "Tanggal Pinjam", \
-                       pinjaman.tanggal_selesai AS "Tanggal Selesai", \
-                       pinjaman.status          AS "Status Pinjaman", \
-                       cicilan.cicilan_ke       AS "Cicilan Ke", \
-                       cicilan.jumlah_cicilan   AS "Jumlah Cicilan", \
-                       cicilan.status_bayar     AS "Status Cicilan"
-                FROM pinjaman
-                         JOIN peminjam ON pinjaman.id_peminjam = peminjam.id_peminjam
-                         LEFT JOIN cicilan ON pinjaman.id_pinjaman = cicilan.id_pinjaman
-                WHERE 1 = 1 \
-                '''
+        if self.views.currentWidget() is self.tree:
+            self._debounce_timer.stop()
+            self.tree_model.set_filter(nama_filter, status_filter)
+            return
 
         
-        if nama_filter:
-            query_str += f" AND peminjam.nama LIKE '%{nama_filter}%'"
+        state = TableViewState(nama_filter, status_filter, self._sort_column, self._descending)
+        self._run_filter_query(state)
 
-        
-        if status_filter != "Semua":
-            if status_filter in ["Aktif", "Lunas"]:
-                query_str += f" AND pinjaman.status = '{status_filter}'"
-            else:
-                query_str += f" AND cicilan.status_bayar = '{status_filter}'"
+    def change_view_mode(self, index):
+        """Ganti antara tampilan per cicilan (tabel) dan per pinjaman (tree)"""
+        self.views.setCurrentIndex(index)
+        self.update_query()
 
-        query_str += " ORDER BY pinjaman.id_pinjaman, cicilan.cicilan_ke"
+    def sort_by(self, column, descending=False):
+        """Urutkan lewat ORDER BY di SQL (dipanggil saat header kolom diklik)"""
+        if column < 0 or column >= len(queries.TABLE_VIEW_SORT_COLUMNS):
+            column, descending = 0, False
+        if (column, descending) == (self._sort_column, self._descending):
+            return
+        self._sort_column = column
+        self._descending = descending
+        self.update_query()
 
-        self.model.setQuery(query_str)
+    def _run_filter_query(self, state):
+        """Jalankan query di worker; hasil dari ketikan yang lebih lama akan dibuang"""
+        self._debounce_timer.stop()
+        self._generation += 1
+        
+        self._filter_pool.clear()
+        if self._filter_worker is not None:
+            self._filter_worker.cancel()
+
+        worker = FilterQueryWorker(self._generation, state, self.model.PAGE_SIZE)
+        self._filter_worker = worker
+        worker.signals.page.connect(self._on_filter_page)
+        worker.signals.finished.connect(self._on_filter_finished)
+        worker.signals.failed.connect(self._on_filter_failed)
+        self.lbl_loading.show()
+        self._filter_pool.start(worker)
+
+    def shutdown(self):
+        """Hentikan query filter dan export yang masih berjalan (dipanggil saat aplikasi ditutup)"""
+        self._filter_pool.clear()
+        if self._filter_worker is not None:
+            self._filter_worker.cancel()
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+        self._filter_pool.waitForDone()
+        self._export_pool.waitForDone()
+
+    def export_data(self):
+        """Export seluruh hasil filter aktif (bukan hanya baris yang dimuat) ke CSV/XLSX"""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Table View", "table_view.csv",
+                                              ";;".join(EXPORT_FORMATS.values()))
+        if not path:
+            return
+
+        state = TableViewState(self.filter_peminjam.text(), self.filter_status.currentText(),
+                               self._sort_column, self._descending)
+        worker = ExportWorker(state, path)
+        self._export_worker = worker
+
+        self.export_progress = QProgressDialog("Mengekspor data...", "Batal", 0, 0, self)
+        self.export_progress.setWindowTitle("Export")
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(0)
+        self.export_progress.canceled.connect(worker.cancel)
+
+        worker.signals.progress.connect(self._on_export_progress)
+        worker.signals.finished.connect(self._on_export_finished)
+        worker.signals.failed.connect(self._on_export_failed)
+        worker.signals.cancelled.connect(self._on_export_cancelled)
+        self.btn_export.setEnabled(False)
+        self._export_pool.start(worker)
+
+    def _on_export_progress(self, written, total):
+        self.export_progress.setMaximum(max(total, written))
+        self.export_progress.setValue(written)
+        self.export_progress.setLabelText(f"Mengekspor data... {written:,} dari {total:,} baris")
+
+    def _finish_export(self):
+        self._export_worker = None
+        self.btn_export.setEnabled(True)
+        self.export_progress.reset()
+
+    def _on_export_finished(self, path, written):
+        self._finish_export()
+        QMessageBox.information(self, "Export", f"{written:,} baris berhasil diekspor ke {path}")
+
+    def _on_export_failed(self, message):
+        self._finish_export()
+        QMessageBox.critical(self, "Export", message)
+
+    def _on_export_cancelled(self):
+        self._finish_export()
+
+    def _on_filter_page(self, generation, state, headers, rows):
+        if generation != self._generation:
+            return
+        # Jumlah baris sementara = halaman pertama, sampai COUNT selesai (_on_filter_finished)
+        self.model.set_result(state, headers, len(rows), rows)
+        for column in queries.TABLE_VIEW_HIDDEN_COLUMNS:
+            self.table.setColumnHidden(column, True)
+        self.dataLoaded.emit()
+
+    def _on_filter_finished(self, generation, total):
+        if generation != self._generation:
+            return
+        self.model.set_total(total)
+        self._filter_worker = None
+        self.lbl_loading.hide()
+
+    def _on_page_loading(self, loading):
+        self.lbl_loading.setVisible(loading or self._filter_worker is not None)
+
+    def _on_filter_failed(self, generation, message):
+        if generation != self._generation:
+            return
+        print(f"Error executing query: {message}")
+        self._filter_worker = None
+        self.lbl_loading.hide()
 
         
         
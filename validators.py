@@ -0,0 +1,84 @@
+"""Aturan validasi data peminjam, pinjaman dan cicilan (dipakai dialog dan import CSV)"""
+
+import datetime
+import re
+
+STATUS_PINJAMAN = ["Aktif", "Lunas"]
+STATUS_BAYAR = ["Belum Bayar", "Lunas"]
+
+# Format ribuan Indonesia, mis. 1.500.000 atau 1.500.000,50
+_RIBUAN_INDONESIA = re.compile(r"^\d{1,3}(\.\d{3})+(,\d+)?$")
+_FORMAT_TANGGAL = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"]
+
+
+def parse_amount(text):
+    """Ubah teks nominal ("Rp 1.500.000", "1500000", "1500000.5") menjadi float; None jika tidak valid"""
+    cleaned = str(text).replace("Rp", "").replace(" ", "").strip()
+    if not cleaned:
+        return None
+    if _RIBUAN_INDONESIA.match(cleaned):
+        cleaned = cleaned.replace(".", "").replace(",", ".")
+    elif "," in cleaned and "." not in cleaned:
+        cleaned = cleaned.replace(",", ".")
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def parse_date(text):
+    """Ubah teks tanggal (yyyy-MM-dd, dd/MM/yyyy, dd-MM-yyyy) menjadi string yyyy-MM-dd; None jika tidak valid"""
+    text = str(text).strip()
+    for date_format in _FORMAT_TANGGAL:
+        try:
+            return datetime.datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def validate_peminjam(nama, alamat, no_telp, email):
+    """Pesan error untuk data peminjam, atau None jika valid"""
+    if not all([nama, alamat, no_telp, email]):
+        return "Semua field harus diisi untuk Peminjam."
+    return None
+
+
+def validate_pinjaman(id_peminjam, jumlah_pinjaman, status="Aktif"):
+    """Pesan error untuk data pinjaman, atau None jika valid"""
+    if id_peminjam is None:
+        return "Peminjam harus dipilih."
+    if jumlah_pinjaman is None or jumlah_pinjaman <= 0:
+        return "Jumlah Pinjaman harus berupa angka positif."
+    if status not in STATUS_PINJAMAN:
+        return f"Status pinjaman harus salah satu dari: {', '.join(STATUS_PINJAMAN)}."
+    return None
+
+
+def validate_cicilan(id_pinjaman, cicilan_ke, jumlah_cicilan, status_bayar="Belum Bayar"):
+    """Pesan error untuk data cicilan (`cicilan_ke` berupa teks), atau None jika valid"""
+    if id_pinjaman is None:
+        return "Pinjaman harus dipilih."
+    if not cicilan_ke:
+        return "Cicilan Ke- harus diisi."
+    try:
+        int(cicilan_ke)
+    except ValueError:
+        return "Cicilan Ke- harus berupa angka bulat."
+    if jumlah_cicilan is None or jumlah_cicilan <= 0:
+        return "Jumlah Cicilan harus berupa angka positif."
+    if status_bayar not in STATUS_BAYAR:
+        return f"Status bayar harus salah satu dari: {', '.join(STATUS_BAYAR)}."
+    return None
+
+
+def validate_record(table, record):
+    """Pesan error untuk satu record lengkap dari Record View (dict kolom -> nilai), atau None jika valid"""
+    if table == "peminjam":
+        return validate_peminjam(record["nama"], record["alamat"], record["no_telp"], record["email"])
+    if table == "pinjaman":
+        return validate_pinjaman(record["id_peminjam"], record["jumlah_pinjaman"], record["status"])
+    if table == "cicilan":
+        cicilan_ke = "" if record["cicilan_ke"] is None else str(record["cicilan_ke"])
+        return validate_cicilan(record["id_pinjaman"], cicilan_ke, record["jumlah_cicilan"], record["status_bayar"])
+    return None